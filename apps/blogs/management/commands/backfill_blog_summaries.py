@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.blogs.models import SUMMARY_FIELDS, BlogEntry
+from apps.blogs.parser import summarize
+
+
+class Command(BaseCommand):
+    """Compute the excerpt, word count and teaser of blog entries imported before they were stored
+
+    Entries with a summary but no excerpt are updated; pass --all to
+    recompute every entry, e.g. after changing how they are derived.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute the summaries of all entries.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of entries updated at once.")
+
+    def handle(self, **options):
+        entries = BlogEntry.objects.only("pk", "summary", *SUMMARY_FIELDS).order_by("pk")
+        if not options["all"]:
+            entries = entries.filter(excerpt="").exclude(summary="")
+
+        batch, updated = [], 0
+        for entry in entries.iterator(chunk_size=options["batch_size"]):
+            for field, value in summarize(entry.summary).items():
+                setattr(entry, field, value)
+            batch.append(entry)
+            if len(batch) == options["batch_size"]:
+                updated += BlogEntry.objects.bulk_update(batch, SUMMARY_FIELDS)
+                batch = []
+        updated += BlogEntry.objects.bulk_update(batch, SUMMARY_FIELDS)
+        self.stdout.write(f"{updated} blog entries updated")
@@ -1,31 +1,27 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils.timezone import now
 
-from apps.blogs.models import BlogEntry, Feed, RelatedBlog
-from apps.blogs.parser import get_all_entries, update_blog_supernav
+from apps.blogs.models import Feed, RelatedBlog
+from apps.blogs.parser import FEED_FETCH_WORKERS, update_blog_supernav, update_feeds, update_related_blogs
 
 
 class Command(BaseCommand):
-    """Update blog entries and related blog feed data"""
+    """Update blog entries and related blog feed data
 
-    def handle(self, **options):
-        for feed in Feed.objects.all():
-            entries = get_all_entries(feed.feed_url)
+    Feeds are fetched concurrently, and those unchanged since the last run
+    are not downloaded or parsed again.
+    """
 
-            for entry in entries:
-                url = entry.pop("url")
-                BlogEntry.objects.update_or_create(
-                    feed=feed,
-                    url=url,
-                    defaults=entry,
-                )
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=FEED_FETCH_WORKERS, help="Number of feeds to fetch at once.")
 
-            feed.last_import = now()
-            feed.save()
+    def handle(self, **options):
+        feeds = update_feeds(Feed.objects.all(), workers=options["workers"])
 
         # Update the supernav box with the latest entry's info
-        update_blog_supernav()
+        if any(feed.feed_url == settings.PYTHON_BLOG_FEED_URL for feed in feeds):
+            update_blog_supernav()
 
         # Update Related Blogs
-        for blog in RelatedBlog.objects.all():
-            blog.update_blog_data()
+        blogs = update_related_blogs(RelatedBlog.objects.all(), workers=options["workers"])
+        self.stdout.write(f"{len(feeds)} feeds and {len(blogs)} related blogs changed")
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.16 on 2026-10-18 07:20
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicate_entries(apps, schema_editor):
+    """Keep only the latest imported entry of each ``(feed, url)``, so they can be made unique."""
+    BlogEntry = apps.get_model("blogs", "BlogEntry")
+    latest = BlogEntry.objects.values("feed", "url").annotate(latest=Max("pk")).values("latest")
+    BlogEntry.objects.exclude(pk__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0004_normalize_blogentry_urls"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feed",
+            name="etag",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="feed",
+            name="last_modified",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="relatedblog",
+            name="etag",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="relatedblog",
+            name="last_modified",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.RunPython(remove_duplicate_entries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="blogentry",
+            constraint=models.UniqueConstraint(fields=("feed", "url"), name="unique_blogentry_feed_url"),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.16 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0005_feed_validators"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogentry",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False, help_text="Visible text of the summary"),
+        ),
+        migrations.AddField(
+            model_name="blogentry",
+            name="teaser",
+            field=models.TextField(blank=True, editable=False, help_text="Excerpt truncated for listings"),
+        ),
+        migrations.AddField(
+            model_name="blogentry",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
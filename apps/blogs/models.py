@@ -1,33 +1,11 @@
 """Models for blog entries, RSS feeds, and feed aggregates."""
 
-import feedparser
-from bs4 import BeautifulSoup
-from bs4.element import Comment
 from django.db import models
 
 from apps.cms.models import ContentManageable
 
-
-def tag_visible(element):
-    """Return True if the HTML element contains visible text content."""
-    if element.parent.name in [
-        "style",
-        "script",
-        "head",
-        "title",
-        "meta",
-        "[document]",
-    ]:
-        return False
-    return not isinstance(element, Comment)
-
-
-def text_from_html(body):
-    """Extract visible plain text from an HTML string."""
-    soup = BeautifulSoup(body, "html.parser")
-    texts = soup.findAll(text=True)
-    visible_texts = filter(tag_visible, texts)
-    return " ".join(t.strip() for t in visible_texts)
+# Fields of ``BlogEntry`` derived from its summary.
+SUMMARY_FIELDS = ("excerpt", "word_count", "teaser")
 
 
 class BlogEntry(models.Model):
@@ -42,6 +20,10 @@ class BlogEntry(models.Model):
     pub_date = models.DateTimeField()
     url = models.URLField("URL")
     feed = models.ForeignKey("Feed", on_delete=models.CASCADE)
+    # Derived from ``summary`` when saved or imported, see ``apps.blogs.parser.summarize``.
+    excerpt = models.TextField(blank=True, editable=False, help_text="Visible text of the summary")
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    teaser = models.TextField(blank=True, editable=False, help_text="Excerpt truncated for listings")
 
     class Meta:
         """Meta configuration for BlogEntry."""
@@ -49,20 +31,26 @@ class BlogEntry(models.Model):
         verbose_name = "Blog Entry"
         verbose_name_plural = "Blog Entries"
         get_latest_by = "pub_date"
+        constraints = [models.UniqueConstraint(fields=["feed", "url"], name="unique_blogentry_feed_url")]
 
     def __str__(self):
         """Return the blog entry title."""
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Save the entry, deriving its excerpt, word count and teaser from its summary."""
+        from apps.blogs.parser import summarize
+
+        for field, value in summarize(self.summary).items():
+            setattr(self, field, value)
+        if update_fields := kwargs.get("update_fields"):
+            kwargs["update_fields"] = {*update_fields, *SUMMARY_FIELDS}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         """Return the external URL of this blog entry."""
         return self.url
 
-    @property
-    def excerpt(self):
-        """Return a plain-text excerpt extracted from the summary HTML."""
-        return text_from_html(self.summary)
-
 
 class Feed(models.Model):
     """An RSS feed to import."""
@@ -71,6 +59,9 @@ class Feed(models.Model):
     website_url = models.URLField()
     feed_url = models.URLField()
     last_import = models.DateTimeField(blank=True, null=True)
+    # Validators of the last fetch of ``feed_url``, sent to skip unchanged feeds.
+    etag = models.CharField(max_length=255, blank=True, default="", editable=False)
+    last_modified = models.CharField(max_length=64, blank=True, default="", editable=False)
 
     def __str__(self):
         """Return the feed name."""
@@ -103,6 +94,9 @@ class RelatedBlog(ContentManageable):
     blog_name = models.CharField(max_length=200, help_text="Displayed Name")
     last_entry_published = models.DateTimeField(db_index=True)
     last_entry_title = models.CharField(max_length=500)
+    # Validators of the last fetch of ``feed_url``, sent to skip unchanged feeds.
+    etag = models.CharField(max_length=255, blank=True, default="", editable=False)
+    last_modified = models.CharField(max_length=64, blank=True, default="", editable=False)
 
     class Meta:
         """Meta configuration for RelatedBlog."""
@@ -119,10 +113,7 @@ class RelatedBlog(ContentManageable):
         return self.blog_url
 
     def update_blog_data(self):
-        """Update our related blog data."""
-        d = feedparser.parse(self.feed_url)
-        self.blog_name = d["feed"]["title"]
-        self.blog_url = d["feed"]["link"]
-        self.last_entry_published = d["feed"]["updated_parsed"]
-        self.last_entry_title = d["entries"][0]["title"]
-        self.save()
+        """Update our related blog data, unless its feed is unchanged since the last update."""
+        from apps.blogs.parser import update_related_blogs
+
+        update_related_blogs([self])
@@ -1,15 +1,38 @@
-"""RSS feed parsing and blog supernav rendering utilities."""
+"""RSS feed fetching, parsing and blog supernav rendering utilities.
+
+Feeds are fetched concurrently and conditionally, sending the ETag and
+Last-Modified values of their previous fetch; unchanged feeds answer 304 Not
+Modified and are neither downloaded nor parsed again. The plain-text excerpt,
+word count and teaser of each entry are computed once on import, rather than
+from its HTML summary whenever it is displayed.
+"""
 
 import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http import HTTPStatus
 from urllib.parse import urlparse, urlunparse
 
 import feedparser
+from bs4 import BeautifulSoup
+from bs4.element import Comment
 from django.conf import settings
+from django.db import transaction
 from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.text import Truncator
 
-from apps.blogs.models import BlogEntry, Feed
+from apps.blogs.models import SUMMARY_FIELDS, BlogEntry, Feed, RelatedBlog
 from apps.boxes.models import Box
 
+logger = logging.getLogger(__name__)
+
+# Feeds fetched at once by ``fetch_feeds``.
+FEED_FETCH_WORKERS = 8
+
+# Words of an entry's excerpt kept in its teaser.
+TEASER_WORDS = 50
+
 # Blogger serves RSS entry links with this legacy domain instead of
 # the canonical blog.python.org hostname.
 _BLOGGER_LEGACY_HOST = "pythoninsider.blogspot.com"
@@ -24,12 +47,53 @@ def _normalize_blog_url(url):
     return url
 
 
+def tag_visible(element):
+    """Return True if the HTML element contains visible text content.
+
+    Summaries are HTML fragments, so text at their top level is visible.
+    """
+    if element.parent.name in [
+        "style",
+        "script",
+        "head",
+        "title",
+        "meta",
+    ]:
+        return False
+    return not isinstance(element, Comment)
+
+
+def text_from_html(body):
+    """Extract visible plain text from an HTML string."""
+    soup = BeautifulSoup(body, "html.parser")
+    texts = soup.find_all(string=True)
+    visible_texts = filter(tag_visible, texts)
+    return " ".join(t.strip() for t in visible_texts)
+
+
+def summarize(summary):
+    """Return the excerpt, word count and teaser of an entry's HTML summary.
+
+    The excerpt and teaser are plain text, escaped when rendered.
+    """
+    words = text_from_html(summary).split()
+    return {
+        "excerpt": " ".join(words),
+        "word_count": len(words),
+        "teaser": Truncator(" ".join(words[: TEASER_WORDS + 1])).words(TEASER_WORDS),
+    }
+
+
 def get_all_entries(feed_url):
     """Retrieve all entries from a feed URL."""
-    d = feedparser.parse(feed_url)
+    return entries_from(feedparser.parse(feed_url))
+
+
+def entries_from(parsed):
+    """Return the entries of a parsed feed."""
     entries = []
 
-    for e in d["entries"]:
+    for e in parsed["entries"]:
         published = datetime.datetime(*e["published_parsed"][:7], tzinfo=datetime.UTC)
 
         entry = {
@@ -38,12 +102,88 @@ def get_all_entries(feed_url):
             "pub_date": published,
             "url": _normalize_blog_url(e["link"]),
         }
+        entry.update(summarize(entry["summary"]))
 
         entries.append(entry)
 
     return entries
 
 
+def fetch_feed(source):
+    """Fetch and parse the feed of a ``Feed`` or ``RelatedBlog``, sending the validators of its last fetch."""
+    return feedparser.parse(source.feed_url, etag=source.etag or None, modified=source.last_modified or None)
+
+
+def fetch_feeds(sources, workers=FEED_FETCH_WORKERS):
+    """Fetch the feeds of ``sources`` with ``workers`` threads, returning the changed ones.
+
+    Returns ``(source, parsed)`` pairs. Unchanged feeds are left out, and so
+    are feeds that could not be fetched or parsed, which are logged.
+    """
+    changed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_feed, source): source for source in sources}
+        for future in as_completed(futures):
+            source, parsed = futures[future], future.result()
+            if parsed.get("status") == HTTPStatus.NOT_MODIFIED:
+                continue
+            if parsed.get("bozo") and not parsed["entries"]:
+                logger.warning("Could not fetch feed %s: %s", source.feed_url, parsed.get("bozo_exception"))
+                continue
+            source.etag = parsed.get("etag", "")[:255]
+            source.last_modified = parsed.get("modified", "")[:64]
+            changed.append((source, parsed))
+    return changed
+
+
+def update_feeds(feeds, workers=FEED_FETCH_WORKERS):
+    """Import the entries of the changed ``feeds``, returning those feeds.
+
+    Entries are upserted on ``(feed, url)`` with a single statement, and the
+    feeds' validators and import times with another.
+    """
+    changed = fetch_feeds(feeds, workers=workers)
+    entries = {}
+    for feed, parsed in changed:
+        for entry in entries_from(parsed):
+            entries[feed.pk, entry["url"]] = BlogEntry(feed=feed, **entry)
+
+    if not changed:
+        return []
+    now = timezone.now()
+    for feed, _ in changed:
+        feed.last_import = now
+    with transaction.atomic():
+        BlogEntry.objects.bulk_create(
+            entries.values(),
+            update_conflicts=True,
+            unique_fields=["feed", "url"],
+            update_fields=["title", "summary", "pub_date", *SUMMARY_FIELDS],
+        )
+        Feed.objects.bulk_update([feed for feed, _ in changed], ["etag", "last_modified", "last_import"])
+    return [feed for feed, _ in changed]
+
+
+def update_related_blogs(blogs, workers=FEED_FETCH_WORKERS):
+    """Update the name, URL and latest entry of the ``blogs`` whose feeds changed, returning them."""
+    updated = []
+    for blog, parsed in fetch_feeds(blogs, workers=workers):
+        try:
+            blog.blog_name = parsed["feed"]["title"]
+            blog.blog_url = parsed["feed"]["link"]
+            blog.last_entry_published = datetime.datetime(*parsed["feed"]["updated_parsed"][:6], tzinfo=datetime.UTC)
+            blog.last_entry_title = parsed["entries"][0]["title"]
+        except (KeyError, IndexError, TypeError):
+            logger.exception("Could not update related blog %s", blog)
+            continue
+        updated.append(blog)
+    RelatedBlog.objects.bulk_update(
+        updated,
+        ["blog_name", "blog_url", "last_entry_published", "last_entry_title", "etag", "last_modified"],
+    )
+    return updated
+
+
 def _render_blog_supernav(entry):
     """Render blog supernav for testing update_blogs management command."""
     return render_to_string("blogs/supernav.html", {"entry": entry})
@@ -1,3 +1,6 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 
@@ -22,3 +25,44 @@ class BlogModelTest(TestCase):
 
         self.assertEqual(str(b), b.title)
         self.assertEqual(b.get_absolute_url(), b.url)
+
+    def test_summary_fields_are_derived_on_save(self):
+        feed = Feed.objects.create(name="psf blog", website_url="psf.example.org", feed_url="feed.psf.example.org")
+        entry = BlogEntry.objects.create(
+            title="Test Entry", summary="<p>Hello <i>world</i></p>", pub_date=timezone.now(), url="http://a", feed=feed
+        )
+        self.assertEqual((entry.excerpt, entry.word_count, entry.teaser), ("Hello world", 2, "Hello world"))
+
+        entry.summary = "<p>Goodbye</p>"
+        entry.save(update_fields=["summary"])
+        entry.refresh_from_db()
+        self.assertEqual((entry.excerpt, entry.word_count), ("Goodbye", 1))
+
+    def test_backfill_blog_summaries(self):
+        feed = Feed.objects.create(name="psf blog", website_url="psf.example.org", feed_url="feed.psf.example.org")
+        BlogEntry.objects.bulk_create(
+            [
+                BlogEntry(
+                    title=str(i),
+                    summary=f"<p>Entry <b>{i}</b></p>",
+                    pub_date=timezone.now(),
+                    url=f"http://{i}",
+                    feed=feed,
+                )
+                for i in range(3)
+            ]
+        )
+
+        out = StringIO()
+        call_command("backfill_blog_summaries", batch_size=2, stdout=out)
+        self.assertEqual(out.getvalue().strip(), "3 blog entries updated")
+        self.assertEqual(
+            list(BlogEntry.objects.order_by("title").values_list("excerpt", "word_count", "teaser")),
+            [(f"Entry {i}", 2, f"Entry {i}") for i in range(3)],
+        )
+
+        out = StringIO()
+        call_command("backfill_blog_summaries", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "0 blog entries updated")
+        call_command("backfill_blog_summaries", all=True, stdout=out)
+        self.assertIn("3 blog entries updated", out.getvalue())
@@ -1,7 +1,15 @@
 import datetime
 import unittest
+from io import StringIO
+from unittest.mock import patch
 
-from apps.blogs.parser import _normalize_blog_url, get_all_entries
+import feedparser
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.blogs.models import BlogEntry, Feed, RelatedBlog
+from apps.blogs.parser import TEASER_WORDS, _normalize_blog_url, get_all_entries, summarize, update_feeds
 from apps.blogs.tests.utils import get_test_rss_path
 
 
@@ -20,12 +28,31 @@ class BlogParserTest(unittest.TestCase):
             self.entries[0]["summary"],
         )
         self.assertIsInstance(self.entries[0]["pub_date"], datetime.datetime)
+        self.assertTrue(
+            self.entries[0]["excerpt"].startswith("We're happy to announce the new way to file a contributor agreement")
+        )
+        self.assertEqual(self.entries[0]["word_count"], len(self.entries[0]["excerpt"].split()))
         self.assertEqual(
             self.entries[0]["url"],
             "http://feedproxy.google.com/~r/PythonInsider/~3/tGNCqyOiun4/introducing-electronic-contributor.html",
         )
 
 
+class SummarizeTest(unittest.TestCase):
+    def test_visible_text(self):
+        summary = summarize("Hello <b>world</b> &amp; all<script>alert(1)</script>\n<!-- hidden -->")
+        self.assertEqual(summary, {"excerpt": "Hello world & all", "word_count": 4, "teaser": "Hello world & all"})
+
+    def test_teaser_is_truncated(self):
+        words = [f"word{i}" for i in range(TEASER_WORDS + 10)]
+        summary = summarize(f"<p>{' '.join(words)}</p>")
+        self.assertEqual(summary["word_count"], TEASER_WORDS + 10)
+        self.assertEqual(summary["teaser"], " ".join(words[:TEASER_WORDS]) + "…")
+
+    def test_empty_summary(self):
+        self.assertEqual(summarize(""), {"excerpt": "", "word_count": 0, "teaser": ""})
+
+
 class NormalizeBlogUrlTest(unittest.TestCase):
     def test_rewrites_pythoninsider_blogspot(self):
         url = "https://pythoninsider.blogspot.com/2026/02/join-the-python-security-response-team.html"
@@ -48,3 +75,83 @@ class NormalizeBlogUrlTest(unittest.TestCase):
     def test_preserves_blog_python_org_urls(self):
         url = "https://blog.python.org/2026/02/some-post.html"
         self.assertEqual(_normalize_blog_url(url), url)
+
+
+class FakeFeeds:
+    """Stand-in for ``feedparser.parse`` answering 304 to requests carrying the current ETag."""
+
+    def __init__(self):
+        self.parse = feedparser.parse
+        self.etag = '"v1"'
+        self.requests = []
+
+    def __call__(self, url, etag=None, modified=None):
+        self.requests.append((url, etag))
+        if etag == self.etag:
+            return feedparser.FeedParserDict(status=304, etag=etag, entries=[], feed={})
+        parsed = self.parse(url)
+        parsed["status"] = 200
+        parsed["etag"] = self.etag
+        parsed["modified"] = "Tue, 27 Aug 2013 04:33:50 GMT"
+        return parsed
+
+
+class UpdateFeedsTest(TestCase):
+    def setUp(self):
+        self.feeds = FakeFeeds()
+        patcher = patch("apps.blogs.parser.feedparser.parse", new=self.feeds)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.feed = Feed.objects.create(name="psf", website_url="https://example.org", feed_url=get_test_rss_path())
+        self.blog = RelatedBlog.objects.create(
+            name="psf",
+            feed_url=get_test_rss_path(),
+            blog_url="https://example.org",
+            blog_name="",
+            last_entry_published=timezone.now(),
+            last_entry_title="",
+        )
+
+    def test_unchanged_feeds_are_skipped(self):
+        call_command("update_blogs", stdout=StringIO())
+
+        self.assertEqual(BlogEntry.objects.filter(feed=self.feed).count(), 25)
+        self.feed.refresh_from_db()
+        self.assertEqual(self.feed.etag, '"v1"')
+        self.assertEqual(self.feed.last_modified, "Tue, 27 Aug 2013 04:33:50 GMT")
+        self.assertIsNotNone(self.feed.last_import)
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.last_entry_title, "Introducing Electronic Contributor Agreements")
+        self.assertEqual(self.blog.last_entry_published, datetime.datetime(2013, 8, 27, 4, 33, 50, tzinfo=datetime.UTC))
+
+        out = StringIO()
+        with self.assertNumQueries(2):
+            call_command("update_blogs", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "0 feeds and 0 related blogs changed")
+        self.assertEqual(self.feeds.requests[-1], (get_test_rss_path(), '"v1"'))
+
+    def test_entries_are_upserted_on_feed_and_url(self):
+        entry = get_all_entries(get_test_rss_path())[0]
+        existing = BlogEntry.objects.create(
+            feed=self.feed, url=entry["url"], title="Old title", summary="", pub_date=timezone.now()
+        )
+
+        self.assertEqual(update_feeds(Feed.objects.all()), [self.feed])
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.title, entry["title"])
+        self.assertEqual(existing.excerpt, entry["excerpt"])
+        self.assertEqual(BlogEntry.objects.filter(feed=self.feed).count(), 25)
+
+        self.feeds.etag = '"v2"'
+        self.assertEqual(len(update_feeds(Feed.objects.all())), 1)
+        self.assertEqual(BlogEntry.objects.filter(feed=self.feed).count(), 25)
+
+    def test_broken_feeds_are_logged_and_skipped(self):
+        Feed.objects.create(name="broken", website_url="https://example.org", feed_url="/nonexistent/feed.xml")
+
+        with patch("apps.blogs.parser.logger") as logger:
+            feeds = update_feeds(Feed.objects.all(), workers=2)
+
+        self.assertEqual(feeds, [self.feed])
+        logger.warning.assert_called_once()
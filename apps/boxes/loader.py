@@ -0,0 +1,99 @@
+"""Batch loading and caching of rendered box content.
+
+A page usually renders several boxes. Instead of one query per ``{% box %}``
+tag, the labels a template has used before are fetched together the first
+time any of them is needed during a request: one cache round trip, and at
+most one query for the labels that are not cached yet. Rendered HTML stays
+cached until the box is saved or deleted; unknown labels are cached too, so a
+typo in a template does not cost a query per page view.
+"""
+
+from collections import defaultdict
+from threading import Lock
+
+from django.core.cache import cache
+
+from apps.boxes.models import Box
+
+BOX_CACHE_VERSION = 1
+BOX_CACHE_TIMEOUT = 60 * 60 * 24
+# Stored for labels without a Box, since ``None`` cannot be told apart from a miss.
+MISSING_BOX = False
+
+# Most labels remembered per template; templates passing computed labels to
+# ``{% box %}`` would otherwise grow their set without bound.
+TEMPLATE_BOX_LABELS_LIMIT = 50
+
+# Labels rendered so far, keyed by the name of the top-level template. Shared
+# by every thread of the process, so only touched while holding the lock.
+_template_labels = defaultdict(set)
+_template_labels_lock = Lock()
+
+
+def box_cache_key(label):
+    """Return the cache key holding the rendered content of a box."""
+    return f"box-rendered:{label}"
+
+
+def get_rendered_boxes(labels):
+    """Return a dict mapping each label to its rendered content, or None if missing."""
+    keys = {box_cache_key(label): label for label in set(labels)}
+    cached = cache.get_many(keys, version=BOX_CACHE_VERSION)
+    rendered = {keys[key]: (None if value is MISSING_BOX else value) for key, value in cached.items()}
+
+    missing = set(keys.values()) - rendered.keys()
+    if missing:
+        found = dict(Box.objects.filter(label__in=missing).values_list("label", "_content_rendered"))
+        to_cache = {}
+        for label in missing:
+            rendered[label] = found.get(label)
+            to_cache[box_cache_key(label)] = found.get(label, MISSING_BOX)
+        cache.set_many(to_cache, BOX_CACHE_TIMEOUT, version=BOX_CACHE_VERSION)
+    return rendered
+
+
+def cache_rendered_box(box):
+    """Store the freshly rendered content of a saved box."""
+    cache.set(box_cache_key(box.label), box.content.rendered, BOX_CACHE_TIMEOUT, version=BOX_CACHE_VERSION)
+
+
+def forget_rendered_box(label):
+    """Mark a deleted box's label as missing."""
+    cache.set(box_cache_key(label), MISSING_BOX, BOX_CACHE_TIMEOUT, version=BOX_CACHE_VERSION)
+
+
+class BoxLoader:
+    """Rendered boxes fetched so far while rendering a single request."""
+
+    def __init__(self):
+        """Start with nothing loaded."""
+        self.rendered = {}
+
+    def get(self, label, prefetch=()):
+        """Return the rendered content for a label, loading ``prefetch`` labels in the same batch."""
+        if label not in self.rendered:
+            wanted = {label, *prefetch} - self.rendered.keys()
+            self.rendered.update(get_rendered_boxes(wanted))
+        return self.rendered[label]
+
+
+def get_box_loader(context):
+    """Return the loader for the current request, or for this render when there is no request."""
+    request = context.get("request")
+    holder = request if request is not None else context.render_context
+    loader = getattr(holder, "box_loader", None)
+    if loader is None:
+        loader = BoxLoader()
+        holder.box_loader = loader
+    return loader
+
+
+def template_box_labels(context, label):
+    """Record that the top-level template uses a label and return a snapshot of all labels it has used."""
+    template = context.template
+    name = template.origin.name if template is not None else None
+    with _template_labels_lock:
+        labels = _template_labels[name]
+        if len(labels) < TEMPLATE_BOX_LABELS_LIMIT:
+            labels.add(label)
+        return frozenset(labels)
@@ -9,13 +9,21 @@ These should also not be used for single pages, for that see the pages app.
 
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from markupfield.fields import MarkupField
 
 from apps.cms.models import ContentManageable
+from fastly.utils import purge_objects
 
 DEFAULT_MARKUP_TYPE = getattr(settings, "DEFAULT_MARKUP_TYPE", "restructuredtext")
 
 
+def box_surrogate_key(label):
+    """Return the surrogate key of the pages that render a box."""
+    return f"box-{label}"
+
+
 class Box(ContentManageable):
     """A reusable, admin-editable content snippet identified by a unique label."""
 
@@ -26,7 +34,31 @@ class Box(ContentManageable):
         """Return the box label."""
         return self.label
 
+    @property
+    def surrogate_key(self):
+        """Return the surrogate key of the pages that render this box."""
+        return box_surrogate_key(self.label)
+
     class Meta:
         """Meta configuration for Box."""
 
         verbose_name_plural = "boxes"
+
+
+@receiver(post_save, sender=Box)
+def cache_box_on_save(sender, instance, **kwargs):
+    """Refresh the cached rendered content and purge the pages rendering a saved box."""
+    from apps.boxes.loader import cache_rendered_box
+
+    cache_rendered_box(instance)
+    if not kwargs.get("raw", False):
+        purge_objects(instance, urls=[f"/box/{instance.label}/"])
+
+
+@receiver(post_delete, sender=Box)
+def forget_box_on_delete(sender, instance, **kwargs):
+    """Mark the label as missing in the cache and purge the pages rendering a deleted box."""
+    from apps.boxes.loader import forget_rendered_box
+
+    forget_rendered_box(instance.label)
+    purge_objects(instance, urls=[f"/box/{instance.label}/"])
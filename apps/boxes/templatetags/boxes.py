@@ -5,17 +5,23 @@ import logging
 from django import template
 from django.utils.html import mark_safe
 
-from apps.boxes.models import Box
+from apps.boxes.loader import get_box_loader, template_box_labels
+from apps.boxes.models import box_surrogate_key
+from fastly.utils import tag_surrogate_keys
 
 log = logging.getLogger(__name__)
 register = template.Library()
 
 
-@register.simple_tag
-def box(label):
-    """Render the content of a Box identified by its label slug."""
-    try:
-        return mark_safe(Box.objects.only("content").get(label=label).content.rendered)  # noqa: S308
-    except Box.DoesNotExist:
+@register.simple_tag(takes_context=True)
+def box(context, label):
+    """Render the content of a Box identified by its label slug.
+
+    All labels the current template has rendered before are loaded in one batch.
+    """
+    tag_surrogate_keys(box_surrogate_key(label))
+    rendered = get_box_loader(context).get(label, prefetch=template_box_labels(context, label))
+    if rendered is None:
         log.warning("WARNING: box not found: label=%s", label)
         return ""
+    return mark_safe(rendered)  # noqa: S308
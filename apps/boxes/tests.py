@@ -1,15 +1,26 @@
 import logging
 
 from django import template
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
+from apps.boxes import loader
 from apps.boxes.models import Box
 
 logging.disable(logging.CRITICAL)
 
 
+def box_queries(queries):
+    return [q for q in queries.captured_queries if '"boxes_box"' in q["sql"]]
+
+
 class BaseTestCase(TestCase):
     def setUp(self):
+        # Inline templates all share one entry in the per-template label registry.
+        with loader._template_labels_lock:  # noqa: SLF001 - resetting module state between tests
+            loader._template_labels.clear()  # noqa: SLF001 - see above
         self.box = Box.objects.create(label="test", content="test content")
 
 
@@ -26,9 +37,56 @@ class TemplateTagTests(BaseTestCase):
         r = self.render('{% load boxes %}{% box "missing" %}')
         self.assertEqual(r, "")
 
+    def test_tag_batches_labels_used_by_template(self):
+        Box.objects.create(label="other", content="other content")
+        tmpl = '{% load boxes %}{% box "test" %}{% box "other" %}{% box "missing" %}'
+        self.render(tmpl)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            r = self.render(tmpl)
+        # One query for every label the template used before.
+        self.assertEqual(len(box_queries(queries)), 1)
+        self.assertIn("test content", r)
+        self.assertIn("other content", r)
+
+    def test_labels_remembered_per_template_are_bounded(self):
+        tmpl = "{% load boxes %}{% for label in labels %}{% box label %}{% endfor %}"
+        labels = [f"generated-{i}" for i in range(loader.TEMPLATE_BOX_LABELS_LIMIT + 10)]
+        self.render(tmpl, labels=labels)
+        with loader._template_labels_lock:  # noqa: SLF001 - inspecting the module state under test
+            remembered = set().union(*loader._template_labels.values())  # noqa: SLF001 - see above
+        self.assertLessEqual(len(remembered & set(labels)), loader.TEMPLATE_BOX_LABELS_LIMIT)
+
+    def test_missing_label_is_negatively_cached(self):
+        self.render('{% load boxes %}{% box "missing" %}')
+        with CaptureQueriesContext(connection) as queries:
+            r = self.render('{% load boxes %}{% box "missing" %}')
+        self.assertEqual(box_queries(queries), [])
+        self.assertEqual(r, "")
+
+    def test_saving_box_refreshes_cached_content(self):
+        self.render('{% load boxes %}{% box "test" %}')
+        self.box.content = "updated content"
+        self.box.save()
+        r = self.render('{% load boxes %}{% box "test" %}')
+        self.assertIn("updated content", r)
+
+    def test_creating_and_deleting_box_updates_negative_cache(self):
+        self.render('{% load boxes %}{% box "later" %}')
+        later = Box.objects.create(label="later", content="later content")
+        self.assertIn("later content", self.render('{% load boxes %}{% box "later" %}'))
+        later.delete()
+        self.assertEqual(self.render('{% load boxes %}{% box "later" %}'), "")
+
 
 class ViewTests(BaseTestCase):
     @override_settings(ROOT_URLCONF="apps.boxes.urls")
     def test_box_view(self):
         r = self.client.get("/test/")
         self.assertContains(r, self.box.content.rendered)
+        self.assertIn("box-test", r["Surrogate-Key"].split())
+
+    @override_settings(ROOT_URLCONF="apps.boxes.urls")
+    def test_box_view_missing_label(self):
+        r = self.client.get("/missing/")
+        self.assertEqual(r.status_code, 404)
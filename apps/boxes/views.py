@@ -1,12 +1,17 @@
 """Views for the boxes app."""
 
-from django.http import HttpResponse
-from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse
 
-from apps.boxes.models import Box
+from apps.boxes.loader import get_rendered_boxes
+from apps.boxes.models import box_surrogate_key
+from fastly.utils import tag_surrogate_keys
 
 
 def box(request, label):
     """Return the rendered content of a box identified by its label."""
-    b = get_object_or_404(Box, label=label)
-    return HttpResponse(b.content.rendered)
+    tag_surrogate_keys(box_surrogate_key(label))
+    rendered = get_rendered_boxes([label])[label]
+    if rendered is None:
+        msg = "No box found with that label."
+        raise Http404(msg)
+    return HttpResponse(rendered)
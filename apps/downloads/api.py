@@ -10,10 +10,22 @@ from tastypie.constants import ALL, ALL_WITH_RELATIONS
 from tastypie.exceptions import BadRequest
 from tastypie.validation import Validation
 
+from apps.downloads.bulk import delete_release_files
 from apps.downloads.models import OS, Release, ReleaseFile
-from apps.downloads.serializers import OSSerializer, ReleaseFileSerializer, ReleaseSerializer
+from apps.downloads.serializers import (
+    OSSerializer,
+    ReleaseFileBatchSerializer,
+    ReleaseFileSerializer,
+    ReleaseSerializer,
+)
 from apps.pages.api import PageResource
-from pydotorg.drf import BaseAPIViewSet, BaseFilterSet, IsStaffOrReadOnly
+from pydotorg.drf import (
+    BaseAPIViewSet,
+    BaseFilterSet,
+    ConditionalGetMixin,
+    IsStaffOrReadOnly,
+    OptionalCursorPagination,
+)
 from pydotorg.resources import GenericResource, OnlyPublishedAuthorization
 
 
@@ -143,6 +155,11 @@ class ReleaseFileResource(GenericResource):
             raise BadRequest(msg)
         return super().delete_list(request, **kwargs)
 
+    def obj_delete_list(self, bundle, **kwargs):
+        """Delete the filtered release files as one batch, refreshing the downloads once."""
+        objects_to_delete = self.obj_get_list(bundle=bundle, **kwargs)
+        delete_release_files(self.authorized_delete_list(objects_to_delete, bundle))
+
 
 # Django Rest Framework
 
@@ -157,11 +174,24 @@ class OSViewSet(viewsets.ModelViewSet):
     filterset_fields = ("name", "slug")
 
 
-class ReleaseViewSet(BaseAPIViewSet):
+class ReleaseCursorPagination(OptionalCursorPagination):
+    """Page through releases, newest first."""
+
+    ordering = ("-release_date", "-pk")
+
+
+class ReleaseFileCursorPagination(OptionalCursorPagination):
+    """Page through release files in the order they were added."""
+
+    ordering = ("pk",)
+
+
+class ReleaseViewSet(ConditionalGetMixin, BaseAPIViewSet):
     """DRF viewset for CRUD operations on releases."""
 
     model = Release
     serializer_class = ReleaseSerializer
+    pagination_class = ReleaseCursorPagination
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsStaffOrReadOnly,)
     filterset_fields = (
@@ -190,15 +220,32 @@ class ReleaseFileFilter(BaseFilterSet):
         }
 
 
-class ReleaseFileViewSet(viewsets.ModelViewSet):
+class ReleaseFileViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """DRF viewset for CRUD operations on release files."""
 
     queryset = ReleaseFile.objects.all()
     serializer_class = ReleaseFileSerializer
+    pagination_class = ReleaseFileCursorPagination
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsStaffOrReadOnly,)
     filterset_class = ReleaseFileFilter
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create or update a release's files in one transaction.
+
+        Takes ``{"release": <release URL>, "files": [...]}``. Files whose
+        slug matches one of the release's files update it, the others are
+        created. Either every file is written or none is. Answers 201 Created
+        if any file was created and 200 OK if all of them were updated.
+        """
+        serializer = ReleaseFileBatchSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        created = any(file.pk is None for file in serializer.validated_data["release_files"])
+        files = serializer.save()
+        data = self.get_serializer(files, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
     @action(detail=False, methods=["delete"])
     def delete_by_release(self, request):
         """Delete all release files associated with a given release."""
@@ -211,6 +258,5 @@ class ReleaseFileViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_400_BAD_REQUEST)
         # TODO: We can add support for pagination in the future.
         queryset = self.get_queryset().filter(release_id=release_id)
-        # This calls 'mixins.DestroyModelMixin.perform_destroy()'.
-        self.perform_destroy(queryset)
+        delete_release_files(queryset)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,134 @@
+"""Batch writes and deletes of release files that run the change hooks once per batch.
+
+Release managers upload or replace every file of a release at once. Saving
+them one by one validates each against the database and regenerates the
+download boxes and purges the CDN per file; these helpers validate a whole
+batch against one snapshot of the release's files, write it in a few
+statements, and run the change hooks once per batch.
+"""
+
+import copy
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.downloads.models import (
+    RELEASE_FILE_DOWNLOAD_BUTTON_ERROR,
+    Release,
+    ReleaseFile,
+    invalidate_cached_releases,
+    release_file_batch,
+    release_files_changed,
+    validate_release_file_urls,
+)
+
+
+def prepare_release_files(release, items):
+    """Build the release files described by ``items`` and validate them as a batch.
+
+    Each item is a dict of ``ReleaseFile`` field values with ``os`` already
+    resolved to an ``OS``. Items whose slug matches one of the release's files
+    update that file; the others are new files. Returns the files and a list
+    with a dict of field errors per item, which are all empty if the batch is
+    valid.
+    """
+    slugs = [item.get("slug") or slugify(item.get("name", "")) for item in items]
+    urls = [item.get("url", "") for item in items]
+    existing = {file.slug: file for file in release.files.all()}
+    taken = ReleaseFile.objects.exclude(release=release).filter(Q(slug__in=slugs) | Q(url__in=urls))
+    taken_slugs, taken_urls = set(), set()
+    for slug, url in taken.values_list("slug", "url"):
+        taken_slugs.add(slug)
+        taken_urls.add(url)
+    url_owners = {file.url: slug for slug, file in existing.items() if slug not in slugs}
+
+    now = timezone.now()
+    files, errors = [], []
+    seen_slugs, seen_urls = set(), set()
+    for item, slug, url in zip(items, slugs, urls, strict=True):
+        item_errors = {}
+        previous = existing.get(slug)
+        file = copy.copy(previous) if previous is not None else ReleaseFile(release=release, created=now)
+        for field_name, value in item.items():
+            setattr(file, field_name, value)
+        file.slug = slug
+        file.updated = now
+
+        if slug in seen_slugs or slug in taken_slugs:
+            item_errors.setdefault("slug", []).append("A release file with this slug already exists.")
+        if url in seen_urls or url in taken_urls or url in url_owners:
+            item_errors.setdefault("url", []).append("A release file with this URL already exists.")
+        seen_slugs.add(slug)
+        seen_urls.add(url)
+        try:
+            validate_release_file_urls(file, previous=previous)
+        except ValidationError as exc:
+            for field_name, messages in exc.message_dict.items():
+                item_errors.setdefault(field_name, []).extend(messages)
+
+        files.append(file)
+        errors.append(item_errors)
+
+    # Files left out of the batch keep their download buttons.
+    untouched = [file for slug, file in existing.items() if slug not in seen_slugs]
+    _check_download_buttons(untouched, files, errors)
+    return files, errors
+
+
+def _check_download_buttons(untouched, files, errors):
+    """Add an error to each batch file whose OS ends up with more than one download button."""
+    buttons = {}
+    for file in [*untouched, *files]:
+        if file.download_button:
+            buttons[file.os_id] = buttons.get(file.os_id, 0) + 1
+    for file, item_errors in zip(files, errors, strict=True):
+        if file.download_button and buttons[file.os_id] > 1:
+            item_errors.setdefault("download_button", []).append(RELEASE_FILE_DOWNLOAD_BUTTON_ERROR)
+
+
+def save_release_files(release, files, fields):
+    """Write files built by ``prepare_release_files`` in one transaction.
+
+    Existing files are updated with a single ``bulk_update`` of ``fields``,
+    new ones inserted with a single ``bulk_create``. The download boxes, CDN
+    purges and cached release data are then refreshed once for the batch.
+    """
+    updates = [file for file in files if file.pk is not None]
+    creates = [file for file in files if file.pk is None]
+    with transaction.atomic():
+        if updates:
+            ReleaseFile.objects.bulk_update(updates, fields={*fields, "slug", "updated"} - {"release"})
+        if creates:
+            ReleaseFile.objects.bulk_create(creates)
+        invalidate_cached_releases(ReleaseFile)
+        release_files_changed(release, [file.os_id for file in files])
+    return files
+
+
+def delete_release_files(queryset):
+    """Delete the release files in ``queryset``, running the change hooks once rather than per file.
+
+    The releases that lost files are recorded first so their download boxes,
+    CDN purges and cached release data are refreshed once afterwards. Django
+    cannot fast-delete models with ``post_delete`` receivers, so the files are
+    still loaded and a signal is still sent for each of them; only the
+    receivers' work is skipped. Returns the number of deleted files.
+    """
+    with transaction.atomic():
+        affected = {}
+        for release_id, os_id in queryset.order_by().values_list("release_id", "os_id").distinct():
+            affected.setdefault(release_id, []).append(os_id)
+        if not affected:
+            return 0
+        token = release_file_batch.set(True)
+        try:
+            deleted, _ = queryset.delete()
+        finally:
+            release_file_batch.reset(token)
+        invalidate_cached_releases(ReleaseFile)
+        for release in Release.objects.filter(pk__in=affected).select_related("release_page"):
+            release_files_changed(release, affected[release.pk])
+    return deleted
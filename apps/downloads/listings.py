@@ -0,0 +1,85 @@
+"""Ordering and grouping of release files for the download pages."""
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+# Featured download buttons are shown for macOS first, then Windows, then source.
+FEATURED_OS_ORDER = {"macos": 1, "windows": 2, "source": 3}
+RELEASE_FILE_LISTING_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def release_file_listing(release):
+    """Return the featured files, file table rows and optional table columns of a release page.
+
+    The files are loaded in one query and partitioned in one pass. The result
+    is cached under a key built from the release's and its files' ``updated``
+    timestamps, so it is rebuilt whenever either changes.
+    """
+    stamp = release.files.aggregate(count=Count("pk"), updated=Max("updated"))
+    files_updated = stamp["updated"].timestamp() if stamp["updated"] else 0
+    cache_key = f"downloads-release-files:{release.pk}:{release.updated.timestamp()}:{stamp['count']}:{files_updated}"
+    listing = cache.get(cache_key)
+    if listing is not None:
+        return listing
+
+    featured_files = []
+    source_files = []
+    other_files = []
+    columns = dict.fromkeys(("sigstore", "sbom", "gpg", "sha256", "md5"), False)
+    for file in release.files.select_related("os").order_by("os__slug", "name"):
+        if file.download_button:
+            featured_files.append(file)
+        if file.os.slug == "source":
+            source_files.append(file)
+        else:
+            other_files.append(file)
+        columns["sigstore"] |= bool(
+            file.sigstore_bundle_file or file.sigstore_cert_file or file.sigstore_signature_file
+        )
+        columns["sbom"] |= bool(file.sbom_spdx2_file)
+        columns["gpg"] |= bool(file.gpg_signature_file)
+        columns["sha256"] |= bool(file.sha256_sum)
+        columns["md5"] |= bool(file.md5_sum)
+
+    featured_files.sort(key=lambda file: FEATURED_OS_ORDER.get(file.os.slug, len(FEATURED_OS_ORDER) + 1))
+    listing = {
+        "featured_files": featured_files,
+        "release_files": sort_windows(source_files + other_files),
+        "file_columns": columns,
+    }
+    cache.set(cache_key, listing, RELEASE_FILE_LISTING_CACHE_TIMEOUT)
+    return listing
+
+
+def sort_windows(files):
+    """Sort Windows files into a preferred display order."""
+    if not files:
+        return files
+
+    # Put Windows files in preferred order
+    files = list(files)
+    windows_files = []
+    other_files = []
+    for preferred in (
+        "Windows installer (64-bit)",
+        "Windows installer (32-bit)",
+        "Windows installer (ARM64)",
+        "Windows help file",
+        "Windows embeddable package (64-bit)",
+        "Windows embeddable package (32-bit)",
+        "Windows embeddable package (ARM64)",
+    ):
+        for file in files:
+            if file.name == preferred:
+                windows_files.append(file)
+                files.remove(file)
+                break
+
+    # Then append any remaining Windows files
+    for file in files:
+        if file.name.startswith("Windows"):
+            windows_files.append(file)
+        else:
+            other_files.append(file)
+
+    return other_files + windows_files
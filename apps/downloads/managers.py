@@ -1,8 +1,52 @@
 """Managers and querysets for filtering Python releases."""
 
-from django.db.models import Manager
+import datetime as dt
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import F, Manager
 from django.db.models.query import QuerySet
 
+DOWNLOAD_MATRIX_CACHE_KEY = "downloads-matrix"
+DOWNLOAD_MATRIX_CACHE_TIMEOUT = 60 * 60 * 24
+LATEST_PYTHON3_SERIES_CACHE_KEY = "downloads-latest-python3-series"
+DOCS_VERSION_INDEX_CACHE_KEY = "downloads-docs-version-index"
+# The parsed ``Release.major`` version number of Python 3 releases.
+PYTHON3_MAJOR = 3
+
+# Releases whose documentation was never published.
+RELEASES_WITHOUT_DOCS = {"2.3.6", "2.3.7", "2.4.5", "2.4.6", "2.5.5", "2.5.6"}
+
+# Documented releases that predate the release database.
+LEGACY_DOCS_RELEASES = {
+    "2.2": [
+        {"stage": "2.2p1", "date": dt.datetime(2002, 3, 29, tzinfo=dt.UTC)},
+    ],
+    "2.1": [
+        {"stage": "2.1.2", "date": dt.datetime(2002, 1, 16, tzinfo=dt.UTC)},
+        {"stage": "2.1.1", "date": dt.datetime(2001, 7, 20, tzinfo=dt.UTC)},
+        {"stage": "2.1", "date": dt.datetime(2001, 4, 15, tzinfo=dt.UTC)},
+    ],
+    "2.0": [
+        {"stage": "2.0", "date": dt.datetime(2000, 10, 16, tzinfo=dt.UTC)},
+    ],
+    "1.6": [
+        {"stage": "1.6", "date": dt.datetime(2000, 9, 5, tzinfo=dt.UTC)},
+    ],
+    "1.5": [
+        {"stage": "1.5.2p2", "date": dt.datetime(2000, 3, 22, tzinfo=dt.UTC)},
+        {"stage": "1.5.2p1", "date": dt.datetime(1999, 7, 6, tzinfo=dt.UTC)},
+        {"stage": "1.5.2", "date": dt.datetime(1999, 4, 30, tzinfo=dt.UTC)},
+        {"stage": "1.5.1p1", "date": dt.datetime(1998, 8, 6, tzinfo=dt.UTC)},
+        {"stage": "1.5.1", "date": dt.datetime(1998, 4, 14, tzinfo=dt.UTC)},
+        {"stage": "1.5", "date": dt.datetime(1998, 2, 17, tzinfo=dt.UTC)},
+    ],
+    "1.4": [
+        {"stage": "1.4", "date": dt.datetime(1996, 10, 25, tzinfo=dt.UTC)},
+    ],
+}
+
 
 class ReleaseQuerySet(QuerySet):
     """Custom queryset providing release filtering methods."""
@@ -47,8 +91,7 @@ class ReleaseQuerySet(QuerySet):
         """Return the latest Python 3 release, optionally for a specific minor version."""
         if minor_version is None:
             return self.python3().filter(is_latest=True)
-        pattern = rf"^Python 3\.{minor_version}\."
-        return self.python3().filter(name__regex=pattern).order_by("-release_date")
+        return self.python3().series(3, minor_version).filter(micro__isnull=False).by_version()
 
     def latest_prerelease(self):
         """Return the latest Python 3 prerelease queryset."""
@@ -58,6 +101,29 @@ class ReleaseQuerySet(QuerySet):
         """Return the latest Python install manager release queryset."""
         return self.pymanager().filter(is_latest=True)
 
+    def latest_in_each_series(self):
+        """Return the newest release of every feature series, in one ``DISTINCT ON`` query.
+
+        Unversioned releases are skipped. Results are ordered by version,
+        newest series first.
+        """
+        return (
+            self.filter(major__isnull=False, minor__isnull=False, micro__isnull=False)
+            .by_version()
+            .distinct("major", "minor")
+        )
+
+    def by_version(self):
+        """Order releases by version, newest first, with unversioned releases last."""
+        return self.order_by(
+            *(F(field).desc(nulls_last=True) for field in ("major", "minor", "micro", "release_level", "serial")),
+            "-release_date",
+        )
+
+    def series(self, major, minor):
+        """Return releases of one feature series, e.g. ``series(3, 14)`` for 3.14.x."""
+        return self.filter(major=major, minor=minor)
+
     def pre_release(self):
         """Return pre-release versions."""
         return self.filter(pre_release=True)
@@ -85,3 +151,115 @@ class ReleaseManager(Manager.from_queryset(ReleaseQuerySet)):
     def latest_pymanager(self):
         """Return the single latest Python install manager release or None."""
         return self.get_queryset().latest_pymanager().first()
+
+    def latest_python3_by_series(self):
+        """Return the latest published Python 3 release of every 3.x series, keyed by minor version.
+
+        ``latest_python3_by_series()[14]`` is the same release as
+        ``latest_python3(14)``. The mapping is loaded in one query and cached
+        until a release is saved or deleted.
+        """
+        latest = cache.get(LATEST_PYTHON3_SERIES_CACHE_KEY)
+        if latest is None:
+            latest = {
+                release.minor: release
+                for release in self.get_queryset()
+                .python3()
+                .filter(major=PYTHON3_MAJOR)
+                .latest_in_each_series()
+                .select_related("release_page")
+            }
+            cache.set(LATEST_PYTHON3_SERIES_CACHE_KEY, latest, DOWNLOAD_MATRIX_CACHE_TIMEOUT)
+        return latest
+
+    def docs_version_index(self):
+        """Return the documented releases grouped by feature version, newest first.
+
+        Each entry is a dict with ``version``, e.g. ``"3.14"``, and
+        ``releases``, a list of ``{"stage": "3.14.0", "date": datetime}``
+        dicts, newest first. Releases from before the release database are
+        included. The index is cached until a release is saved or deleted.
+        """
+        index = cache.get(DOCS_VERSION_INDEX_CACHE_KEY)
+        if index is None:
+            index = self._build_docs_version_index()
+            cache.set(DOCS_VERSION_INDEX_CACHE_KEY, index, DOWNLOAD_MATRIX_CACHE_TIMEOUT)
+        return index
+
+    def _build_docs_version_index(self):
+        """Group the published final releases and the legacy releases by feature version."""
+        releases = (
+            self.get_queryset()
+            .released()
+            .filter(major__isnull=False)
+            .values_list("major", "minor", "micro", "release_date")
+        )
+
+        version_groups = defaultdict(list)
+        for major, minor, micro, release_date in releases:
+            major_minor = f"{major}.{minor}"
+            full_version = major_minor if micro is None else f"{major_minor}.{micro}"
+            if full_version in RELEASES_WITHOUT_DOCS:
+                continue
+
+            # For 3.2.0 and earlier, use X.Y instead of X.Y.0
+            if micro == 0 and (major, minor) <= (3, 2):
+                full_version = major_minor
+
+            version_groups[major_minor].append({"stage": full_version, "date": release_date})
+
+        for version, items in LEGACY_DOCS_RELEASES.items():
+            version_groups[version].extend(dict(item) for item in items)
+
+        index = [
+            {"version": version, "releases": sorted(items, key=lambda item: item["date"], reverse=True)}
+            for version, items in version_groups.items()
+        ]
+        index.sort(key=lambda entry: [int(n) for n in entry["version"].split(".")], reverse=True)
+        return index
+
+    def download_matrix(self):
+        """Return the latest releases and their download button files, indexed by OS.
+
+        The result is a dict with ``latest``, mapping ``python2``, ``python3``
+        and ``pymanager`` to the latest published release of that kind (or
+        None), ``oses``, every OS in display order, and ``files``, mapping each
+        OS slug to the download button files of those releases keyed the same
+        way. It is loaded in three queries and cached until a release, a
+        release file or an OS is saved or deleted.
+        """
+        matrix = cache.get(DOWNLOAD_MATRIX_CACHE_KEY)
+        if matrix is None:
+            matrix = self._build_download_matrix()
+            cache.set(DOWNLOAD_MATRIX_CACHE_KEY, matrix, DOWNLOAD_MATRIX_CACHE_TIMEOUT)
+        return matrix
+
+    def _build_download_matrix(self):
+        """Load the latest releases, their download button files and every OS."""
+        kinds = {self.model.PYTHON2: "python2", self.model.PYTHON3: "python3", self.model.PYMANAGER: "pymanager"}
+        latest = dict.fromkeys(kinds.values())
+        for release in (
+            self.get_queryset()
+            .published()
+            .filter(is_latest=True, version__in=list(kinds))
+            .select_related("release_page")
+            .order_by("-name")
+        ):
+            # Ordered by descending name so the first by name wins, like ``.first()``.
+            latest[kinds[release.version]] = release
+
+        releases = {release.pk: kind for kind, release in latest.items() if release is not None}
+        release_file = apps.get_model("downloads", "ReleaseFile")
+        files = {}
+        for file in release_file.objects.filter(release__in=releases, download_button=True).select_related("os"):
+            kind = releases[file.release_id]
+            file.release = latest[kind]
+            files.setdefault(file.os.slug, {})[kind] = file
+
+        oses = list(apps.get_model("downloads", "OS").objects.all())
+        return {"latest": latest, "oses": oses, "files": files}
+
+
+def forget_cached_releases():
+    """Drop the cached download matrix, latest releases and docs index so the next request rebuilds them."""
+    cache.delete_many([DOWNLOAD_MATRIX_CACHE_KEY, LATEST_PYTHON3_SERIES_CACHE_KEY, DOCS_VERSION_INDEX_CACHE_KEY])
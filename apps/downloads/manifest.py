@@ -0,0 +1,180 @@
+"""The machine-readable manifest of every published release and its files.
+
+``releases.json`` is written to the default storage and served from
+``/downloads/releases.json`` with a long CDN lifetime. When releases or their
+files change, only their entries are rebuilt, the manifest is rewritten and
+its surrogate key is purged.
+
+Updates read the manifest written by the previous one, so they hold a cache
+lock while they run; the Celery task retries while another update holds it.
+Until the manifest is first written, the view queues a build and answers 503.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from apps.downloads.models import Release, ReleaseFile
+from fastly.utils import purge_objects
+
+logger = logging.getLogger(__name__)
+
+# Bump when the format changes incompatibly; older manifests are rebuilt.
+RELEASE_MANIFEST_VERSION = 1
+RELEASE_MANIFEST_NAME = "downloads/releases.json"
+RELEASE_MANIFEST_SURROGATE_KEY = "release-manifest"
+RELEASE_MANIFEST_URL = "/downloads/releases.json"
+RELEASE_MANIFEST_LOCK_KEY = "release-manifest:updating"
+RELEASE_MANIFEST_BUILD_PENDING_KEY = "release-manifest:build-pending"
+# Long enough for a full rebuild; a worker that dies mid-update only holds the lock this long.
+RELEASE_MANIFEST_LOCK_TIMEOUT = 5 * 60
+# Seconds clients are asked to wait while the manifest is first built.
+RELEASE_MANIFEST_RETRY_AFTER = 30
+RELEASE_FILE_MANIFEST_FIELDS = (
+    "name",
+    "url",
+    "filesize",
+    "md5_sum",
+    "sha256_sum",
+    "gpg_signature_file",
+    "sigstore_signature_file",
+    "sigstore_cert_file",
+    "sigstore_bundle_file",
+    "sbom_spdx2_file",
+    "is_source",
+    "download_button",
+)
+
+
+class ReleaseManifestLockedError(Exception):
+    """Raised when the manifest is updated while another update is in progress."""
+
+
+def release_manifest_entry(release):
+    """Return the manifest entry of a release, reading its prefetched ``files``."""
+    return {
+        "id": release.pk,
+        "name": release.name,
+        "slug": release.slug,
+        "version": release.get_version() or None,
+        "major": release.major,
+        "minor": release.minor,
+        "micro": release.micro,
+        "pre_release": release.pre_release,
+        "is_latest": release.is_latest,
+        "release_date": release.release_date.isoformat(),
+        "release_notes_url": release.release_notes_url,
+        "url": release.get_absolute_url(),
+        "files": [
+            {"os": file.os.slug, **{field: getattr(file, field) for field in RELEASE_FILE_MANIFEST_FIELDS}}
+            for file in release.files.all()
+        ],
+    }
+
+
+def _published_releases(release_ids=None):
+    """Return published releases with their files and OSes prefetched."""
+    releases = Release.objects.published().select_related("release_page")
+    if release_ids is not None:
+        releases = releases.filter(pk__in=release_ids)
+    files = ReleaseFile.objects.select_related("os").order_by("os__slug", "name")
+    return releases.prefetch_related(Prefetch("files", queryset=files))
+
+
+def build_release_manifest():
+    """Build the whole manifest from the database."""
+    return _manifest([release_manifest_entry(release) for release in _published_releases()])
+
+
+def _manifest(releases):
+    """Wrap release entries, newest first, in the versioned manifest document."""
+    releases.sort(key=lambda entry: (entry["release_date"], entry["id"]), reverse=True)
+    return {"version": RELEASE_MANIFEST_VERSION, "generated": timezone.now().isoformat(), "releases": releases}
+
+
+def read_release_manifest():
+    """Return the stored manifest, or None if it is missing or in an older format."""
+    if not default_storage.exists(RELEASE_MANIFEST_NAME):
+        return None
+    with default_storage.open(RELEASE_MANIFEST_NAME) as f:
+        try:
+            manifest = json.load(f)
+        except ValueError:
+            return None
+    if manifest.get("version") != RELEASE_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def write_release_manifest(manifest):
+    """Replace the stored manifest and purge it from the CDN.
+
+    Readers never see a missing or partly written manifest: on the local
+    filesystem it is written under a temporary name and renamed over the old
+    one, and remote storages such as S3 replace objects in one request.
+    """
+    content = ContentFile(json.dumps(manifest, separators=(",", ":")).encode())
+    try:
+        path = default_storage.path(RELEASE_MANIFEST_NAME)
+    except NotImplementedError:
+        default_storage.save(RELEASE_MANIFEST_NAME, content)
+    else:
+        # FileSystemStorage renames rather than overwrites existing files, so
+        # each writer gets its own temporary file.
+        temporary_name = default_storage.save(f"{RELEASE_MANIFEST_NAME}.tmp", content)
+        Path(default_storage.path(temporary_name)).replace(path)
+    purge_objects(RELEASE_MANIFEST_SURROGATE_KEY, urls=[RELEASE_MANIFEST_URL])
+
+
+def update_release_manifest(release_ids=None):
+    """Rebuild the entries of ``release_ids`` in the stored manifest, or all of it.
+
+    Releases that are no longer published are dropped. The whole manifest is
+    rebuilt when no ids are given or the stored one is missing or outdated.
+    Returns the written manifest, or raises ``ReleaseManifestLockedError`` if
+    another update is in progress.
+    """
+    if not cache.add(RELEASE_MANIFEST_LOCK_KEY, value=True, timeout=RELEASE_MANIFEST_LOCK_TIMEOUT):
+        raise ReleaseManifestLockedError
+    try:
+        manifest = read_release_manifest() if release_ids is not None else None
+        if manifest is None:
+            manifest = build_release_manifest()
+        else:
+            release_ids = set(release_ids)
+            entries = [entry for entry in manifest["releases"] if entry["id"] not in release_ids]
+            entries.extend(release_manifest_entry(release) for release in _published_releases(release_ids))
+            manifest = _manifest(entries)
+        write_release_manifest(manifest)
+    finally:
+        cache.delete(RELEASE_MANIFEST_LOCK_KEY)
+    return manifest
+
+
+def schedule_release_manifest_build():
+    """Queue a full build of the manifest once the current transaction commits, unless one is already queued.
+
+    The task clears the marker once the manifest is written. If the broker is
+    unreachable the marker is kept, so requests do not keep retrying until it
+    times out.
+    """
+    if not cache.add(RELEASE_MANIFEST_BUILD_PENDING_KEY, value=True, timeout=RELEASE_MANIFEST_LOCK_TIMEOUT):
+        return
+
+    def enqueue():
+        from apps.downloads.tasks import update_release_manifest_task
+
+        try:
+            update_release_manifest_task.delay()
+        except OperationalError:
+            logger.exception("Could not queue a release manifest build")
+
+    transaction.on_commit(enqueue)
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.16 on 2026-10-18 05:40
+
+import re
+
+from django.db import migrations, models
+
+RELEASE_VERSION_RE = re.compile(r"Python\s(\d+)\.(\d+)(?:\.(\d+))?(?:(a|b|rc)(\d+))?")
+RELEASE_LEVELS = {"a": 0xA, "b": 0xB, "rc": 0xC}
+FINAL = 0xF
+
+
+def fill_version_columns(apps, schema_editor):
+    Release = apps.get_model("downloads", "Release")
+    releases = []
+    for release in Release.objects.only("pk", "name").iterator():
+        match = RELEASE_VERSION_RE.match(release.name)
+        if match is None:
+            continue
+        major, minor, micro, level, serial = match.groups()
+        release.major = int(major)
+        release.minor = int(minor)
+        release.micro = int(micro) if micro is not None else None
+        release.release_level = RELEASE_LEVELS[level] if level else FINAL
+        release.serial = int(serial) if serial is not None else 0
+        releases.append(release)
+    Release.objects.bulk_update(releases, ["major", "minor", "micro", "release_level", "serial"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("downloads", "0015_releasefile_python_dot_org_urls"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="release",
+            name="major",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="release",
+            name="micro",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="release",
+            name="minor",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="release",
+            name="release_level",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                choices=[(10, "alpha"), (11, "beta"), (12, "release candidate"), (15, "final")],
+                editable=False,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="release",
+            name="serial",
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="release",
+            index=models.Index(
+                models.OrderBy(models.F("major"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("minor"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("micro"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("release_level"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("serial"), descending=True, nulls_last=True),
+                name="downloads_release_version_idx",
+            ),
+        ),
+        migrations.RunPython(fill_version_columns, reverse_code=migrations.RunPython.noop),
+    ]
@@ -1,26 +1,37 @@
 """Models for Python releases, release files, and operating systems."""
 
+import functools
+import logging
 import re
+from contextvars import ContextVar
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from kombu.exceptions import OperationalError
 from markupfield.fields import MarkupField
 
 from apps.boxes.models import Box
 from apps.cms.models import ContentManageable, NameSlugModel
-from apps.downloads.managers import ReleaseManager
+from apps.downloads.managers import ReleaseManager, forget_cached_releases
 from apps.pages.models import Page
-from fastly.utils import purge_surrogate_key, purge_url
+from fastly.utils import purge_objects, queue_purge, surrogate_list_key
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_MARKUP_TYPE = getattr(settings, "DEFAULT_MARKUP_TYPE", "markdown")
 PYTHON_DOT_ORG_HTTPS_PREFIX = "https://www.python.org/"
 PYTHON_DOT_ORG_HTTP_PREFIX = "http://www.python.org/"
+# True while ``apps.downloads.bulk`` deletes a batch of release files; the
+# release file signal receivers skip their per-file work and the batch runs
+# the change hooks once instead.
+release_file_batch = ContextVar("release_file_batch", default=False)
 RELEASE_FILE_URL_FIELDS = (
     "url",
     "gpg_signature_file",
@@ -37,6 +48,20 @@ RELEASE_FILE_SIDECAR_SUFFIXES = {
     "sbom_spdx2_file": ".spdx.json",
 }
 RELEASE_FILE_HTTPS_ERROR = "Release file URLs must begin with 'https://www.python.org/'."
+RELEASE_FILE_DOWNLOAD_BUTTON_ERROR = 'Only one Release File per OS can have "Download button" enabled'
+# "Python 3.14.0", "Python 3.14.0rc2", "Python 2.7"; anchored like Release.get_version().
+RELEASE_VERSION_RE = re.compile(r"Python\s(\d+)\.(\d+)(?:\.(\d+))?(?:(a|b|rc)(\d+))?")
+RELEASE_VERSION_FIELDS = ("major", "minor", "micro", "release_level", "serial")
+# Surrogate key of the pages showing the latest Python 2/3/install manager releases.
+LATEST_RELEASES_SURROGATE_KEY = "release-latest"
+# Cache key marking a download box update as queued, see DownloadBoxUpdater.
+DOWNLOAD_BOX_UPDATE_PENDING_KEY = "downloads-box-update-pending"
+# Long enough for the countdown and a rebuild; a task lost by the broker only
+# holds back the next rebuild this long.
+DOWNLOAD_BOX_UPDATE_PENDING_TIMEOUT = 5 * 60
+# Cache key marking a release's releases.json entry as queued for a rebuild,
+# see ReleaseManifestUpdater.
+RELEASE_MANIFEST_PENDING_KEY = "release-manifest-pending:{release_id}"
 
 
 class OS(ContentManageable, NameSlugModel):
@@ -112,6 +137,26 @@ class Release(ContentManageable, NameSlugModel):
 
     content = MarkupField(default_markup_type=DEFAULT_MARKUP_TYPE, default="")
 
+    # Parsed from ``name`` on save; ``major`` is None when the name has no version.
+    ALPHA = 0xA
+    BETA = 0xB
+    CANDIDATE = 0xC
+    FINAL = 0xF
+    RELEASE_LEVEL_CHOICES = (
+        (ALPHA, "alpha"),
+        (BETA, "beta"),
+        (CANDIDATE, "release candidate"),
+        (FINAL, "final"),
+    )
+    RELEASE_LEVELS = {"a": ALPHA, "b": BETA, "rc": CANDIDATE}
+    major = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    minor = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    micro = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    release_level = models.PositiveSmallIntegerField(
+        choices=RELEASE_LEVEL_CHOICES, null=True, blank=True, editable=False
+    )
+    serial = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
     objects = ReleaseManager()
 
     class Meta:
@@ -121,11 +166,43 @@ class Release(ContentManageable, NameSlugModel):
         verbose_name_plural = "Releases"
         ordering = ("name",)
         get_latest_by = "release_date"
+        indexes = [
+            # Matches ReleaseQuerySet.by_version(), also used for series lookups.
+            models.Index(
+                models.F("major").desc(nulls_last=True),
+                models.F("minor").desc(nulls_last=True),
+                models.F("micro").desc(nulls_last=True),
+                models.F("release_level").desc(nulls_last=True),
+                models.F("serial").desc(nulls_last=True),
+                name="downloads_release_version_idx",
+            ),
+        ]
 
     def __str__(self):
         """Return string representation."""
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Store the version parsed from the name before saving."""
+        self.set_version_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *RELEASE_VERSION_FIELDS}
+        super().save(*args, **kwargs)
+
+    def set_version_fields(self):
+        """Fill the version columns from the release name."""
+        match = RELEASE_VERSION_RE.match(self.name)
+        if match is None:
+            self.major = self.minor = self.micro = self.release_level = self.serial = None
+            return
+        major, minor, micro, level, serial = match.groups()
+        self.major = int(major)
+        self.minor = int(minor)
+        self.micro = int(micro) if micro is not None else None
+        self.release_level = self.RELEASE_LEVELS[level] if level else self.FINAL
+        self.serial = int(serial) if serial is not None else 0
+
     def get_absolute_url(self):
         """Return the URL for this release's detail page or its release page."""
         if not self.content.raw and self.release_page:
@@ -181,30 +258,29 @@ class Release(ContentManageable, NameSlugModel):
         """Return True if this release is Python 3.14 or later."""
         return self.is_version_at_least((3, 14))
 
+    @property
+    def series_surrogate_key(self):
+        """Return the surrogate key of pages that depend on the latest release in this feature series."""
+        if self.major is None:
+            return None
+        return f"release-series-{self.major}.{self.minor}"
+
 
 def update_supernav():
     """Regenerate the supernav download box with the latest release links."""
-    latest_python3 = Release.objects.latest_python3()
-    if not latest_python3:
+    matrix = Release.objects.download_matrix()
+    if not matrix["latest"]["python3"]:
         return
 
-    try:
-        latest_pymanager = Release.objects.latest_pymanager()
-    except Release.DoesNotExist:
-        latest_pymanager = None
-
     python_files = []
-    for o in OS.objects.all():
+    for o in matrix["oses"]:
+        files = matrix["files"].get(o.slug, {})
         data = {
             "os": o,
-            "python3": None,
-            "pymanager": None,
+            "python3": files.get("python3"),
+            "pymanager": files.get("pymanager"),
         }
 
-        data["python3"] = latest_python3.download_file_for_os(o.slug)
-        if latest_pymanager:
-            data["pymanager"] = latest_pymanager.download_file_for_os(o.slug)
-
         # Only include OSes that have at least one download file
         if data["python3"] or data["pymanager"]:
             python_files.append(data)
@@ -233,20 +309,15 @@ def update_supernav():
 
 def update_download_landing_sources_box():
     """Regenerate the download sources box with latest Python 2 and 3 source links."""
-    latest_python2 = Release.objects.latest_python2()
-    latest_python3 = Release.objects.latest_python3()
+    source_files = Release.objects.download_matrix()["files"].get("source", {})
 
     context = {}
 
-    if latest_python2:
-        latest_python2_source = latest_python2.download_file_for_os("source")
-        if latest_python2_source:
-            context["latest_python2_source"] = latest_python2_source
+    if source_files.get("python2"):
+        context["latest_python2_source"] = source_files["python2"]
 
-    if latest_python3:
-        latest_python3_source = latest_python3.download_file_for_os("source")
-        if latest_python3_source:
-            context["latest_python3_source"] = latest_python3_source
+    if source_files.get("python3"):
+        context["latest_python3_source"] = source_files["python3"]
 
     if "latest_python2_source" not in context or "latest_python3_source" not in context:
         return
@@ -265,8 +336,9 @@ def update_download_landing_sources_box():
 
 def update_homepage_download_box():
     """Regenerate the homepage download box with latest Python versions."""
-    latest_python2 = Release.objects.latest_python2()
-    latest_python3 = Release.objects.latest_python3()
+    latest = Release.objects.download_matrix()["latest"]
+    latest_python2 = latest["python2"]
+    latest_python3 = latest["python3"]
 
     context = {}
 
@@ -292,6 +364,115 @@ def update_homepage_download_box():
         box.save()
 
 
+@receiver(post_save, sender=OS)
+@receiver(post_delete, sender=OS)
+@receiver(post_save, sender=Release)
+@receiver(post_delete, sender=Release)
+@receiver(post_save, sender="downloads.ReleaseFile")
+@receiver(post_delete, sender="downloads.ReleaseFile")
+def invalidate_cached_releases(sender, **kwargs):
+    """Drop the release data cached by ``ReleaseManager`` now and again once the transaction commits.
+
+    The second pass drops data another request may have cached from the not
+    yet committed changes.
+    """
+    if release_file_batch.get() and sender is ReleaseFile:
+        return
+    forget_cached_releases()
+    transaction.on_commit(forget_cached_releases)
+
+
+def update_download_boxes():
+    """Regenerate every box built from the latest releases."""
+    update_supernav()
+    update_download_landing_sources_box()
+    update_homepage_download_box()
+
+
+class DownloadBoxUpdater:
+    """Regenerate the download boxes once per batch of release changes.
+
+    Release tooling uploads dozens of files per release, each one saved in its
+    own request. Changes only mark the boxes dirty; once the transaction
+    commits, a Celery task delayed by ``DOWNLOAD_BOX_UPDATE_DELAY`` seconds is
+    queued behind a ``cache.add`` marker, so that every change committed until
+    it runs is absorbed into the same rebuild.
+    """
+
+    def mark_dirty(self):
+        """Schedule a rebuild once the current transaction commits."""
+        transaction.on_commit(self.dispatch)
+
+    def dispatch(self):
+        """Queue the rebuild, unless one is already queued."""
+        if not cache.add(DOWNLOAD_BOX_UPDATE_PENDING_KEY, value=True, timeout=DOWNLOAD_BOX_UPDATE_PENDING_TIMEOUT):
+            return
+
+        from apps.downloads.tasks import update_download_boxes_task
+
+        try:
+            update_download_boxes_task.apply_async(countdown=settings.DOWNLOAD_BOX_UPDATE_DELAY)
+        except OperationalError:
+            self.flush()
+
+    def flush(self):
+        """Rebuild the boxes right away, e.g. after changing releases outside of a request.
+
+        A rebuild already queued still runs, and finds nothing new.
+        """
+        cache.delete(DOWNLOAD_BOX_UPDATE_PENDING_KEY)
+        update_download_boxes()
+
+
+download_box_updater = DownloadBoxUpdater()
+
+
+class ReleaseManifestUpdater:
+    """Rebuild the ``releases.json`` entries of changed releases once per batch of changes.
+
+    Once the transaction commits, a Celery task rebuilds the changed releases'
+    entries (see ``apps.downloads.manifest``). Each release is queued behind a
+    ``cache.add`` marker, cleared when the task starts, so the changes to a
+    release committed until then share one rebuild.
+    """
+
+    def mark_dirty(self, release_id):
+        """Schedule the release's entry to be rebuilt once the current transaction commits."""
+        transaction.on_commit(functools.partial(self.dispatch, [release_id]))
+
+    def dispatch(self, release_ids):
+        """Queue a rebuild of the ``release_ids`` entries not queued yet."""
+        release_ids = [
+            release_id
+            for release_id in sorted(set(release_ids))
+            if cache.add(
+                RELEASE_MANIFEST_PENDING_KEY.format(release_id=release_id),
+                value=True,
+                timeout=DOWNLOAD_BOX_UPDATE_PENDING_TIMEOUT,
+            )
+        ]
+        if not release_ids:
+            return
+
+        from apps.downloads.tasks import update_release_manifest_task
+
+        try:
+            update_release_manifest_task.delay(release_ids)
+        except OperationalError:
+            from apps.downloads.manifest import ReleaseManifestLockedError, update_release_manifest
+
+            cache.delete_many(
+                [RELEASE_MANIFEST_PENDING_KEY.format(release_id=release_id) for release_id in release_ids]
+            )
+            try:
+                update_release_manifest(release_ids)
+            except ReleaseManifestLockedError:
+                logger.exception("Could not update the release manifest entries of %s", release_ids)
+
+
+release_manifest_updater = ReleaseManifestUpdater()
+
+
 @receiver(post_save, sender=Release)
 def promote_latest_release(sender, instance, **kwargs):
     """Promote this release to be the latest if this flag is set."""
@@ -301,17 +482,23 @@ def promote_latest_release(sender, instance, **kwargs):
 
     if instance.is_latest:
         # Demote all previous instances
-        Release.objects.filter(version=instance.version).exclude(pk=instance.pk).update(is_latest=False)
+        demoted = Release.objects.filter(version=instance.version, is_latest=True).exclude(pk=instance.pk)
+        demoted_ids = list(demoted.values_list("pk", flat=True))
+        Release.objects.filter(pk__in=demoted_ids).update(is_latest=False)
+        # The update sends no signals; their releases.json entries list them as latest.
+        for release_id in demoted_ids:
+            release_manifest_updater.mark_dirty(release_id)
 
 
 @receiver(post_save, sender=Release)
 def purge_fastly_download_pages(sender, instance, **kwargs):
     """Purge Fastly caches so new Downloads show up more quickly.
 
-    Uses surrogate key purging to attempt to clear ALL pages under /downloads/
-    in one request, including dynamically added pages like /downloads/android/,
-    /downloads/ios/, etc. Independently purges a set of specific non-/downloads/
-    URLs via individual URL purges.
+    Purges the surrogate keys of the pages that render this release: its
+    detail page, the release listings, pages of the same feature series and,
+    for a latest release, every page showing the latest releases. Independently
+    purges a set of specific non-/downloads/ URLs via individual URL purges.
+    The download boxes purge themselves when they are regenerated.
     """
     # Don't purge on fixture loads
     if kwargs.get("raw", False):
@@ -319,22 +506,26 @@ def purge_fastly_download_pages(sender, instance, **kwargs):
 
     # Only purge on published instances
     if instance.is_published:
-        # Purge all /downloads/* pages via surrogate key (preferred method)
-        # This catches everything: /downloads/android/, /downloads/release/*, etc.
-        # Falls back to purge_url if FASTLY_SERVICE_ID is not configured.
-        if getattr(settings, "FASTLY_SERVICE_ID", None):
-            purge_surrogate_key("downloads")
-        else:
-            purge_url("/downloads/")
+        # Falls back to URL purges if FASTLY_SERVICE_ID is not configured.
+        keys = [instance, surrogate_list_key(Release), instance.series_surrogate_key]
+        if instance.is_latest:
+            keys.append(LATEST_RELEASES_SURROGATE_KEY)
+        purge_objects(*filter(None, keys), urls=["/downloads/"])
 
         # Also purge related pages outside /downloads/
-        purge_url("/ftp/python/")
+        urls = ["/ftp/python/"]
         if instance.get_version():
-            purge_url(f"/ftp/python/{instance.get_version()}/")
-        # See issue #584 for details - these are under /box/, not /downloads/
-        purge_url("/box/supernav-python-downloads/")
-        purge_url("/box/homepage-downloads/")
-        purge_url("/box/download-sources/")
+            urls.append(f"/ftp/python/{instance.get_version()}/")
+        queue_purge(urls=urls)
+
+
+@receiver(post_save, sender=Release)
+@receiver(post_delete, sender=Release)
+def update_release_manifest_on_release_change(sender, instance, **kwargs):
+    """Rebuild the release's ``releases.json`` entry, dropping it if unpublished or deleted."""
+    if kwargs.get("raw", False):
+        return
+    release_manifest_updater.mark_dirty(instance.pk)
 
 
 @receiver(post_save, sender=Release)
@@ -345,20 +536,25 @@ def update_download_supernav_and_boxes(sender, instance, **kwargs):
         return
 
     if instance.is_published:
-        update_supernav()
-        update_download_landing_sources_box()
-        update_homepage_download_box()
+        download_box_updater.mark_dirty()
+
+
+def release_files_changed(release, os_ids):
+    """Update download boxes, the manifest and the release's pages after its files for ``os_ids`` changed.
+
+    Does nothing unless the release is published.
+    """
+    if release.is_published:
+        download_box_updater.mark_dirty()
+        release_manifest_updater.mark_dirty(release.pk)
+        keys = [f"release-{release.pk}", *(f"os-{os_id}" for os_id in sorted(set(os_ids)) if os_id)]
+        purge_objects(*keys, urls=[release.get_absolute_url()])
 
 
 def _update_boxes_for_release_file(instance):
-    """Update supernav and download boxes if the file's release is published."""
-    if instance.release_id and instance.release.is_published:
-        update_supernav()
-        update_download_landing_sources_box()
-        update_homepage_download_box()
-        purge_url("/box/supernav-python-downloads/")
-        purge_url("/box/homepage-downloads/")
-        purge_url("/box/download-sources/")
+    """Update download boxes and purge the release's pages if the file's release is published."""
+    if instance.release_id:
+        release_files_changed(instance.release, [instance.os_id])
 
 
 @receiver(post_save, sender="downloads.ReleaseFile")
@@ -372,6 +568,8 @@ def update_boxes_on_release_file_save(sender, instance, **kwargs):
 @receiver(post_delete, sender="downloads.ReleaseFile")
 def update_boxes_on_release_file_delete(sender, instance, **kwargs):
     """Refresh supernav when a release file is deleted."""
+    if release_file_batch.get():
+        return
     _update_boxes_for_release_file(instance)
 
 
@@ -386,17 +584,26 @@ def condition_url_is_blank_or_python_dot_org(column: str):
     )
 
 
-def validate_release_file_urls(release_file):
-    """Validate current ReleaseFile URL writes without rejecting unchanged legacy rows."""
+def _stored_release_file_urls(release_file, previous):
+    """Return the stored URL fields of an existing release file, or None for a new one."""
+    if previous is not None:
+        return {field_name: getattr(previous, field_name) for field_name in RELEASE_FILE_URL_FIELDS}
+    if release_file.pk is None:
+        return None
+    return type(release_file).objects.filter(pk=release_file.pk).values(*RELEASE_FILE_URL_FIELDS).first()
+
+
+def validate_release_file_urls(release_file, previous=None):
+    """Validate current ReleaseFile URL writes without rejecting unchanged legacy rows.
+
+    ``previous`` is the stored version of an existing ``release_file``, when
+    the caller has already loaded it; otherwise it is queried.
+    """
     values = {}
     for field_name in RELEASE_FILE_URL_FIELDS:
         values[field_name] = getattr(release_file, field_name) or ""
 
-    previous_values = None
-    if release_file.pk is not None:
-        release_file_model = type(release_file)
-        previous_values_qs = release_file_model.objects.filter(pk=release_file.pk)
-        previous_values = previous_values_qs.values(*RELEASE_FILE_URL_FIELDS).first()
+    previous_values = _stored_release_file_urls(release_file, previous)
     errors = {}
 
     for field_name, value in values.items():
@@ -456,8 +663,7 @@ class ReleaseFile(ContentManageable, NameSlugModel):
         if self.download_button and self.release_id:
             qs = ReleaseFile.objects.filter(release=self.release, os=self.os, download_button=True).exclude(pk=self.id)
             if qs.count() > 0:
-                msg = 'Only one Release File per OS can have "Download button" enabled'
-                raise ValidationError(msg)
+                raise ValidationError(RELEASE_FILE_DOWNLOAD_BUTTON_ERROR)
         super().validate_unique(exclude=exclude)
 
     class Meta:
@@ -0,0 +1,78 @@
+"""Python release cycle data from the PEPs API, refreshed in the background.
+
+The last good payload is cached without expiry, together with the time it was
+fetched. Requests never wait on peps.python.org: they are served whatever is
+cached, and when it is older than ``RELEASE_CYCLE_MAX_AGE`` a single refresh is
+queued for a Celery worker. The Celery beat schedule also refreshes it
+periodically, so readers rarely see stale data at all.
+"""
+
+import logging
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from kombu.exceptions import OperationalError
+
+logger = logging.getLogger(__name__)
+
+RELEASE_CYCLE_CACHE_KEY = "python_release_cycle"
+RELEASE_CYCLE_REFRESH_LOCK_KEY = "python_release_cycle:refreshing"
+# Long enough for a fetch and its retries; a worker that dies mid-refresh
+# only holds the lock this long.
+RELEASE_CYCLE_REFRESH_LOCK_TIMEOUT = 5 * 60
+RELEASE_CYCLE_FETCH_TIMEOUT = 5
+
+
+def get_release_cycle_data() -> dict | None:
+    """Return the cached release cycle data, or None if it was never fetched.
+
+    Never fetches from the PEPs API itself; a refresh is queued instead when
+    the cached data is missing or stale.
+    """
+    entry = cache.get(RELEASE_CYCLE_CACHE_KEY)
+    if entry is None or time.time() - entry["fetched_at"] > settings.RELEASE_CYCLE_MAX_AGE:
+        schedule_release_cycle_refresh()
+    return entry["data"] if entry is not None else None
+
+
+def schedule_release_cycle_refresh():
+    """Queue a refresh of the release cycle data, unless one is already in progress.
+
+    The task is queued once the current transaction commits. If the broker is
+    unreachable the lock is kept, so requests do not keep retrying until it
+    times out.
+    """
+    if not cache.add(RELEASE_CYCLE_REFRESH_LOCK_KEY, value=True, timeout=RELEASE_CYCLE_REFRESH_LOCK_TIMEOUT):
+        return
+
+    def enqueue():
+        from apps.downloads.tasks import refresh_release_cycle_task
+
+        try:
+            refresh_release_cycle_task.delay()
+        except OperationalError:
+            logger.exception("Could not queue a release cycle refresh")
+
+    transaction.on_commit(enqueue)
+
+
+def refresh_release_cycle() -> bool:
+    """Fetch the release cycle data and cache it, returning whether it succeeded.
+
+    On failure the previously cached data is kept and keeps being served.
+    """
+    try:
+        response = requests.get(settings.RELEASE_CYCLE_URL, timeout=RELEASE_CYCLE_FETCH_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        # Stored before the lock is released, so no other refresh starts in between.
+        cache.set(RELEASE_CYCLE_CACHE_KEY, {"data": data, "fetched_at": time.time()}, timeout=None)
+    except (requests.RequestException, ValueError) as e:
+        logger.warning("Failed to fetch release cycle data: %s", e)
+        return False
+    finally:
+        cache.delete(RELEASE_CYCLE_REFRESH_LOCK_KEY)
+    return True
@@ -1,11 +1,15 @@
 """DRF serializers for the downloads API."""
 
 import copy
+from urllib.parse import urlparse
 
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import Resolver404, resolve
 from rest_framework import serializers
 
+from apps.downloads.bulk import prepare_release_files, save_release_files
 from apps.downloads.models import OS, Release, ReleaseFile
+from pydotorg.drf import SparseFieldsetMixin
 
 
 class OSSerializer(serializers.HyperlinkedModelSerializer):
@@ -18,7 +22,7 @@ class OSSerializer(serializers.HyperlinkedModelSerializer):
         fields = ("name", "slug", "resource_uri")
 
 
-class ReleaseSerializer(serializers.HyperlinkedModelSerializer):
+class ReleaseSerializer(SparseFieldsetMixin, serializers.HyperlinkedModelSerializer):
     """Serializer for Python release data."""
 
     class Meta:
@@ -40,7 +44,7 @@ class ReleaseSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
-class ReleaseFileSerializer(serializers.HyperlinkedModelSerializer):
+class ReleaseFileSerializer(SparseFieldsetMixin, serializers.HyperlinkedModelSerializer):
     """Serializer for release file data."""
 
     def validate(self, attrs):
@@ -84,3 +88,65 @@ class ReleaseFileSerializer(serializers.HyperlinkedModelSerializer):
             "sigstore_bundle_file",
             "sbom_spdx2_file",
         )
+
+
+class ReleaseFileBatchItemSerializer(serializers.ModelSerializer):
+    """One file of a batch upload.
+
+    Its OS, uniqueness and URL rules are checked for the whole batch by
+    :class:`ReleaseFileBatchSerializer`, so validating an item does not query.
+    """
+
+    os = serializers.CharField(help_text="OS slug or API URL.")
+
+    class Meta:
+        """Meta configuration for ReleaseFileBatchItemSerializer."""
+
+        model = ReleaseFile
+        fields = tuple(field for field in ReleaseFileSerializer.Meta.fields if field not in {"release", "resource_uri"})
+        extra_kwargs = {
+            "slug": {"required": False, "validators": []},
+            "url": {"validators": []},
+        }
+        validators = []
+
+
+class ReleaseFileBatchSerializer(serializers.Serializer):
+    """A release and the files to create or update for it, written in one transaction."""
+
+    release = serializers.HyperlinkedRelatedField(view_name="release-detail", queryset=Release.objects.all())
+    files = ReleaseFileBatchItemSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        """Resolve the files' OSes and validate the files together."""
+        attrs = super().validate(attrs)
+        oses = list(OS.objects.all())
+        by_pk = {str(os.pk): os for os in oses}
+        by_slug = {os.slug: os for os in oses}
+
+        items, os_errors = [], []
+        for item in attrs["files"]:
+            value = item["os"]
+            os = by_slug.get(value) or by_pk.get(self._os_pk_from_url(value))
+            os_errors.append({} if os else {"os": [f"Unknown OS {value!r}."]})
+            items.append({**item, "os": os})
+
+        files, errors = prepare_release_files(attrs["release"], items)
+        errors = [{**os_error, **error} for os_error, error in zip(os_errors, errors, strict=True)]
+        if any(errors):
+            raise serializers.ValidationError({"files": errors})
+        attrs["release_files"] = files
+        attrs["fields"] = {field for item in attrs["files"] for field in item}
+        return attrs
+
+    @staticmethod
+    def _os_pk_from_url(value):
+        """Return the primary key from an OS API URL such as ``/api/v2/downloads/os/1/``."""
+        try:
+            return str(resolve(urlparse(value).path).kwargs.get("pk"))
+        except Resolver404:
+            return None
+
+    def create(self, validated_data):
+        """Write the validated files."""
+        return save_release_files(validated_data["release"], validated_data["release_files"], validated_data["fields"])
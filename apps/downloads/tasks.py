@@ -0,0 +1,48 @@
+"""Celery tasks for the downloads app."""
+
+from celery import shared_task
+from django.core.cache import cache
+
+from apps.downloads.manifest import (
+    RELEASE_MANIFEST_BUILD_PENDING_KEY,
+    ReleaseManifestLockedError,
+    update_release_manifest,
+)
+from apps.downloads.models import (
+    DOWNLOAD_BOX_UPDATE_PENDING_KEY,
+    RELEASE_MANIFEST_PENDING_KEY,
+    update_download_boxes,
+)
+from apps.downloads.release_cycle import refresh_release_cycle
+
+
+@shared_task
+def update_download_boxes_task():
+    """Regenerate the download boxes after a batch of release changes."""
+    cache.delete(DOWNLOAD_BOX_UPDATE_PENDING_KEY)
+    update_download_boxes()
+
+
+@shared_task
+def refresh_release_cycle_task():
+    """Fetch the Python release cycle data from the PEPs API into the cache."""
+    refresh_release_cycle()
+
+
+@shared_task(
+    autoretry_for=(ReleaseManifestLockedError,),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_jitter=True,
+    max_retries=None,
+)
+def update_release_manifest_task(release_ids=None):
+    """Rebuild the releases.json entries of the given releases, or the whole manifest.
+
+    Retried until no other update holds the manifest lock.
+    """
+    if release_ids is not None:
+        cache.delete_many([RELEASE_MANIFEST_PENDING_KEY.format(release_id=release_id) for release_id in release_ids])
+    update_release_manifest(release_ids)
+    if release_ids is None:
+        cache.delete(RELEASE_MANIFEST_BUILD_PENDING_KEY)
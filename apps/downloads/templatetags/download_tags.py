@@ -1,21 +1,16 @@
 """Template tags and filters for download pages."""
 
-import logging
 import re
 
-import requests
 from django import template
-from django.core.cache import cache
 from django.utils.html import format_html, format_html_join, mark_safe
 
+from apps.downloads import listings
 from apps.downloads.models import Release
+from apps.downloads.release_cycle import get_release_cycle_data
 
 register = template.Library()
-logger = logging.getLogger(__name__)
 
-RELEASE_CYCLE_URL = "https://peps.python.org/api/release-cycle.json"
-RELEASE_CYCLE_CACHE_KEY = "python_release_cycle"
-RELEASE_CYCLE_CACHE_TIMEOUT = 3600  # 1 hour
 PYTHON_2_MAJOR_VERSION = 2
 
 
@@ -121,54 +116,7 @@ def wbr_wrap(value: str | None) -> str:
 @register.filter
 def sort_windows(files):
     """Sort Windows files into a preferred display order."""
-    if not files:
-        return files
-
-    # Put Windows files in preferred order
-    files = list(files)
-    windows_files = []
-    other_files = []
-    for preferred in (
-        "Windows installer (64-bit)",
-        "Windows installer (32-bit)",
-        "Windows installer (ARM64)",
-        "Windows help file",
-        "Windows embeddable package (64-bit)",
-        "Windows embeddable package (32-bit)",
-        "Windows embeddable package (ARM64)",
-    ):
-        for file in files:
-            if file.name == preferred:
-                windows_files.append(file)
-                files.remove(file)
-                break
-
-    # Then append any remaining Windows files
-    for file in files:
-        if file.name.startswith("Windows"):
-            windows_files.append(file)
-        else:
-            other_files.append(file)
-
-    return other_files + windows_files
-
-
-def get_release_cycle_data() -> dict | None:
-    """Fetch and cache the release cycle data from PEPs API."""
-    data = cache.get(RELEASE_CYCLE_CACHE_KEY)
-    if data is not None:
-        return data
-
-    try:
-        response = requests.get(RELEASE_CYCLE_URL, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        cache.set(RELEASE_CYCLE_CACHE_KEY, data, RELEASE_CYCLE_CACHE_TIMEOUT)
-    except (requests.RequestException, ValueError) as e:
-        logger.warning("Failed to fetch release cycle data: %s", e)
-        return None
-    else:
-        return data
+    return listings.sort_windows(files)
 
 
 @register.inclusion_tag("downloads/active-releases.html")
@@ -178,6 +126,7 @@ def render_active_releases():
     release_cycle = get_release_cycle_data()
 
     if release_cycle:
+        latest_by_series = Release.objects.latest_python3_by_series()
         # Sort releases in descending order (newest first)
         sorted_releases = sorted(
             release_cycle.keys(),
@@ -195,7 +144,7 @@ def render_active_releases():
             if status in ("planned", "feature", "prerelease"):
                 # Only show pre-release entries once at least one alpha/beta/rc
                 # has actually shipped (i.e. a published Release exists in the DB).
-                if not Release.objects.latest_python3(minor):
+                if minor not in latest_by_series:
                     continue
                 if first_release:
                     first_release = f"{first_release} (planned)"
@@ -208,7 +157,7 @@ def render_active_releases():
                 found_eol = True
 
                 # Get last release for EOL versions
-                last_release = Release.objects.latest_python3(minor)
+                last_release = latest_by_series.get(minor)
                 if last_release:
                     status = format_html(
                         'end-of-life, last release was <a href="{}">{}</a>',
@@ -0,0 +1,73 @@
+"""A local stand-in for the PEPs release cycle API, for tests and local development."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import override_settings
+
+
+class FakeReleaseCycleHandler(BaseHTTPRequestHandler):
+    """Serve the fixture payload as ``release-cycle.json``."""
+
+    def do_GET(self):
+        """Answer with the fixture payload, or a 503 while failures remain."""
+        fake = self.server.fake
+        with fake.lock:
+            fake.requests.append(self.path)
+            failing = fake.failures > 0
+            if failing:
+                fake.failures -= 1
+        status = 503 if failing else 200
+        payload = b"unavailable" if failing else json.dumps(fake.payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):  # noqa: A002 - matches the overridden signature
+        """Keep test output quiet."""
+
+
+class FakeReleaseCycle:
+    """Serve a release cycle JSON fixture from a local HTTP server.
+
+    Used as a context manager, it points ``RELEASE_CYCLE_URL`` at itself and
+    records every request path in :attr:`requests`. The first ``failures``
+    requests are answered with a 503::
+
+        with FakeReleaseCycle({"3.14": {"status": "bugfix"}}) as peps:
+            refresh_release_cycle()
+        assert len(peps.requests) == 1
+    """
+
+    def __init__(self, payload, failures=0):
+        """Prepare the server; it starts when the context is entered."""
+        self.payload = payload
+        self.failures = failures
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = None
+        self.settings = None
+
+    @property
+    def url(self):
+        """Return the URL of the served release cycle document."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/release-cycle.json"
+
+    def __enter__(self):
+        """Start the server and override the release cycle URL."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeReleaseCycleHandler)
+        self.server.fake = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.settings = override_settings(RELEASE_CYCLE_URL=self.url)
+        self.settings.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Restore the settings and stop the server."""
+        self.settings.disable()
+        self.server.shutdown()
+        self.server.server_close()
@@ -2,7 +2,7 @@ import datetime as dt
 
 from django.test import TestCase
 
-from apps.downloads.models import OS, Release, ReleaseFile
+from apps.downloads.models import OS, Release, ReleaseFile, download_box_updater
 from apps.pages.models import Page
 
 
@@ -17,6 +17,11 @@ class DownloadMixin:
 
 class BaseDownloadTests(DownloadMixin, TestCase):
     def setUp(self):
+        self.create_downloads()
+        # Start each test with the download boxes built.
+        download_box_updater.flush()
+
+    def create_downloads(self):
         self.release_275_page = Page.objects.create(
             title="Python 2.7.5 Release",
             path="download/releases/2.7.5",
@@ -0,0 +1,187 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.downloads.manifest import (
+    RELEASE_MANIFEST_LOCK_KEY,
+    RELEASE_MANIFEST_NAME,
+    RELEASE_MANIFEST_RETRY_AFTER,
+    RELEASE_MANIFEST_SURROGATE_KEY,
+    RELEASE_MANIFEST_VERSION,
+    ReleaseManifestLockedError,
+    build_release_manifest,
+    read_release_manifest,
+    update_release_manifest,
+)
+from apps.downloads.models import Release, ReleaseFile
+from apps.downloads.tasks import update_release_manifest_task
+from apps.downloads.tests.base import BaseDownloadTests
+
+
+@patch("apps.downloads.manifest.purge_objects")
+class ReleaseManifestTests(BaseDownloadTests):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def entries(self, manifest):
+        return {entry["slug"]: entry for entry in manifest["releases"]}
+
+    def test_build_lists_published_releases_and_files(self, mock_purge):
+        manifest = build_release_manifest()
+        self.assertEqual(manifest["version"], RELEASE_MANIFEST_VERSION)
+
+        entries = self.entries(manifest)
+        self.assertIn(self.release_275.slug, entries)
+        self.assertNotIn(self.draft_release.slug, entries)
+        self.assertIn(self.hidden_release.slug, entries)
+
+        release = entries[self.release_275.slug]
+        self.assertEqual(release["version"], "2.7.5")
+        self.assertEqual(release["url"], self.release_275.get_absolute_url())
+        files = {file["name"]: file for file in release["files"]}
+        self.assertEqual(len(files), 4)
+        self.assertEqual(files[self.release_275_linux.name]["os"], "linux")
+        self.assertEqual(files[self.release_275_linux.name]["url"], self.release_275_linux.url)
+        self.assertIn("sigstore_bundle_file", files[self.release_275_linux.name])
+        self.assertIn("sbom_spdx2_file", files[self.release_275_linux.name])
+
+        dates = [entry["release_date"] for entry in manifest["releases"]]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_update_writes_the_manifest_and_purges_it(self, mock_purge):
+        self.assertIsNone(read_release_manifest())
+
+        manifest = update_release_manifest()
+
+        self.assertEqual(read_release_manifest(), manifest)
+        mock_purge.assert_called_once_with(RELEASE_MANIFEST_SURROGATE_KEY, urls=["/downloads/releases.json"])
+
+    def test_write_replaces_the_manifest_in_place(self, mock_purge):
+        update_release_manifest()
+        manifest = update_release_manifest()
+
+        self.assertEqual(read_release_manifest(), manifest)
+        path = Path(default_storage.path(RELEASE_MANIFEST_NAME))
+        self.assertEqual(list(path.parent.iterdir()), [path])
+
+    def test_update_is_refused_while_another_is_in_progress(self, mock_purge):
+        cache.add(RELEASE_MANIFEST_LOCK_KEY, value=True)
+        with self.assertRaises(ReleaseManifestLockedError):
+            update_release_manifest([self.release_275.pk])
+        self.assertIsNone(read_release_manifest())
+
+        cache.delete(RELEASE_MANIFEST_LOCK_KEY)
+        update_release_manifest([self.release_275.pk])
+        self.assertFalse(cache.get(RELEASE_MANIFEST_LOCK_KEY))
+
+    def test_incremental_update_only_rebuilds_given_releases(self, mock_purge):
+        update_release_manifest()
+        ReleaseFile.objects.filter(pk=self.release_275_osx.pk).update(sha256_sum="abc123")
+        self.python_3.is_published = False
+        self.python_3.save()
+
+        manifest = update_release_manifest([self.release_275.pk, self.python_3.pk])
+
+        entries = self.entries(manifest)
+        self.assertNotIn(self.python_3.slug, entries)
+        self.assertIn(self.python_3_10_18.slug, entries)
+        files = {file["name"]: file for file in entries[self.release_275.slug]["files"]}
+        self.assertEqual(files[self.release_275_osx.name]["sha256_sum"], "abc123")
+        self.assertEqual(read_release_manifest(), manifest)
+
+    def test_outdated_manifest_is_rebuilt(self, mock_purge):
+        default_storage.save(RELEASE_MANIFEST_NAME, ContentFile(b'{"version": 0, "releases": []}'))
+        self.assertIsNone(read_release_manifest())
+
+        manifest = update_release_manifest([self.release_275.pk])
+
+        self.assertIn(self.python_3.slug, self.entries(manifest))
+
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    def test_changes_queue_one_update_per_release(self, mock_delay, mock_apply_async, mock_purge):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_3.name = "Python 3.10.19 (final)"
+            self.python_3.save()
+            ReleaseFile.objects.create(
+                os=self.linux,
+                release=self.python_3,
+                name="Python 3.10.19 source tarball",
+                url="https://www.python.org/ftp/python/3.10.19/Python-3.10.19.tgz",
+            )
+            self.release_275_osx.delete()
+
+        queued = sorted(release_id for call in mock_delay.call_args_list for release_id in call.args[0])
+        self.assertEqual(queued, sorted([self.python_3.pk, self.release_275.pk]))
+
+        # Until the task starts, further changes to the releases are covered by it.
+        mock_delay.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_3.save()
+        mock_delay.assert_not_called()
+        update_release_manifest_task([self.python_3.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_3.save()
+        mock_delay.assert_called_once_with([self.python_3.pk])
+
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    def test_promoting_a_release_updates_the_demoted_entry(self, mock_delay, mock_apply_async, mock_purge):
+        update_release_manifest()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            release = Release.objects.create(
+                version=Release.PYTHON3,
+                name="Python 3.11.0",
+                is_latest=True,
+                is_published=True,
+                release_date=self.python_3.release_date,
+            )
+        queued = sorted(release_id for call in mock_delay.call_args_list for release_id in call.args[0])
+        self.assertEqual(queued, sorted([release.pk, self.python_3.pk]))
+
+        entries = self.entries(update_release_manifest(queued))
+        self.assertTrue(entries[release.slug]["is_latest"])
+        self.assertFalse(entries[self.python_3.slug]["is_latest"])
+
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    def test_view_queues_one_build_of_a_missing_manifest(self, mock_delay, mock_purge):
+        url = reverse("download:release_manifest")
+        with self.captureOnCommitCallbacks(execute=True):
+            responses = [self.client.get(url), self.client.get(url)]
+
+        for response in responses:
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], str(RELEASE_MANIFEST_RETRY_AFTER))
+        mock_delay.assert_called_once_with()
+        self.assertIsNone(read_release_manifest())
+
+        update_release_manifest_task()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_view_serves_the_manifest_with_cdn_headers(self, mock_purge):
+        url = reverse("download:release_manifest")
+        self.assertEqual(url, "/downloads/releases.json")
+        update_release_manifest()
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn(RELEASE_MANIFEST_SURROGATE_KEY, response["Surrogate-Key"].split())
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Surrogate-Control"])
+        self.assertEqual(json.loads(response.content), read_release_manifest())
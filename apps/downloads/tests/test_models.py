@@ -2,8 +2,11 @@ import datetime as dt
 from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 from django.db.models import URLField
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from kombu.exceptions import OperationalError
 
 from apps.downloads.models import (
     OS,
@@ -11,10 +14,18 @@ from apps.downloads.models import (
     RELEASE_FILE_URL_FIELDS,
     Release,
     ReleaseFile,
+    download_box_updater,
+    invalidate_cached_releases,
+    release_file_batch,
+    release_manifest_updater,
 )
 from apps.downloads.tests.base import BaseDownloadTests
 
 
+def download_queries(queries):
+    return [q for q in queries.captured_queries if '"downloads_' in q["sql"]]
+
+
 def release_file_url_field_names():
     return tuple(
         field.name
@@ -137,6 +148,37 @@ class DownloadModelTests(BaseDownloadTests):
                 self.assertEqual(release.name, name)
                 self.assertEqual(release.get_version(), "")
 
+    def test_version_columns(self):
+        cases = {
+            "Python 3.14.0": (3, 14, 0, Release.FINAL, 0),
+            "Python 3.14.0rc2": (3, 14, 0, Release.CANDIDATE, 2),
+            "Python 3.15.0a1": (3, 15, 0, Release.ALPHA, 1),
+            "Python 2.7": (2, 7, None, Release.FINAL, 0),
+            "Python install manager 25.0": (None, None, None, None, None),
+        }
+        for name, expected in cases.items():
+            with self.subTest(name=name):
+                release = Release.objects.create(name=name)
+                release.refresh_from_db()
+                self.assertEqual(
+                    (release.major, release.minor, release.micro, release.release_level, release.serial), expected
+                )
+
+    def test_version_columns_follow_renames(self):
+        self.python_3_8_20.name = "Python 3.8.21"
+        self.python_3_8_20.save(update_fields=["name"])
+        self.python_3_8_20.refresh_from_db()
+        self.assertEqual(self.python_3_8_20.micro, 21)
+
+    def test_by_version(self):
+        rc = Release.objects.create(name="Python 3.10.20rc1", is_published=True)
+        final = Release.objects.create(name="Python 3.10.20", is_published=True)
+        unversioned = Release.objects.create(name="Python install manager", is_published=True)
+        releases = list(Release.objects.published().by_version())
+        self.assertEqual(releases[:3], [final, rc, self.python_3])
+        self.assertEqual(releases[-1], unversioned)
+        self.assertEqual(list(Release.objects.series(3, 8).by_version()), [self.python_3_8_20, self.python_3_8_19])
+
     def test_is_version_at_least(self):
         self.assertFalse(self.release_275.is_version_at_least_3_5)
         self.assertFalse(self.release_275.is_version_at_least_3_9)
@@ -252,61 +294,191 @@ class DownloadModelTests(BaseDownloadTests):
         # Android (no files) should not be present
         self.assertNotIn("android", content.lower())
 
-    @patch("apps.downloads.models.update_supernav")
-    @patch("apps.downloads.models.update_download_landing_sources_box")
-    @patch("apps.downloads.models.update_homepage_download_box")
-    def test_release_file_save_triggers_box_updates(self, mock_home, mock_sources, mock_supernav):
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
+    def test_release_file_save_triggers_box_updates(self, mock_apply_async, mock_manifest_delay):
         """Saving a ReleaseFile on a published release should update boxes."""
-        mock_supernav.reset_mock()
-        mock_sources.reset_mock()
-        mock_home.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            ReleaseFile.objects.create(
+                os=self.windows,
+                release=self.python_3,
+                name="Windows installer",
+                url="https://www.python.org/ftp/python/3.10.19/python-3.10.19.exe",
+                download_button=True,
+            )
 
-        ReleaseFile.objects.create(
-            os=self.windows,
-            release=self.python_3,
-            name="Windows installer",
-            url="https://www.python.org/ftp/python/3.10.19/python-3.10.19.exe",
-            download_button=True,
-        )
+        mock_apply_async.assert_called_once()
+
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
+    def test_release_file_save_skips_unpublished_release(self, mock_apply_async, mock_manifest_delay):
+        """Saving a ReleaseFile on a draft release should not update boxes."""
+        with self.captureOnCommitCallbacks(execute=True):
+            ReleaseFile.objects.create(
+                os=self.windows,
+                release=self.draft_release,
+                name="Windows installer draft",
+                url="https://www.python.org/ftp/python/9.7.2/python-9.7.2.exe",
+            )
 
-        mock_supernav.assert_called()
-        mock_sources.assert_called()
-        mock_home.assert_called()
+        mock_apply_async.assert_not_called()
 
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
+    def test_release_file_delete_triggers_box_updates(self, mock_apply_async, mock_manifest_delay):
+        """Deleting a ReleaseFile on a published release should update boxes."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.release_275_windows_32bit.delete()
+
+        mock_apply_async.assert_called_once()
+
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
     @patch("apps.downloads.models.update_supernav")
     @patch("apps.downloads.models.update_download_landing_sources_box")
     @patch("apps.downloads.models.update_homepage_download_box")
-    def test_release_file_save_skips_unpublished_release(self, mock_home, mock_sources, mock_supernav):
-        """Saving a ReleaseFile on a draft release should not update boxes."""
-        mock_supernav.reset_mock()
-        mock_sources.reset_mock()
-        mock_home.reset_mock()
-
-        ReleaseFile.objects.create(
-            os=self.windows,
-            release=self.draft_release,
-            name="Windows installer draft",
-            url="https://www.python.org/ftp/python/9.7.2/python-9.7.2.exe",
-        )
+    def test_release_file_batch_rebuilds_boxes_once(
+        self, mock_home, mock_sources, mock_supernav, mock_apply_async, mock_manifest_delay
+    ):
+        """Uploading several files for a release queues one rebuild, which regenerates each box once."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for os in (self.windows, self.osx, self.linux):
+                ReleaseFile.objects.create(
+                    os=os,
+                    release=self.python_3,
+                    name=f"{os.name} installer",
+                    url=f"https://www.python.org/ftp/python/3.10.19/python-3.10.19-{os.slug}.zip",
+                )
 
+        mock_apply_async.assert_called_once()
         mock_supernav.assert_not_called()
-        mock_sources.assert_not_called()
-        mock_home.assert_not_called()
 
+        download_box_updater.flush()
+        mock_supernav.assert_called_once()
+        mock_sources.assert_called_once()
+        mock_home.assert_called_once()
+
+    @patch("apps.downloads.models.forget_cached_releases")
+    def test_release_file_batch_only_skips_release_file_invalidation(self, mock_forget):
+        """Changes to other models during a release file batch still drop the cached releases."""
+        token = release_file_batch.set(True)
+        try:
+            invalidate_cached_releases(ReleaseFile)
+            mock_forget.assert_not_called()
+            invalidate_cached_releases(Release)
+        finally:
+            release_file_batch.reset(token)
+        mock_forget.assert_called_once()
+
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async", side_effect=OperationalError)
     @patch("apps.downloads.models.update_supernav")
-    @patch("apps.downloads.models.update_download_landing_sources_box")
-    @patch("apps.downloads.models.update_homepage_download_box")
-    def test_release_file_delete_triggers_box_updates(self, mock_home, mock_sources, mock_supernav):
-        """Deleting a ReleaseFile on a published release should update boxes."""
-        mock_supernav.reset_mock()
-        mock_sources.reset_mock()
-        mock_home.reset_mock()
+    def test_boxes_are_rebuilt_at_commit_without_a_broker(self, mock_supernav, mock_apply_async, mock_manifest_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_3.save()
+
+        mock_supernav.assert_called_once()
+        # The next change is not held back by the marker.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_3.save()
+        self.assertEqual(mock_supernav.call_count, 2)
+
+    @patch("apps.downloads.models.ReleaseManifestUpdater.dispatch")
+    def test_rolled_back_changes_are_not_dispatched(self, dispatch):
+        """Marks made in a rolled back savepoint or transaction do not leak into the next commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            release_manifest_updater.mark_dirty(self.python_3.pk)
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                release_manifest_updater.mark_dirty(self.release_275.pk)
+                raise IntegrityError
+        dispatch.assert_called_once_with([self.python_3.pk])
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            release_manifest_updater.mark_dirty(self.release_275.pk)
+            raise IntegrityError
+        dispatch.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            release_manifest_updater.mark_dirty(self.draft_release.pk)
+        dispatch.assert_called_once_with([self.draft_release.pk])
+
+    @override_settings(DOWNLOAD_BOX_UPDATE_DELAY=10)
+    @patch("apps.downloads.tasks.update_release_manifest_task.delay")
+    @patch("apps.downloads.tasks.update_download_boxes_task.apply_async")
+    def test_box_rebuild_is_queued_once_per_batch(self, mock_apply_async, mock_manifest_delay):
+        """Commits within the delay share one queued rebuild."""
+        for name in ("Windows installer", "macOS installer"):
+            with self.captureOnCommitCallbacks(execute=True):
+                ReleaseFile.objects.create(
+                    os=self.windows,
+                    release=self.python_3,
+                    name=name,
+                    url=f"https://www.python.org/ftp/python/3.10.19/{name.split()[0]}.exe",
+                )
+
+        mock_apply_async.assert_called_once_with(countdown=10)
+
+    def test_download_matrix(self):
+        self.release_275_windows_32bit.download_button = True
+        self.release_275_windows_32bit.save()
 
-        self.release_275_windows_32bit.delete()
+        with CaptureQueriesContext(connection) as queries:
+            matrix = Release.objects.download_matrix()
+            Release.objects.download_matrix()
+        self.assertEqual(len(download_queries(queries)), 3)
 
-        mock_supernav.assert_called()
-        mock_sources.assert_called()
-        mock_home.assert_called()
+        self.assertEqual(matrix["latest"]["python2"], self.release_275)
+        self.assertEqual(matrix["latest"]["python3"], self.python_3)
+        self.assertIsNone(matrix["latest"]["pymanager"])
+        self.assertEqual(matrix["files"], {"windows": {"python2": self.release_275_windows_32bit}})
+        self.assertEqual(matrix["oses"], list(OS.objects.all()))
+
+    def test_download_matrix_is_invalidated_on_file_save(self):
+        Release.objects.download_matrix()
+        file = ReleaseFile.objects.create(
+            os=self.linux,
+            release=self.python_3,
+            name="Python 3.10.19 source tarball",
+            url="https://www.python.org/ftp/python/3.10.19/Python-3.10.19.tgz",
+            download_button=True,
+        )
+        self.assertEqual(Release.objects.download_matrix()["files"]["linux"], {"python3": file})
+
+    def test_latest_python3_by_series(self):
+        with CaptureQueriesContext(connection) as queries:
+            latest = Release.objects.latest_python3_by_series()
+            Release.objects.latest_python3_by_series()
+        self.assertEqual(len(download_queries(queries)), 1)
+
+        minors = set(Release.objects.python3().filter(major=3, micro__isnull=False).values_list("minor", flat=True))
+        self.assertEqual(set(latest), minors)
+        for minor in minors:
+            self.assertEqual(latest[minor], Release.objects.latest_python3(minor))
+
+    def test_latest_python3_by_series_is_invalidated_on_release_save(self):
+        Release.objects.latest_python3_by_series()
+        release = Release.objects.create(name="Python 3.8.21", version=Release.PYTHON3, is_published=True)
+        self.assertEqual(Release.objects.latest_python3_by_series()[8], release)
+
+    @override_settings(FASTLY_SERVICE_ID="service")
+    @patch("fastly.utils.queue_purge")
+    def test_release_save_purges_its_surrogate_keys(self, mock_purge):
+        """Saving an older release purges its own pages, not every download page."""
+        self.python_3_8_20.save()
+
+        purged = {key for call in mock_purge.call_args_list for key in call.kwargs.get("keys", ())}
+        self.assertIn(f"release-{self.python_3_8_20.pk}", purged)
+        self.assertIn("release-list", purged)
+        self.assertIn("release-series-3.8", purged)
+        self.assertNotIn("release-latest", purged)
+        self.assertNotIn("downloads", purged)
+
+    @override_settings(FASTLY_SERVICE_ID="service")
+    @patch("fastly.utils.queue_purge")
+    def test_latest_release_save_purges_latest_release_pages(self, mock_purge):
+        self.python_3.save()
+
+        purged = {key for call in mock_purge.call_args_list for key in call.kwargs.get("keys", ())}
+        self.assertIn("release-latest", purged)
 
     def test_release_file_urls_not_python_dot_org(self):
         for field in ReleaseFile._meta.get_fields():  # noqa: SLF001
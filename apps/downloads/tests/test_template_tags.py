@@ -1,12 +1,20 @@
 from unittest import mock
 
-import requests
 from django.core.cache import cache
+from django.template import Context, Template
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from apps.downloads.models import Release
-from apps.downloads.templatetags.download_tags import get_eol_info, get_release_cycle_data, render_active_releases
+from apps.downloads.release_cycle import (
+    RELEASE_CYCLE_CACHE_KEY,
+    RELEASE_CYCLE_REFRESH_LOCK_KEY,
+    get_release_cycle_data,
+    refresh_release_cycle,
+)
+from apps.downloads.tasks import refresh_release_cycle_task
+from apps.downloads.templatetags.download_tags import get_eol_info, render_active_releases
+from apps.downloads.testing import FakeReleaseCycle
 from apps.downloads.tests.base import BaseDownloadTests
 
 MOCK_RELEASE_CYCLE = {
@@ -70,69 +78,120 @@ class GetEOLInfoTests(BaseDownloadTests):
 
 
 @override_settings(CACHES=TEST_CACHES)
-class GetReleaseCycleDataTests(TestCase):
-    def setUp(self):
-        cache.clear()
-
-    @mock.patch("apps.downloads.templatetags.download_tags.requests.get")
-    def test_successful_fetch(self, mock_get):
-        """Test successful API fetch."""
-        # Arrange
-        mock_response = mock.Mock()
-        mock_response.json.return_value = MOCK_RELEASE_CYCLE
-        mock_response.raise_for_status = mock.Mock()
-        mock_get.return_value = mock_response
-
-        # Act
-        result = get_release_cycle_data()
-
-        # Assert
-        self.assertEqual(result, MOCK_RELEASE_CYCLE)
-        mock_get.assert_called_once()
-
-    @mock.patch("apps.downloads.templatetags.download_tags.requests.get")
-    def test_caches_result(self, mock_get):
-        """Test that the result is cached."""
-        # Arrange
-        mock_response = mock.Mock()
-        mock_response.json.return_value = MOCK_RELEASE_CYCLE
-        mock_response.raise_for_status = mock.Mock()
-        mock_get.return_value = mock_response
+class FileColumnFilterTests(BaseDownloadTests):
+    def render(self, source, files):
+        return Template("{% load download_tags %}" + source).render(Context({"files": files}))
 
-        # Act
-        result1 = get_release_cycle_data()
-        result2 = get_release_cycle_data()
+    def test_file_column_filters_are_available_to_templates(self):
+        files = list(self.release_275.files.all())
+        self.assertEqual(self.render("{{ files|has_md5 }}", files), "False")
+        self.release_275_linux.md5_sum = "a" * 32
+        self.assertEqual(self.render("{{ files|has_md5 }}", [self.release_275_linux]), "True")
+        for name in ("has_gpg", "has_sigstore_materials", "has_sbom", "has_sha256"):
+            with self.subTest(name=name):
+                self.assertEqual(self.render(f"{{{{ files|{name} }}}}", files), "False")
 
-        # Assert
-        self.assertEqual(result1, result2)
-        mock_get.assert_called_once()
+    def test_sort_windows_filter_puts_windows_files_last(self):
+        files = [self.release_275_windows_32bit, self.release_275_linux]
+        rendered = self.render("{% for f in files|sort_windows %}{{ f.name }};{% endfor %}", files)
+        self.assertEqual(rendered, "Source tarball;Windows x86 MSI Installer (2.7.5);")
 
-    @mock.patch("apps.downloads.templatetags.download_tags.requests.get")
-    def test_request_exception_returns_none(self, mock_get):
-        """Test that request exceptions return None."""
-        # Arrange
-        mock_get.side_effect = requests.RequestException("Connection error")
 
-        # Act
-        result = get_release_cycle_data()
-
-        # Assert
-        self.assertIsNone(result)
+class GetReleaseCycleDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
 
-    @mock.patch("apps.downloads.templatetags.download_tags.requests.get")
-    def test_json_decode_error_returns_none(self, mock_get):
-        """Test that JSON decode errors return None."""
-        # Arrange
+    def test_successful_refresh(self):
+        """Test that a refresh fetches and caches the API data."""
+        with FakeReleaseCycle(MOCK_RELEASE_CYCLE) as peps:
+            self.assertTrue(refresh_release_cycle())
+
+        self.assertEqual(peps.requests, ["/api/release-cycle.json"])
+        with mock.patch("apps.downloads.release_cycle.schedule_release_cycle_refresh") as schedule:
+            self.assertEqual(get_release_cycle_data(), MOCK_RELEASE_CYCLE)
+        schedule.assert_not_called()
+
+    def test_cold_cache_schedules_refresh_without_fetching(self):
+        """Test that a cache miss returns None and queues a single refresh."""
+        with (
+            FakeReleaseCycle(MOCK_RELEASE_CYCLE) as peps,
+            mock.patch("apps.downloads.tasks.refresh_release_cycle_task.delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.assertIsNone(get_release_cycle_data())
+            self.assertIsNone(get_release_cycle_data())
+
+        self.assertEqual(peps.requests, [])
+        delay.assert_called_once_with()
+
+    def test_stale_data_is_served_while_refreshing(self):
+        """Test that stale data is returned and refreshed in the background."""
+        with FakeReleaseCycle({"3.14": {"status": "bugfix"}}):
+            refresh_release_cycle()
+
+        with (
+            override_settings(RELEASE_CYCLE_MAX_AGE=-1),
+            mock.patch("apps.downloads.tasks.refresh_release_cycle_task.delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.assertEqual(get_release_cycle_data(), {"3.14": {"status": "bugfix"}})
+            self.assertEqual(get_release_cycle_data(), {"3.14": {"status": "bugfix"}})
+        delay.assert_called_once_with()
+
+        with FakeReleaseCycle(MOCK_RELEASE_CYCLE):
+            refresh_release_cycle_task()
+        self.assertEqual(get_release_cycle_data(), MOCK_RELEASE_CYCLE)
+
+    def test_failed_refresh_keeps_last_good_data(self):
+        """Test that fetch failures keep serving the previous payload."""
+        with FakeReleaseCycle(MOCK_RELEASE_CYCLE):
+            refresh_release_cycle()
+
+        with FakeReleaseCycle({}, failures=1):
+            self.assertFalse(refresh_release_cycle())
+
+        self.assertEqual(get_release_cycle_data(), MOCK_RELEASE_CYCLE)
+
+    @mock.patch("apps.downloads.release_cycle.requests.get")
+    def test_json_decode_error_is_not_cached(self, mock_get):
+        """Test that invalid JSON is not cached."""
         mock_response = mock.Mock()
-        mock_response.raise_for_status = mock.Mock()
         mock_response.json.side_effect = ValueError("Invalid JSON")
         mock_get.return_value = mock_response
 
-        # Act
-        result = get_release_cycle_data()
-
-        # Assert
-        self.assertIsNone(result)
+        self.assertFalse(refresh_release_cycle())
+
+        with mock.patch("apps.downloads.release_cycle.schedule_release_cycle_refresh"):
+            self.assertIsNone(get_release_cycle_data())
+
+    def test_failed_refresh_releases_the_lock(self):
+        """Test that a new refresh can be queued after a failed one."""
+        with (
+            mock.patch("apps.downloads.tasks.refresh_release_cycle_task.delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            get_release_cycle_data()
+            with FakeReleaseCycle({}, failures=1):
+                refresh_release_cycle()
+            get_release_cycle_data()
+        self.assertEqual(delay.call_count, 2)
+
+    def test_data_is_stored_before_the_lock_is_released(self):
+        """Test that a refresh cannot start between fetching and storing the data."""
+        cache.set(RELEASE_CYCLE_REFRESH_LOCK_KEY, value=True)
+        locked_when_stored = []
+        cache_set = cache.set
+
+        def record_lock(key, *args, **kwargs):
+            if key == RELEASE_CYCLE_CACHE_KEY:
+                locked_when_stored.append(cache.get(RELEASE_CYCLE_REFRESH_LOCK_KEY))
+            return cache_set(key, *args, **kwargs)
+
+        with FakeReleaseCycle(MOCK_RELEASE_CYCLE), mock.patch.object(cache, "set", side_effect=record_lock):
+            self.assertTrue(refresh_release_cycle())
+
+        self.assertEqual(locked_when_stored, [True])
+        self.assertIsNone(cache.get(RELEASE_CYCLE_REFRESH_LOCK_KEY))
 
 
 @override_settings(CACHES=TEST_CACHES)
@@ -2,8 +2,12 @@ from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Max
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.http import http_date
 from rest_framework.test import APITestCase
 
 from apps.downloads.models import (
@@ -11,7 +15,9 @@ from apps.downloads.models import (
     RELEASE_FILE_HTTPS_ERROR,
     RELEASE_FILE_SIDECAR_SUFFIXES,
     Release,
+    ReleaseFile,
 )
+from apps.downloads.serializers import ReleaseFileSerializer
 from apps.downloads.tests.base import BaseDownloadTests, DownloadMixin
 from apps.pages.factories import PageFactory
 from apps.users.factories import UserFactory
@@ -50,6 +56,14 @@ class DownloadViewsTests(BaseDownloadTests):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 404)
 
+    def test_download_release_detail_surrogate_keys(self):
+        url = reverse("download:download_release_detail", kwargs={"release_slug": self.python_3_8_20.slug})
+        keys = self.client.get(url)["Surrogate-Key"].split()
+        self.assertIn(f"release-{self.python_3_8_20.pk}", keys)
+        self.assertIn("release-series-3.8", keys)
+        self.assertIn("release-latest", keys)
+        self.assertIn(f"release-{self.python_3.pk}", keys)
+
     def test_download_release_detail_not_superseded(self):
         """Test that latest releases and Python 2 do not show a superseded notice."""
         for release in [self.python_3, self.python_3_8_20, self.release_275]:
@@ -81,11 +95,58 @@ class DownloadViewsTests(BaseDownloadTests):
                 self.assertContains(response, "has been superseded by")
                 self.assertContains(response, latest_release.name)
 
+    def test_download_release_detail_files(self):
+        self.release_275_osx.download_button = True
+        self.release_275_osx.sha256_sum = "a" * 64
+        self.release_275_osx.save()
+        self.release_275_windows_64bit.download_button = True
+        self.release_275_windows_64bit.save()
+        url = reverse("download:download_release_detail", kwargs={"release_slug": self.release_275.slug})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.context["featured_files"], [self.release_275_osx, self.release_275_windows_64bit])
+        release_files = response.context["release_files"]
+        self.assertEqual(release_files[:2], [self.release_275_linux, self.release_275_osx])
+        self.assertCountEqual(release_files[2:], [self.release_275_windows_32bit, self.release_275_windows_64bit])
+        self.assertEqual(
+            response.context["file_columns"],
+            {"sigstore": False, "sbom": False, "gpg": False, "sha256": True, "md5": False},
+        )
+        self.assertContains(response, "<th>SHA-256 checksum</th>", html=True)
+
+    def test_download_release_detail_files_are_cached_until_a_file_changes(self):
+        url = reverse("download:download_release_detail", kwargs={"release_slug": self.release_275.slug})
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse([q for q in queries.captured_queries if 'FROM "downloads_releasefile" INNER JOIN' in q["sql"]])
+
+        self.release_275_linux.gpg_signature_file = "https://www.python.org/ftp/python/2.7.5/Python-2.7.5.tgz.asc"
+        self.release_275_linux.save()
+        response = self.client.get(url)
+        self.assertTrue(response.context["file_columns"]["gpg"])
+
     def test_download_os_list(self):
         url = reverse("download:download_os_list", kwargs={"slug": self.linux.slug})
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_download_os_list_sorts_windows_files(self):
+        installer = ReleaseFile.objects.create(
+            os=self.windows,
+            release=self.release_275,
+            name="Windows installer (64-bit)",
+            url="https://www.python.org/ftp/python/2.7.5/python-2.7.5-amd64.exe",
+        )
+        url = reverse("download:download_os_list", kwargs={"slug": self.windows.slug})
+        response = self.client.get(url)
+        release = next(release for release in response.context["releases"] if release == self.release_275)
+        self.assertEqual(
+            release.sorted_files, [installer, self.release_275_windows_64bit, self.release_275_windows_32bit]
+        )
+
     def test_download(self):
         url = reverse("download:download")
         response = self.client.get(url)
@@ -720,6 +781,16 @@ class DownloadApiV1ViewsTest(BaseDownloadApiViewsTest, BaseDownloadTests):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(self.get_json(response)), 0)
 
+    def test_v1_release_file_delete_by_release_refreshes_once(self):
+        url = self.create_url("release_file", filters={"release": self.release_275.pk})
+
+        with mock.patch("apps.downloads.models.download_box_updater.mark_dirty") as mark_dirty:
+            response = self.json_client("delete", url, HTTP_AUTHORIZATION=self.Authorization)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(self.release_275.files.exists())
+        mark_dirty.assert_called_once_with()
+
 
 class DownloadApiV2ViewsTest(BaseDownloadApiViewsTest, BaseDownloadTests, APITestCase):
     api_version = "v2"
@@ -856,6 +927,153 @@ class DownloadApiV2ViewsTest(BaseDownloadApiViewsTest, BaseDownloadTests, APITes
         )
         self.assertEqual(response.status_code, 405)
 
+    def test_delete_by_release_refreshes_once(self):
+        url = self.create_url("release_file/delete_by_release", filters={"release": self.release_275.pk})
+        with (
+            mock.patch("apps.downloads.models.download_box_updater.mark_dirty") as mark_dirty,
+            mock.patch("apps.downloads.models.purge_objects") as purge_objects,
+        ):
+            response = self.json_client("delete", url, HTTP_AUTHORIZATION=self.Authorization)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(self.release_275.files.exists())
+        mark_dirty.assert_called_once_with()
+        purge_objects.assert_called_once_with(
+            f"release-{self.release_275.pk}",
+            f"os-{self.windows.pk}",
+            f"os-{self.osx.pk}",
+            f"os-{self.linux.pk}",
+            urls=[self.release_275.get_absolute_url()],
+        )
+
+    def test_release_file_cursor_pagination(self):
+        url = self.create_url("release_file", filters={"page_size": 2})
+        seen = []
+        while url:
+            response = self.client.get(url, headers={"authorization": self.Authorization})
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(item["slug"] for item in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, list(ReleaseFile.objects.order_by("pk").values_list("slug", flat=True)))
+
+    def test_sparse_fieldsets(self):
+        response = self.client.get(self.create_url("release", filters={"fields": "name,slug"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data)
+        for release in response.data:
+            self.assertEqual(set(release), {"name", "slug"})
+
+        response = self.client.get(
+            self.create_url("release_file", self.release_275_linux.pk, filters={"fields": "sha256_sum,url"})
+        )
+        self.assertEqual(set(response.data), {"sha256_sum", "url"})
+
+    def test_unchanged_lists_are_not_modified(self):
+        url = self.create_url("release_file", filters={"release": self.release_275.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+
+        with mock.patch.object(ReleaseFileSerializer, "to_representation") as to_representation:
+            response = self.client.get(url, headers={"if-none-match": etag})
+            self.assertEqual(response.status_code, 304)
+        to_representation.assert_not_called()
+
+        self.release_275_linux.delete()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deletions_from_lists_are_modified_since(self):
+        url = self.create_url("release_file", filters={"release": self.release_275.pk})
+        since = http_date(ReleaseFile.objects.aggregate(Max("updated"))["updated__max"].timestamp() + 60)
+        self.release_275_linux.delete()
+        response = self.client.get(url, headers={"if-modified-since": since})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.release_275_linux.slug, [item["slug"] for item in response.data])
+
+    def test_unchanged_objects_are_not_modified(self):
+        url = self.create_url("release", self.release_275.pk)
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+
+        self.release_275.save()
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+    def bulk_release_file(self, number, **overrides):
+        return {
+            "name": f"Installer {number}",
+            "os": self.windows.slug,
+            "url": f"https://www.python.org/ftp/python/2.7.5/python-2.7.5-{number}.exe",
+            "sha256_sum": "a" * 64,
+            **overrides,
+        }
+
+    def test_bulk_release_files(self):
+        files = [self.bulk_release_file(number) for number in range(40)]
+        files.append(
+            {
+                "name": self.release_275_linux.name,
+                "slug": self.release_275_linux.slug,
+                "os": self.create_url("os", self.linux.pk),
+                "url": self.release_275_linux.url,
+                "download_button": True,
+            }
+        )
+        data = {"release": self.create_url("release", self.release_275.pk), "files": files}
+        url = self.create_url("release_file/bulk")
+
+        response = self.json_client("post", url, data, HTTP_AUTHORIZATION=self.Authorization_normal)
+        self.assertEqual(response.status_code, 403)
+
+        with (
+            mock.patch("apps.downloads.models.download_box_updater.mark_dirty") as mark_dirty,
+            mock.patch("apps.downloads.models.purge_objects") as purge_objects,
+            CaptureQueriesContext(connection) as queries,
+        ):
+            response = self.json_client("post", url, data, HTTP_AUTHORIZATION=self.Authorization)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 41)
+        self.assertLessEqual(len([q for q in queries.captured_queries if '"downloads_' in q["sql"]]), 6)
+        mark_dirty.assert_called_once_with()
+        purge_objects.assert_called_once()
+        self.assertEqual(self.release_275.files.filter(os=self.windows).count(), 42)
+        self.release_275_linux.refresh_from_db()
+        self.assertTrue(self.release_275_linux.download_button)
+        self.assertEqual(self.release_275_linux.description, "Gzipped source")
+
+        response = self.json_client("post", url, data, HTTP_AUTHORIZATION=self.Authorization)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.release_275.files.filter(os=self.windows).count(), 42)
+
+    def test_bulk_release_files_are_validated_together(self):
+        data = {
+            "release": self.create_url("release", self.release_275.pk),
+            "files": [
+                self.bulk_release_file(1, download_button=True),
+                self.bulk_release_file(2, download_button=True),
+                self.bulk_release_file(3, url="http://www.python.org/ftp/python/2.7.5/python-2.7.5-3.exe"),
+                self.bulk_release_file(4, os="beos"),
+                self.bulk_release_file(5, url=self.release_275_osx.url),
+            ],
+        }
+
+        response = self.json_client(
+            "post", self.create_url("release_file/bulk"), data, HTTP_AUTHORIZATION=self.Authorization
+        )
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.data["files"]
+        self.assertIn("download_button", errors[0])
+        self.assertIn("download_button", errors[1])
+        self.assertEqual([str(error) for error in errors[2]["url"]], [RELEASE_FILE_HTTPS_ERROR])
+        self.assertIn("os", errors[3])
+        self.assertIn("url", errors[4])
+        self.assertEqual(self.release_275.files.count(), 4)
+
 
 class ReleaseFeedTests(BaseDownloadTests):
     """Tests for the downloads/feed.rss endpoint.
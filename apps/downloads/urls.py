@@ -14,6 +14,7 @@ urlpatterns = [
     re_path(r"latest/prerelease/?$", views.DownloadLatestPrerelease.as_view(), name="download_latest_prerelease"),
     re_path(r"latest/pymanager/?$", views.DownloadLatestPyManager.as_view(), name="download_latest_pymanager"),
     re_path(r"latest/?$", views.DownloadLatestPython3.as_view(), name="download_latest_python3"),
+    path("releases.json", views.ReleaseManifestView.as_view(), name="release_manifest"),
     path("operating-systems/", views.DownloadFullOSList.as_view(), name="download_full_os_list"),
     path("release/<slug:release_slug>/", views.DownloadReleaseDetail.as_view(), name="download_release_detail"),
     path("<slug:slug>/", views.DownloadOSList.as_view(), name="download_os_list"),
@@ -1,18 +1,27 @@
 """Views for the Python downloads section."""
 
-import re
 from datetime import datetime
 from typing import Any
 
+from django.conf import settings
 from django.contrib.syndication.views import Feed
-from django.db.models import Case, IntegerField, Prefetch, When
-from django.http import Http404
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.feedgenerator import Rss201rev2Feed
-from django.views.generic import DetailView, ListView, RedirectView, TemplateView
+from django.views.generic import DetailView, ListView, RedirectView, TemplateView, View
 
-from apps.downloads.models import OS, Release, ReleaseFile
+from apps.downloads.listings import release_file_listing, sort_windows
+from apps.downloads.managers import PYTHON3_MAJOR
+from apps.downloads.manifest import (
+    RELEASE_MANIFEST_RETRY_AFTER,
+    RELEASE_MANIFEST_SURROGATE_KEY,
+    read_release_manifest,
+    schedule_release_manifest_build,
+)
+from apps.downloads.models import LATEST_RELEASES_SURROGATE_KEY, OS, Release, ReleaseFile
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
 
 
 class DownloadLatestPython2(RedirectView):
@@ -91,13 +100,20 @@ class DownloadBase:
     def get_context_data(self, **kwargs):
         """Add latest Python 2, 3, and pymanager releases to context."""
         context = super().get_context_data(**kwargs)
+        latest = Release.objects.download_matrix()["latest"]
         context.update(
             {
-                "latest_python2": Release.objects.latest_python2(),
-                "latest_python3": Release.objects.latest_python3(),
-                "latest_pymanager": Release.objects.latest_pymanager(),
+                "latest_python2": latest["python2"],
+                "latest_python3": latest["python3"],
+                "latest_pymanager": latest["pymanager"],
             }
         )
+        tag_surrogate_keys(
+            LATEST_RELEASES_SURROGATE_KEY,
+            context["latest_python2"],
+            context["latest_python3"],
+            context["latest_pymanager"],
+        )
         return context
 
 
@@ -109,45 +125,15 @@ class DownloadHome(DownloadBase, TemplateView):
     def get_context_data(self, **kwargs):
         """Add release listings and per-OS download files to context."""
         context = super().get_context_data(**kwargs)
-        try:
-            latest_python2 = Release.objects.latest_python2()
-        except Release.DoesNotExist:
-            latest_python2 = None
+        matrix = Release.objects.download_matrix()
+        python_files = [{"os": o, **matrix["files"].get(o.slug, {})} for o in matrix["oses"]]
 
-        try:
-            latest_python3 = Release.objects.latest_python3()
-        except Release.DoesNotExist:
-            latest_python3 = None
-
-        latest_pymanager = context.get("latest_pymanager")
-
-        python_files = []
-        for o in OS.objects.all():
-            data = {
-                "os": o,
-            }
-            if latest_python2 is not None:
-                data["python2"] = latest_python2.download_file_for_os(o.slug)
-            if latest_python3 is not None:
-                data["python3"] = latest_python3.download_file_for_os(o.slug)
-            if latest_pymanager is not None:
-                data["pymanager"] = latest_pymanager.download_file_for_os(o.slug)
-            python_files.append(data)
-
-        def version_key(release: Release) -> tuple[int, ...]:
-            try:
-                return tuple(int(x) for x in release.get_version().split("."))
-            except ValueError:
-                return (0,)
-
-        releases = list(Release.objects.downloads())
-        releases.sort(key=version_key, reverse=True)
+        releases = list(Release.objects.downloads().by_version())
+        tag_surrogate_keys(surrogate_list_key(Release), surrogate_list_key(OS))
 
         context.update(
             {
                 "releases": releases,
-                "latest_python2": latest_python2,
-                "latest_python3": latest_python3,
                 "python_files": python_files,
             }
         )
@@ -162,6 +148,19 @@ class DownloadFullOSList(DownloadBase, ListView):
     context_object_name = "os_list"
     model = OS
 
+    def get_context_data(self, **kwargs):
+        """Tag the page with the OS list surrogate key."""
+        tag_surrogate_keys(surrogate_list_key(OS))
+        return super().get_context_data(**kwargs)
+
+
+def with_sorted_files(releases):
+    """Return ``releases`` with their prefetched files in display order as ``sorted_files``."""
+    releases = list(releases)
+    for release in releases:
+        release.sorted_files = sort_windows(release.files.all())
+    return releases
+
 
 class DownloadOSList(DownloadBase, DetailView):
     """List releases filtered by a specific operating system."""
@@ -176,20 +175,25 @@ class DownloadOSList(DownloadBase, DetailView):
         release_files = ReleaseFile.objects.select_related(
             "os",
         ).filter(os=self.object)
+        tag_surrogate_keys(self.object, surrogate_list_key(Release))
         context.update(
             {
                 "os_slug": self.object.slug,
-                "releases": Release.objects.released()
-                .prefetch_related(
-                    Prefetch("files", queryset=release_files),
-                )
-                .order_by("-release_date"),
-                "pre_releases": Release.objects.published()
-                .pre_release()
-                .prefetch_related(
-                    Prefetch("files", queryset=release_files),
-                )
-                .order_by("-release_date"),
+                "releases": with_sorted_files(
+                    Release.objects.released()
+                    .prefetch_related(
+                        Prefetch("files", queryset=release_files),
+                    )
+                    .order_by("-release_date")
+                ),
+                "pre_releases": with_sorted_files(
+                    Release.objects.published()
+                    .pre_release()
+                    .prefetch_related(
+                        Prefetch("files", queryset=release_files),
+                    )
+                    .order_by("-release_date")
+                ),
             }
         )
         return context
@@ -210,48 +214,42 @@ class DownloadReleaseDetail(DownloadBase, DetailView):
             raise Http404 from e
 
     def get_context_data(self, **kwargs):
-        """Add release files, featured files, and superseded-by info to context."""
+        """Add release files, featured files, file columns, and superseded-by info to context."""
         context = super().get_context_data(**kwargs)
+        tag_surrogate_keys(self.object)
 
-        # Add featured files (files with download_button=True)
-        # Order: macOS first, Windows second, Source last
-        context["featured_files"] = (
-            self.object.files.filter(download_button=True)
-            .annotate(
-                os_order=Case(
-                    When(os__slug="macos", then=1),
-                    When(os__slug="windows", then=2),
-                    When(os__slug="source", then=3),
-                    default=4,
-                    output_field=IntegerField(),
-                )
-            )
-            .order_by("os_order")
-        )
-
-        # Manually add release files for better ordering
-        context["release_files"] = []
-
-        # Add source files
-        context["release_files"].extend(list(self.object.files.filter(os__slug="source").order_by("name")))
-
-        # Add all other OSes
-        context["release_files"].extend(list(self.object.files.exclude(os__slug="source").order_by("os__slug", "name")))
+        context.update(release_file_listing(self.object))
 
         # Find the latest release in the feature series (such as 3.14.x)
         # to show a "superseded by" notice on older releases
-        version = self.object.get_version()
-        if version and self.object.version == Release.PYTHON3:
-            match = re.match(r"^3\.(\d+)", version)
-            if match:
-                minor_version = int(match.group(1))
-                latest_in_series = Release.objects.latest_python3(minor_version)
-                if latest_in_series and latest_in_series.pk != self.object.pk:
-                    context["latest_in_series"] = latest_in_series
+        if self.object.major == PYTHON3_MAJOR and self.object.version == Release.PYTHON3:
+            tag_surrogate_keys(self.object.series_surrogate_key)
+            latest_in_series = Release.objects.latest_python3_by_series().get(self.object.minor)
+            if latest_in_series and latest_in_series.pk != self.object.pk:
+                context["latest_in_series"] = latest_in_series
 
         return context
 
 
+class ReleaseManifestView(View):
+    """Serve ``releases.json``, the manifest of every published release and its files."""
+
+    def get(self, request, *args, **kwargs):
+        """Return the stored manifest, or 503 while a build of a missing one is queued."""
+        manifest = read_release_manifest()
+        if manifest is None:
+            schedule_release_manifest_build()
+            response = JsonResponse({"detail": "The release manifest is being built."}, status=503)
+            response["Retry-After"] = RELEASE_MANIFEST_RETRY_AFTER
+            response["Cache-Control"] = "no-store"
+            return response
+        tag_surrogate_keys(RELEASE_MANIFEST_SURROGATE_KEY)
+        response = JsonResponse(manifest)
+        response["Cache-Control"] = f"public, max-age={settings.RELEASE_MANIFEST_BROWSER_TTL}"
+        response["Surrogate-Control"] = f"max-age={settings.RELEASE_MANIFEST_CDN_TTL}"
+        return response
+
+
 class ReleaseFeed(Feed):
     """Generate an RSS feed of the latest Python releases.
 
@@ -271,6 +269,7 @@ class ReleaseFeed(Feed):
 
     def items(self) -> list[dict[str, Any]]:
         """Return the latest Python releases."""
+        tag_surrogate_keys(surrogate_list_key(Release))
         return Release.objects.filter(is_published=True).order_by("-release_date")[:10]
 
     def item_title(self, item: Release) -> str:
@@ -0,0 +1,83 @@
+"""Dispatch the reminder emails of event alarms.
+
+Each alarm carries when its next reminder is due (see ``schedule_alarms``),
+so a dispatcher tick is one range scan of the ``due_at`` index. Due alarms
+are claimed in batches with ``SELECT ... FOR UPDATE SKIP LOCKED`` and
+recorded as sent and rescheduled past the occurrence they remind of in the
+same transaction; a tick overlapping another skips the alarms it is
+claiming. The emails are only sent once that transaction commits, so no
+reminder goes out twice: if sending fails, the batch's reminders are lost
+rather than sent again by the next tick.
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from apps.events.models import Alarm, schedule_alarms
+
+logger = logging.getLogger(__name__)
+
+# Alarms claimed, and reminders sent, per transaction.
+ALARM_BATCH_SIZE = 100
+
+
+def alarm_message(alarm, site, connection):
+    """Return the reminder email of an alarm, sent over ``connection``."""
+    context = {"alarm": alarm, "event": alarm.event, "start": alarm.occurrence_start, "site": site}
+    return EmailMessage(
+        subject=render_to_string("events/email/alarm_subject.txt", context).strip(),
+        body=render_to_string("events/email/alarm.txt", context),
+        from_email=settings.EVENT_ALARM_FROM_EMAIL,
+        to=[alarm.recipient],
+        connection=connection,
+    )
+
+
+def dispatch_alarms(now=None, batch_size=ALARM_BATCH_SIZE):
+    """Send the reminders due at ``now`` over one SMTP connection, returning how many were sent.
+
+    Alarms whose occurrence already started, or whose creator has no email
+    address, are skipped. Each batch of alarms is claimed, recorded as sent
+    and rescheduled for the next occurrence in one transaction, and its
+    reminders sent once it has committed.
+    """
+    now = timezone.now() if now is None else now
+    site = Site.objects.get_current()
+    sent = 0
+    with get_connection() as connection:
+        while alarms := claim_alarms(now, batch_size):
+            messages = [
+                alarm_message(alarm, site, connection)
+                for alarm in alarms
+                if alarm.occurrence_start > now and alarm.creator is not None and alarm.creator.email
+            ]
+            sent += connection.send_messages(messages) or 0
+    logger.info("Sent %d event reminders", sent)
+    return sent
+
+
+def claim_alarms(now, batch_size):
+    """Claim up to ``batch_size`` alarms due at ``now`` and commit them as sent, returning them as they were due.
+
+    Alarms whose occurrence is still to start are recorded as sent for it;
+    all are rescheduled for their next occurrence.
+    """
+    with transaction.atomic():
+        alarms = list(
+            Alarm.objects.filter(due_at__lte=now)
+            .select_related("event__calendar", "creator")
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("due_at", "pk")[:batch_size]
+        )
+        upcoming = [alarm.pk for alarm in alarms if alarm.occurrence_start > now]
+        # Undeliverable reminders count as sent, or they would stay due.
+        Alarm.objects.filter(pk__in=upcoming).update(sent_for=F("occurrence_start"))
+        schedule_alarms(Alarm.objects.filter(pk__in=[alarm.pk for alarm in alarms]), now=now)
+    return alarms
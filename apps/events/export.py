@@ -0,0 +1,159 @@
+"""iCalendar (.ics) feeds of a calendar's events, or of those in one of its categories or locations.
+
+Feeds are generated from the events' occurring and recurring rules and cached
+as bytes. Cache keys include a version of the calendar that is replaced
+whenever one of its events, rules, categories or locations changes, which
+invalidates all of the calendar's feeds at once; the views serve them with an
+ETag and tag them with the calendar's feed surrogate key, purged at the same
+time.
+"""
+
+import datetime
+import hashlib
+import html
+import time
+
+from dateutil.rrule import FREQNAMES
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
+from icalendar import Calendar as ICalendar
+from icalendar import Event as IEvent
+
+from apps.events.models import Calendar
+from fastly.utils import purge_objects
+
+ICS_FEED_CACHE_KEY = "events:ics:{calendar_id}:{version}:{scope}"
+ICS_FEED_VERSION_KEY = "events:ics-version:{calendar_id}"
+ICS_PRODID = "-//Python Software Foundation//python.org events//EN"
+
+
+def ics_surrogate_key(calendar_id):
+    """Return the surrogate key of all the iCalendar feeds of a calendar."""
+    return f"calendar-{calendar_id}-ics"
+
+
+def ics_feed_version(calendar_id):
+    """Return the current version of a calendar's feeds."""
+    return cache.get_or_set(ICS_FEED_VERSION_KEY.format(calendar_id=calendar_id), time.time_ns, timeout=None)
+
+
+def invalidate_ics_feeds(calendar_ids):
+    """Invalidate the cached feeds of the calendars with ``calendar_ids`` and purge them from the CDN.
+
+    Both happen once the current transaction commits; a feed requested in
+    between would otherwise be cached under the new version from the old
+    events.
+    """
+    calendar_ids = {calendar_id for calendar_id in calendar_ids if calendar_id is not None}
+    if not calendar_ids:
+        return
+
+    def bump_versions():
+        version = time.time_ns()
+        cache.set_many(
+            {ICS_FEED_VERSION_KEY.format(calendar_id=calendar_id): version for calendar_id in calendar_ids},
+            timeout=None,
+        )
+
+    transaction.on_commit(bump_versions)
+    slugs = Calendar.objects.filter(pk__in=calendar_ids).values_list("slug", flat=True)
+    purge_objects(
+        *(ics_surrogate_key(calendar_id) for calendar_id in calendar_ids),
+        urls=[reverse("events:calendar_ics", kwargs={"calendar_slug": slug}) for slug in slugs],
+    )
+
+
+def feed_events(events):
+    """Return the events to include in a feed, with everything needed to render them.
+
+    Events whose last occurrence ended more than ``EVENT_ICS_PAST_DAYS`` ago
+    are left out.
+    """
+    since = timezone.now() - datetime.timedelta(days=settings.EVENT_ICS_PAST_DAYS)
+    return (
+        events.exclude(next_start__isnull=True, last_end__lt=since)
+        .select_related("calendar", "venue", "occurring_rule")
+        .prefetch_related("recurring_rules", "categories")
+        .order_by("pk")
+    )
+
+
+def _add_times(component, dt_start, dt_end, all_day):
+    """Set DTSTART and DTEND; all-day events end on the day after their last day, exclusive."""
+    if all_day:
+        component.add("dtstart", dt_start.date())
+        component.add("dtend", dt_end.date() + datetime.timedelta(days=1))
+    else:
+        component.add("dtstart", dt_start)
+        component.add("dtend", dt_end)
+
+
+def event_components(event, base_url):
+    """Return the VEVENTs of an event, one per occurring or recurring rule."""
+    components = []
+    occurring_rule = getattr(event, "occurring_rule", None)
+    if occurring_rule is not None:
+        component = _event_component(event, base_url, event.uid or f"event-{event.pk}@python.org")
+        _add_times(component, occurring_rule.dt_start, occurring_rule.dt_end, occurring_rule.all_day)
+        components.append(component)
+    for rule in event.recurring_rules.all():
+        component = _event_component(event, base_url, f"event-{event.pk}-rule-{rule.pk}@python.org")
+        _add_times(component, rule.begin, rule.begin + rule.duration_internal, rule.all_day)
+        # UNTIL must have the value type of DTSTART (RFC 5545, 3.3.10).
+        until = rule.finish.date() if rule.all_day else rule.finish
+        component.add("rrule", {"FREQ": FREQNAMES[rule.frequency], "INTERVAL": rule.interval, "UNTIL": until})
+        components.append(component)
+    return components
+
+
+def _event_component(event, base_url, uid):
+    """Return a VEVENT with the event's details, without its times."""
+    component = IEvent()
+    component.add("uid", uid)
+    component.add("dtstamp", event.updated)
+    component.add("last-modified", event.updated)
+    component.add("summary", event.title)
+    description = html.unescape(strip_tags(event.description.rendered)).strip()
+    if description:
+        component.add("description", description)
+    if event.venue is not None:
+        component.add("location", ", ".join(filter(None, [event.venue.name, event.venue.address])))
+    categories = [category.name for category in event.categories.all()]
+    if categories:
+        component.add("categories", categories)
+    component.add("url", f"{base_url}{event.get_absolute_url()}")
+    return component
+
+
+def build_ics_feed(name, events, base_url):
+    """Return the iCalendar document named ``name`` of ``events``, as bytes."""
+    feed = ICalendar()
+    feed.add("prodid", ICS_PRODID)
+    feed.add("version", "2.0")
+    feed.add("calscale", "GREGORIAN")
+    feed.add("x-wr-calname", name)
+    for event in feed_events(events):
+        for component in event_components(event, base_url):
+            feed.add_component(component)
+    return feed.to_ical()
+
+
+def get_ics_feed(calendar, scope, name, events, base_url):
+    """Return the ETag and content of a feed of ``calendar``, building and caching it if needed.
+
+    ``scope`` identifies the feed among those of the calendar, e.g.
+    ``category-3``.
+    """
+    key = ICS_FEED_CACHE_KEY.format(
+        calendar_id=calendar.pk, version=ics_feed_version(calendar.pk), scope=f"{scope}:{base_url}"
+    )
+    feed = cache.get(key)
+    if feed is None:
+        content = build_ics_feed(name, events, base_url)
+        feed = (hashlib.sha256(content).hexdigest(), content)
+        cache.set(key, feed, settings.EVENT_ICS_CACHE_TIMEOUT)
+    return feed
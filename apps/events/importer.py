@@ -1,17 +1,81 @@
 """Import events from iCal feeds into the database."""
 
+import hashlib
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
+from http import HTTPStatus
 
 import requests
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
 from icalendar import Calendar as ICalendar
+from requests.adapters import HTTPAdapter
 
-from apps.events.models import Event, EventLocation, OccurringRule
+from apps.events.export import invalidate_ics_feeds
+from apps.events.models import Calendar, Event, EventLocation, OccurringRule, update_event_occurrences
 from apps.events.utils import extract_date_or_datetime
 from pydotorg.markup import sanitize
 
 logger = logging.getLogger(__name__)
 
+FETCH_TIMEOUT = 30
+# Feeds fetched at once by ``import_calendars``, and connections kept per host.
+ICS_FETCH_WORKERS = 8
+# Event fields written by an import besides ``updated``.
+ICS_EVENT_FIELDS = (
+    "calendar",
+    "title",
+    "venue",
+    "description",
+    "description_markup_type",
+    "_description_rendered",
+    "ics_hash",
+)
+
+_session = None
+
+
+def get_session():
+    """Return the pooled HTTP session shared by all feed fetches in this process."""
+    global _session  # noqa: PLW0603 - lazily created process-wide session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=ICS_FETCH_WORKERS, pool_maxsize=ICS_FETCH_WORKERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+
+def ics_hash(values):
+    """Return a digest of the values imported from a VEVENT, to detect changed events."""
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ICSFetch:
+    """The response to one fetch of an iCal feed."""
+
+    def __init__(self, url, response, duration):
+        """Record the response to fetching ``url`` and how long it took."""
+        self.url = url
+        self.status = response.status_code
+        self.not_modified = response.status_code == HTTPStatus.NOT_MODIFIED
+        self.content = None if self.not_modified else response.content
+        self.etag = response.headers.get("ETag", "")
+        self.last_modified = response.headers.get("Last-Modified", "")
+        self.duration = duration
+        # What the import changed, as returned by ``import_events_from_text``.
+        self.counts = None
+
+    @property
+    def size(self):
+        """Return the number of bytes downloaded."""
+        return len(self.content) if self.content is not None else 0
+
 
 class ICSImporter:
     """Import events from an iCal (.ics) feed into the database."""
@@ -20,8 +84,8 @@ class ICSImporter:
         """Initialize with the Calendar instance to import into."""
         self.calendar = calendar
 
-    def import_occurrence(self, event, event_data):
-        """Create or update an OccurringRule for the given event data."""
+    def parse_event(self, event_data):
+        """Return the values imported from iCal VEVENT data, keyed by name."""
         # Django will already convert to datetime by setting the time to 0:00,
         # but won't add any timezone information. We will convert them to
         # aware datetime objects manually.
@@ -34,43 +98,60 @@ class ICSImporter:
         # Let's mark those occurrences as 'all-day'.
         all_day = dt_end - dt_start >= timedelta(days=1)
 
-        defaults = {
+        return {
+            "uid": str(event_data["UID"]),
+            "title": str(event_data["SUMMARY"]),
+            "description": sanitize(event_data.get("DESCRIPTION", "")),
+            "location": str(event_data["LOCATION"]),
             "dt_start": dt_start,
             "dt_end": dt_end - timedelta(days=1) if all_day else dt_end,
             "all_day": all_day,
         }
 
-        OccurringRule.objects.update_or_create(event=event, defaults=defaults)
-
-    def import_event(self, event_data):
-        """Create or update an Event from iCal VEVENT data."""
-        uid = event_data["UID"]
-        title = event_data["SUMMARY"]
-        description = event_data.get("DESCRIPTION", "")
-        description = sanitize(description)
-        location, _ = EventLocation.objects.get_or_create(calendar=self.calendar, name=event_data["LOCATION"])
-        defaults = {
-            "title": title,
-            "venue": location,
-            "calendar": self.calendar,
-        }
-        event, _ = Event.objects.update_or_create(uid=uid, defaults=defaults)
-        event.description.raw = description
-        event.description.markup_type = "html"
-        event.save()
-        self.import_occurrence(event, event_data)
-
-    def fetch(self, url):
-        """Fetch iCal data from the given URL."""
-        response = requests.get(url, timeout=30)
-        return response.content
+    def fetch(self, url=None):
+        """Fetch the iCal feed at ``url``, or the calendar's own feed.
 
-    def import_events(self, url=None):
-        """Fetch and import all events from the calendar URL."""
+        The calendar's own feed is requested conditionally on the validators
+        of its last import. Returns an ``ICSFetch``. Does not touch the
+        database, so feeds can be fetched from worker threads.
+        """
+        headers = {}
         if url is None:
             url = self.calendar.url
-        ical = self.fetch(url)
-        return self.import_events_from_text(ical)
+            if self.calendar.etag:
+                headers["If-None-Match"] = self.calendar.etag
+            if self.calendar.last_modified:
+                headers["If-Modified-Since"] = self.calendar.last_modified
+
+        started = time.monotonic()
+        response = get_session().get(url, headers=headers, timeout=FETCH_TIMEOUT)
+        if response.status_code != HTTPStatus.NOT_MODIFIED:
+            response.raise_for_status()
+        return ICSFetch(url, response, timedelta(seconds=time.monotonic() - started))
+
+    def import_fetched(self, fetched):
+        """Import the events of a fetched feed, unless it was not modified, and record the fetch.
+
+        The validators are only stored for the calendar's own feed, once its
+        events are imported, so a failed import is retried in full.
+        """
+        if not fetched.not_modified:
+            fetched.counts = self.import_events_from_text(fetched.content)
+        state = {
+            "last_fetched": timezone.now(),
+            "last_fetch_duration": fetched.duration,
+            "last_fetch_bytes": fetched.size,
+        }
+        if fetched.url == self.calendar.url and not fetched.not_modified:
+            state.update(etag=fetched.etag[:255], last_modified=fetched.last_modified[:64])
+        Calendar.objects.filter(pk=self.calendar.pk).update(**state)
+        for field, value in state.items():
+            setattr(self.calendar, field, value)
+        return fetched
+
+    def import_events(self, url=None):
+        """Fetch and import all events from the calendar URL, unless they have not changed."""
+        return self.import_fetched(self.fetch(url))
 
     def get_events(self, ical):
         """Parse iCal data and return VEVENT components."""
@@ -78,10 +159,137 @@ class ICSImporter:
         return ical.walk("VEVENT")
 
     def import_events_from_text(self, ical):
-        """Import all events from raw iCal text data."""
-        events = self.get_events(ical)
-        for event in events:
+        """Import all events from raw iCal text data, returning counts of what changed.
+
+        Events whose imported values are unchanged since the last import are
+        skipped; the others are written in bulk. Events of the calendar that
+        are no longer in the feed are deleted; those still in it but failing
+        to parse are kept as they are.
+        """
+        counts = dict.fromkeys(("created", "updated", "unchanged", "deleted", "failed"), 0)
+        parsed, in_feed = {}, set()
+        for event_data in self.get_events(ical):
+            if "UID" in event_data:
+                in_feed.add(str(event_data["UID"]))
             try:
-                self.import_event(event)
+                values = self.parse_event(event_data)
             except (KeyError, ValueError, TypeError):
-                logger.exception(event)
+                logger.exception(event_data)
+                counts["failed"] += 1
+                continue
+            parsed[values["uid"]] = values
+
+        with transaction.atomic():
+            existing = {
+                event.uid: event
+                for event in Event.objects.filter(
+                    Q(calendar=self.calendar, uid__isnull=False) | Q(uid__in=parsed)
+                ).select_related("occurring_rule")
+            }
+            changed = []
+            for uid, values in parsed.items():
+                event = existing.get(uid)
+                digest = ics_hash(values)
+                if event is not None and event.calendar_id == self.calendar.pk and event.ics_hash == digest:
+                    counts["unchanged"] += 1
+                else:
+                    changed.append((event, values, digest))
+            # Events moved here from another calendar leave that one's feeds stale too.
+            moved_from = {event.calendar_id for event, _, _ in changed if event is not None}
+            if changed:
+                self.save_events(changed, counts)
+
+            missing = [event.pk for uid, event in existing.items() if uid not in in_feed]
+            # An empty or unreadable feed must not wipe out the calendar.
+            if missing and parsed:
+                Event.objects.filter(pk__in=missing, calendar=self.calendar).delete()
+                counts["deleted"] = len(missing)
+            if changed or counts["deleted"]:
+                invalidate_ics_feeds([self.calendar.pk, *moved_from])
+        return counts
+
+    def save_events(self, changed, counts):
+        """Write the changed events and their occurrence rules in a few bulk queries.
+
+        ``changed`` holds ``(event, values, digest)`` tuples, ``event`` being
+        None for new events.
+        """
+        venues = self.get_venues({values["location"] for _, values, _ in changed})
+        description = Event._meta.get_field("description")  # noqa: SLF001 - Django _meta API access
+        now = timezone.now()
+        creates, updates, written = [], [], []
+        for existing, values, digest in changed:
+            event = existing or Event(uid=values["uid"], created=now)
+            (updates if existing else creates).append(event)
+            written.append((event, values, existing is not None))
+            event.calendar = self.calendar
+            event.title = values["title"]
+            event.venue = venues[values["location"]]
+            event.description.raw = values["description"]
+            event.description.markup_type = "html"
+            # Neither bulk_create nor bulk_update renders markup.
+            description.pre_save(event, add=existing is None)
+            event.ics_hash = digest
+            event.updated = now
+
+        Event.objects.bulk_create(creates)
+        Event.objects.bulk_update(updates, fields=[*ICS_EVENT_FIELDS, "updated"])
+        counts["created"] += len(creates)
+        counts["updated"] += len(updates)
+
+        new_rules, rules = [], []
+        for event, values, exists in written:
+            # The rules of existing events were loaded with them.
+            rule = getattr(event, "occurring_rule", None) if exists else None
+            if rule is None:
+                rule = OccurringRule(event=event)
+                new_rules.append(rule)
+            else:
+                rules.append(rule)
+            rule.dt_start, rule.dt_end, rule.all_day = values["dt_start"], values["dt_end"], values["all_day"]
+        OccurringRule.objects.bulk_create(new_rules)
+        OccurringRule.objects.bulk_update(rules, fields=["dt_start", "dt_end", "all_day"])
+        # The bulk writes skip the signals that keep occurrences current.
+        update_event_occurrences(Event.objects.filter(pk__in=[event.pk for event in creates + updates]))
+
+    def get_venues(self, names):
+        """Return the calendar's locations called ``names`` by name, creating the missing ones in bulk."""
+        venues = {}
+        for location in EventLocation.objects.filter(calendar=self.calendar, name__in=names).order_by("pk"):
+            venues.setdefault(location.name, location)
+        missing = [EventLocation(calendar=self.calendar, name=name) for name in names if name not in venues]
+        for location in EventLocation.objects.bulk_create(missing):
+            venues[location.name] = location
+        return venues
+
+
+def import_calendars(calendars, workers=ICS_FETCH_WORKERS):
+    """Import the events of ``calendars``, fetching their feeds concurrently.
+
+    Feeds are fetched by ``workers`` threads sharing one connection pool;
+    they are parsed and imported in the calling thread as they arrive, each
+    in a transaction of its own. A calendar that fails to be fetched, parsed
+    or stored is logged and skipped. Returns the ``ICSFetch`` of each
+    imported calendar, keyed by calendar.
+    """
+    importers = [ICSImporter(calendar) for calendar in calendars]
+    fetches = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(importer.fetch): importer for importer in importers}
+        for future in as_completed(futures):
+            importer = futures[future]
+            try:
+                with transaction.atomic():
+                    fetched = importer.import_fetched(future.result())
+            except (requests.RequestException, ValueError, DatabaseError):
+                logger.exception("Could not import calendar %s", importer.calendar)
+                continue
+            logger.info(
+                "Fetched calendar %s: HTTP %s, %d bytes in %.2fs",
+                importer.calendar,
+                fetched.status,
+                fetched.size,
+                fetched.duration.total_seconds(),
+            )
+            fetches[importer.calendar] = fetched
+    return fetches
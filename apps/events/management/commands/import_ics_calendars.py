@@ -1,5 +1,6 @@
 from django.core.management import BaseCommand
 
+from apps.events.importer import ICS_FETCH_WORKERS, import_calendars
 from apps.events.models import Calendar
 
 
@@ -11,9 +12,22 @@ class Command(BaseCommand):
 
         flock -n import_ics_calendars.lock -c django-admin.py import_ics_calendars --settings=pydotorg.settings.local
 
+    Feeds are fetched concurrently, and those unchanged since the last run
+    are not downloaded or parsed again. Only the events that changed are
+    written, and the counts of each calendar's changes are reported.
+
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=ICS_FETCH_WORKERS, help="Number of feeds to fetch at once.")
+
     def handle(self, **options):
-        calendars = Calendar.objects.filter(url__isnull=False)
-        for calendar in calendars:
-            calendar.import_events()
+        calendars = Calendar.objects.filter(url__isnull=False).exclude(url="")
+        fetches = import_calendars(calendars, workers=options["workers"])
+        for calendar, fetched in fetches.items():
+            if fetched.not_modified:
+                status = "unchanged"
+            else:
+                counts = ", ".join(f"{count} {name}" for name, count in fetched.counts.items())
+                status = f"{fetched.size} bytes ({counts})"
+            self.stdout.write(f"{calendar.slug}: {status} in {fetched.duration.total_seconds():.2f}s")
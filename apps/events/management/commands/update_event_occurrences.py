@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from apps.events.tasks import update_event_occurrences_task
+
+
+class Command(BaseCommand):
+    """Expand the occurrences of new and running events over settings.EVENT_OCCURRENCE_HORIZON_DAYS.
+
+    The Celery beat schedule runs this daily; run it by hand to fill the
+    occurrence table after it is first created.
+    """
+
+    def handle(self, **options):
+        update_event_occurrences_task()
@@ -0,0 +1,16 @@
+"""Middleware for the events app."""
+
+from apps.events.utils import request_clock
+
+
+class RequestClockMiddleware:
+    """Middleware that reads the clock once per request, for ``apps.events.utils.request_now``."""
+
+    def __init__(self, get_response):
+        """Store the get_response callable."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Handle the request with the time it started as "now"."""
+        with request_clock():
+            return self.get_response(request)
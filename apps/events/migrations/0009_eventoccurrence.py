@@ -0,0 +1,70 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:23
+
+import datetime
+
+import django.db.models.deletion
+from dateutil.rrule import rrule
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+import apps.events.models
+
+
+def expand_occurrences(apps, schema_editor):
+    """Materialize the occurrences of existing events, as ``update_event_occurrences`` does."""
+    EventOccurrence = apps.get_model("events", "EventOccurrence")
+    OccurringRule = apps.get_model("events", "OccurringRule")
+    RecurringRule = apps.get_model("events", "RecurringRule")
+
+    now = timezone.now()
+    horizon = datetime.timedelta(days=settings.EVENT_OCCURRENCE_HORIZON_DAYS)
+    occurrences = [
+        EventOccurrence(event_id=rule.event_id, dt_start=rule.dt_start, dt_end=rule.dt_end, all_day=rule.all_day)
+        for rule in OccurringRule.objects.iterator()
+    ]
+    for rule in RecurringRule.objects.iterator():
+        recurrence = rrule(freq=rule.frequency, interval=rule.interval, dtstart=rule.begin, until=rule.finish)
+        starts = recurrence.between(now - horizon, now + horizon, inc=True)
+        starts.extend(start for start in (recurrence.before(now - horizon), recurrence.after(now + horizon)) if start)
+        occurrences.extend(
+            EventOccurrence(
+                event_id=rule.event_id, dt_start=start, dt_end=start + rule.duration_internal, all_day=rule.all_day
+            )
+            for start in starts
+        )
+    EventOccurrence.objects.bulk_create(occurrences, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0008_alter_alarm_creator_alter_alarm_last_modified_by_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventOccurrence",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("dt_start", models.DateTimeField()),
+                ("dt_end", models.DateTimeField()),
+                ("all_day", models.BooleanField(default=False)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="occurrences", to="events.event"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("dt_start",),
+                "indexes": [
+                    models.Index(fields=["dt_start"], name="events_even_dt_star_37c096_idx"),
+                    models.Index(fields=["dt_end"], name="events_even_dt_end_badf61_idx"),
+                    models.Index(fields=["event", "dt_start"], name="events_even_event_i_8d0c2c_idx"),
+                ],
+            },
+            bases=(apps.events.models.RuleMixin, models.Model),
+        ),
+        migrations.RunPython(expand_occurrences, migrations.RunPython.noop),
+    ]
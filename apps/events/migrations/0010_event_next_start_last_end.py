@@ -0,0 +1,56 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:36
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+def fill_event_times(apps, schema_editor):
+    """Set ``next_start`` and ``last_end`` from the occurrences, as ``update_event_times`` does."""
+    Event = apps.get_model("events", "Event")
+    EventOccurrence = apps.get_model("events", "EventOccurrence")
+
+    now = timezone.now()
+    occurrences = EventOccurrence.objects.filter(event=OuterRef("pk"))
+    Event.objects.update(
+        next_start=Subquery(occurrences.filter(dt_start__gt=now).order_by("dt_start").values("dt_start")[:1]),
+        last_end=Subquery(occurrences.filter(dt_end__lt=now).order_by("-dt_end").values("dt_end")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0009_eventoccurrence"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="last_end",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="next_start",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["next_start"], name="events_even_next_st_b5d2e4_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["last_end"], name="events_even_last_en_6547c7_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["calendar", "next_start"], name="events_even_calenda_784253_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["calendar", "last_end"], name="events_even_calenda_536b42_idx"),
+        ),
+        migrations.RunPython(fill_event_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0010_event_next_start_last_end"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calendar",
+            name="etag",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="calendar",
+            name="last_fetch_bytes",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="calendar",
+            name="last_fetch_duration",
+            field=models.DurationField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="calendar",
+            name="last_fetched",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="calendar",
+            name="last_modified",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+    ]
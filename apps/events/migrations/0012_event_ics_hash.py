@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0011_calendar_fetch_state"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="ics_hash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["uid"], name="events_even_uid_fc63ba_idx"),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.16 on 2026-10-18 07:04
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import DurationField, ExpressionWrapper, F, OuterRef, Subquery, Value
+from django.utils import timezone
+
+
+def schedule_alarms(apps, schema_editor):
+    """Schedule the next reminder of every alarm, as ``schedule_alarms`` does."""
+    Alarm = apps.get_model("events", "Alarm")
+    EventOccurrence = apps.get_model("events", "EventOccurrence")
+
+    now = timezone.now()
+    occurrences = EventOccurrence.objects.filter(event=OuterRef("event_id"), dt_start__gt=now)
+    start = Subquery(occurrences.order_by("dt_start").values("dt_start")[:1])
+    trigger = ExpressionWrapper(F("trigger") * Value(datetime.timedelta(hours=1)), output_field=DurationField())
+    Alarm.objects.update(
+        occurrence_start=start,
+        due_at=ExpressionWrapper(start - trigger, output_field=models.DateTimeField()),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0012_event_ics_hash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="alarm",
+            name="due_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="alarm",
+            name="occurrence_start",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="alarm",
+            name="sent_for",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="alarm",
+            index=models.Index(fields=["due_at"], name="events_alar_due_at_3900e0_idx"),
+        ),
+        migrations.RunPython(schedule_alarms, migrations.RunPython.noop),
+    ]
@@ -2,12 +2,25 @@
 
 import contextlib
 import datetime
-from operator import itemgetter
 
 from dateutil.rrule import DAILY, MONTHLY, WEEKLY, YEARLY, rrule
 from django.conf import settings
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import (
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
 from django.template.defaultfilters import date
 from django.urls import reverse
 from django.utils import timezone
@@ -16,7 +29,14 @@ from django.utils.translation import gettext_lazy as _
 from markupfield.fields import MarkupField
 
 from apps.cms.models import ContentManageable, NameSlugModel
-from apps.events.utils import convert_dt_to_aware, minutes_resolution, timedelta_nice_repr, timedelta_parse
+from apps.events.recurrence import compile_recurrence
+from apps.events.utils import (
+    convert_dt_to_aware,
+    minutes_resolution,
+    request_now,
+    timedelta_nice_repr,
+    timedelta_parse,
+)
 
 DEFAULT_MARKUP_TYPE = getattr(settings, "DEFAULT_MARKUP_TYPE", "restructuredtext")
 
@@ -32,6 +52,13 @@ class Calendar(ContentManageable):
     slug = models.SlugField(unique=True)
     description = models.CharField(max_length=255, null=True, blank=True)  # noqa: DJ001
 
+    # Validators and statistics of the last fetch of ``url``, see ``ICSImporter``.
+    etag = models.CharField(max_length=255, blank=True, default="", editable=False)
+    last_modified = models.CharField(max_length=64, blank=True, default="", editable=False)
+    last_fetched = models.DateTimeField(null=True, blank=True, editable=False)
+    last_fetch_duration = models.DurationField(null=True, blank=True, editable=False)
+    last_fetch_bytes = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
     def __str__(self):
         """Return string representation."""
         return self.name
@@ -41,14 +68,14 @@ class Calendar(ContentManageable):
         return reverse("events:event_list", kwargs={"calendar_slug": self.slug})
 
     def import_events(self):
-        """Import events from the calendar's iCal URL."""
+        """Import events from the calendar's iCal URL, returning the ``ICSFetch`` of its feed."""
         if not self.url:
             msg = "calendar must have a url field set"
             raise ValueError(msg)
         from apps.events.importer import ICSImporter
 
         importer = ICSImporter(calendar=self)
-        importer.import_events()
+        return importer.import_events()
 
 
 class EventCategory(NameSlugModel):
@@ -106,17 +133,111 @@ class EventManager(models.Manager):
     """Custom manager for querying events by time boundaries."""
 
     def for_datetime(self, dt=None):
-        """Return events occurring after the given datetime."""
-        dt = timezone.now() if dt is None else convert_dt_to_aware(dt)
-        return self.filter(Q(occurring_rule__dt_start__gt=dt) | Q(recurring_rules__finish__gt=dt))
+        """Return events occurring after the given datetime, soonest first."""
+        return self.upcoming(dt)
 
     def until_datetime(self, dt=None):
-        """Return events that ended before the given datetime."""
-        dt = timezone.now() if dt is None else convert_dt_to_aware(dt)
-        return self.filter(Q(occurring_rule__dt_end__lt=dt) | Q(recurring_rules__begin__lt=dt))
+        """Return events that ended before the given datetime, most recent first."""
+        return self.past(dt)
+
+    def upcoming(self, dt=None):
+        """Return events with an occurrence starting after ``dt``, soonest first.
+
+        Without ``dt`` this is a range scan of the ``next_start`` index. Each
+        event's next occurrence is prefetched for ``Event.next_time``, and its
+        calendar and venue are fetched along with it for rendering lists.
+        """
+        if dt is None:
+            now = request_now()
+            events = self.filter(next_start__gt=now).order_by("next_start", "pk")
+        else:
+            now = convert_dt_to_aware(dt)
+            events = (
+                self.annotate(
+                    next_occurrence_start=Min("occurrences__dt_start", filter=Q(occurrences__dt_start__gt=now))
+                )
+                .filter(next_occurrence_start__isnull=False)
+                .order_by("next_occurrence_start", "pk")
+            )
+        occurrences = EventOccurrence.objects.upcoming(now)[:1]
+        return events.select_related("calendar", "venue").prefetch_related(
+            Prefetch("occurrences", queryset=occurrences, to_attr="next_occurrences")
+        )
+
+    def past(self, dt=None):
+        """Return events with an occurrence that ended before ``dt``, most recent first.
+
+        Without ``dt`` this is a range scan of the ``last_end`` index. Each
+        event's previous occurrence is prefetched for ``Event.previous_time``.
+        """
+        if dt is None:
+            now = request_now()
+            events = self.filter(last_end__lt=now).order_by("-last_end", "-pk")
+        else:
+            now = convert_dt_to_aware(dt)
+            events = (
+                self.annotate(previous_occurrence_end=Max("occurrences__dt_end", filter=Q(occurrences__dt_end__lt=now)))
+                .filter(previous_occurrence_end__isnull=False)
+                .order_by("-previous_occurrence_end", "-pk")
+            )
+        occurrences = EventOccurrence.objects.past(now)[:1]
+        return events.select_related("calendar", "venue").prefetch_related(
+            Prefetch("occurrences", queryset=occurrences, to_attr="previous_occurrences")
+        )
+
+    def happening(self, dt=None):
+        """Return events with an occurrence in progress at ``dt``, earliest started first.
+
+        Each event's current occurrence is prefetched for ``Event.current_time``.
+        """
+        dt = request_now() if dt is None else convert_dt_to_aware(dt)
+        occurrences = EventOccurrence.objects.happening(dt)[:1]
+        in_progress = Q(occurrences__dt_start__lte=dt, occurrences__dt_end__gte=dt)
+        return (
+            self.annotate(current_occurrence_start=Min("occurrences__dt_start", filter=in_progress))
+            .filter(current_occurrence_start__isnull=False)
+            .order_by("current_occurrence_start", "pk")
+            .select_related("calendar", "venue")
+            .prefetch_related(Prefetch("occurrences", queryset=occurrences, to_attr="current_occurrences"))
+        )
 
+    def with_outdated_occurrences(self, now=None):
+        """Return events whose occurrences must be expanded again to cover the horizon around ``now``.
 
-class Event(ContentManageable):
+        These are events with recurring rules still running within the horizon,
+        and events with rules whose occurrences were never expanded.
+        """
+        now = timezone.now() if now is None else now
+        since = now - datetime.timedelta(days=settings.EVENT_OCCURRENCE_HORIZON_DAYS)
+        running = RecurringRule.objects.filter(finish__gte=since).values("event_id")
+        expanded = EventOccurrence.objects.values("event_id")
+        has_rules = Q(occurring_rule__isnull=False) | Q(recurring_rules__isnull=False)
+        unexpanded = self.filter(has_rules).exclude(pk__in=expanded).values("pk")
+        return self.filter(Q(pk__in=running) | Q(pk__in=unexpanded))
+
+
+class DerivedFieldsMixin:
+    """Model mixin leaving the ``derived_fields``, written with ``QuerySet.update``, out of ``save()``.
+
+    Saving an instance loaded before they were last updated must not
+    overwrite them. Inserts, and saves given ``update_fields``, are left as is.
+    """
+
+    derived_fields = frozenset()
+
+    def save(self, **kwargs):
+        """Save every field but the derived ones when updating a stored row."""
+        updating = not self._state.adding and self.pk is not None and not kwargs.get("force_insert")
+        if updating and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.derived_fields
+            ]
+        return super().save(**kwargs)
+
+
+class Event(DerivedFieldsMixin, ContentManageable):
     """A Python community event such as a conference, sprint, or meetup."""
 
     uid = models.CharField(max_length=200, null=True, blank=True)  # noqa: DJ001
@@ -135,12 +256,26 @@ class Event(ContentManageable):
     categories = models.ManyToManyField(EventCategory, related_name="events", blank=True)
     featured = models.BooleanField(default=False, db_index=True)
 
+    # Denormalized from the event's occurrences by ``update_event_times``.
+    next_start = models.DateTimeField(null=True, blank=True, editable=False)
+    last_end = models.DateTimeField(null=True, blank=True, editable=False)
+    # Digest of the feed data the event was last imported from; see ``ics_hash``.
+    ics_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+
     objects = EventManager()
+    derived_fields = frozenset({"next_start", "last_end"})
 
     class Meta:
         """Meta configuration for Event."""
 
         ordering = ("-occurring_rule__dt_start",)
+        indexes = [
+            models.Index(fields=["next_start"]),
+            models.Index(fields=["last_end"]),
+            models.Index(fields=["calendar", "next_start"]),
+            models.Index(fields=["calendar", "last_end"]),
+            models.Index(fields=["uid"]),
+        ]
 
     def __str__(self):
         """Return string representation."""
@@ -152,58 +287,53 @@ class Event(ContentManageable):
 
     @cached_property
     def previous_event(self):
-        """Return the previous event in the same calendar, or None."""
+        """Return the event in the same calendar whose occurrence started last before this one's next, or None."""
         if not self.next_time:
             return None
-        dt = self.next_time.dt_end
-        try:
-            return Event.objects.until_datetime(dt).filter(calendar=self.calendar)[0]
-        except IndexError:
-            return None
+        occurrence = (
+            EventOccurrence.objects.filter(event__calendar=self.calendar_id, dt_start__lt=self.next_time.dt_start)
+            .exclude(event=self)
+            .select_related("event")
+            .order_by("-dt_start", "-pk")
+            .first()
+        )
+        return occurrence.event if occurrence else None
 
     @cached_property
     def next_event(self):
-        """Return the next event in the same calendar, or None."""
+        """Return the event in the same calendar whose occurrence starts next after this one's next, or None."""
         if not self.next_time:
             return None
-        dt = self.next_time.dt_start
-        try:
-            return Event.objects.for_datetime(dt).filter(calendar=self.calendar)[0]
-        except IndexError:
-            return None
+        occurrence = (
+            EventOccurrence.objects.filter(event__calendar=self.calendar_id, dt_start__gt=self.next_time.dt_start)
+            .exclude(event=self)
+            .select_related("event")
+            .order_by("dt_start", "pk")
+            .first()
+        )
+        return occurrence.event if occurrence else None
+
+    def _occurrence(self, prefetched_attr, occurrences):
+        """Return the occurrence prefetched as ``prefetched_attr``, or else the first of ``occurrences``."""
+        prefetched = getattr(self, prefetched_attr, None)
+        if prefetched is not None:
+            return prefetched[0] if prefetched else None
+        return occurrences.first()
 
     @property
     def next_time(self):
-        """Return the OccurringRule or RecurringRule with the closest `dt_start` from now."""
-        now = timezone.now()
-        recurring_start = occurring_start = None
-
-        try:
-            occurring_rule = self.occurring_rule
-        except OccurringRule.DoesNotExist:
-            pass
-        else:
-            if occurring_rule and occurring_rule.dt_start > now:
-                occurring_start = (occurring_rule.dt_start, occurring_rule)
-
-        rrules = self.recurring_rules.filter(finish__gt=now)
-        recurring_starts = [(rule.dt_start, rule) for rule in rrules if rule.dt_start is not None]
-        recurring_starts.sort(key=itemgetter(0))
-
-        with contextlib.suppress(IndexError):
-            recurring_start = recurring_starts[0]
+        """Return the event's next occurrence, or None."""
+        return self._occurrence("next_occurrences", self.occurrences.upcoming(request_now()))
 
-        starts = [i for i in (recurring_start, occurring_start) if i is not None]
-        starts.sort(key=itemgetter(0))
-        try:
-            return starts[0][1]
-        except IndexError:
-            return None
+    @property
+    def current_time(self):
+        """Return the event's occurrence in progress, or None."""
+        return self._occurrence("current_occurrences", self.occurrences.happening(request_now()))
 
     def is_scheduled_to_start_this_year(self) -> bool:
         """Return True if the event starts in the current calendar year."""
         if self.next_time:
-            current_year: int = timezone.now().year
+            current_year: int = request_now().year
             if self.next_time.dt_start.year == current_year:
                 return True
         return False
@@ -211,38 +341,34 @@ class Event(ContentManageable):
     def is_scheduled_to_end_this_year(self) -> bool:
         """Return True if the event ends in the current calendar year."""
         if self.next_time:
-            current_year: int = timezone.now().year
+            current_year: int = request_now().year
             if self.next_time.dt_end.year == current_year:
                 return True
         return False
 
     @property
     def previous_time(self):
-        """Return the most recent past OccurringRule or RecurringRule."""
-        now = timezone.now()
-        recurring_end = occurring_end = None
-
-        try:
-            occurring_rule = self.occurring_rule
-        except OccurringRule.DoesNotExist:
-            pass
-        else:
-            if occurring_rule and occurring_rule.dt_end < now:
-                occurring_end = (occurring_rule.dt_end, occurring_rule)
-
-        rrules = self.recurring_rules.filter(begin__lt=now)
-        recurring_ends = [(rule.dt_end, rule) for rule in rrules if rule.dt_end is not None]
-        recurring_ends.sort(key=itemgetter(0), reverse=True)
-
-        with contextlib.suppress(IndexError):
-            recurring_end = recurring_ends[0]
-
-        ends = [i for i in (recurring_end, occurring_end) if i is not None]
-        ends.sort(key=itemgetter(0), reverse=True)
-        try:
-            return ends[0][1]
-        except IndexError:
-            return None
+        """Return the event's most recently ended occurrence, or None."""
+        return self._occurrence("previous_occurrences", self.occurrences.past(request_now()))
+
+    def expand_occurrences(self, since, until):
+        """Return the unsaved occurrences of the event's rules from ``since`` to ``until``.
+
+        A single occurrence is always included whatever its date; recurring rules
+        also contribute their closest occurrence on either side of the window.
+        """
+        occurrences = []
+        with contextlib.suppress(OccurringRule.DoesNotExist):
+            rule = self.occurring_rule
+            occurrences.append(
+                EventOccurrence(event=self, dt_start=rule.dt_start, dt_end=rule.dt_end, all_day=rule.all_day)
+            )
+        for rule in self.recurring_rules.all():
+            occurrences.extend(
+                EventOccurrence(event=self, dt_start=start, dt_end=start + rule.duration_internal, all_day=rule.all_day)
+                for start in rule.occurrence_starts(since, until)
+            )
+        return occurrences
 
     @property
     def next_or_previous_time(self) -> models.Model:
@@ -253,7 +379,7 @@ class Event(ContentManageable):
         if previous_time := self.previous_time:
             return previous_time
 
-        return self.occurring_rule if hasattr(self, "occurring_rule") else None
+        return self.current_time
 
     @property
     def is_past(self):
@@ -354,6 +480,26 @@ class RecurringRule(RuleMixin, models.Model):
             until=self.finish,
         )
 
+    def compiled_recurrence(self, now=None):
+        """Return the memoized recurrence of this rule, precomputed around ``now``."""
+        now = request_now() if now is None else now
+        return compile_recurrence(self.frequency, self.interval, self.begin, self.finish, now)
+
+    def occurrence_starts(self, since, until):
+        """Return the start of every occurrence from ``since`` to ``until``, plus the closest one on either side.
+
+        The range is usually wider than the compiled recurrence's window, so
+        the rrule is walked directly.
+        """
+        recurrence = self.to_rrule()
+        before = recurrence.before(since)
+        after = recurrence.after(until)
+        return [
+            *([before] if before is not None else []),
+            *recurrence.between(since, until, inc=True),
+            *([after] if after is not None else []),
+        ]
+
     @property
     def freq_interval_as_timedelta(self):
         """Return the frequency interval as a timedelta."""
@@ -369,11 +515,11 @@ class RecurringRule(RuleMixin, models.Model):
     @property
     def dt_start(self):
         """Return the next occurrence start datetime from the recurrence rule."""
-        since = timezone.now()
-        recurrence = self.to_rrule().after(since)
-        if recurrence is None:
+        since = request_now()
+        start = self.compiled_recurrence(since).after(since)
+        if start is None:
             return since
-        return recurrence
+        return start
 
     @property
     def dt_end(self):
@@ -386,12 +532,170 @@ class RecurringRule(RuleMixin, models.Model):
         return self.dt_start.date() == self.dt_end.date()
 
 
-class Alarm(ContentManageable):
+class EventOccurrenceQuerySet(models.QuerySet):
+    """Range queries over materialized event occurrences."""
+
+    def upcoming(self, dt):
+        """Return occurrences starting after ``dt``, soonest first."""
+        return self.filter(dt_start__gt=dt).order_by("dt_start", "pk")
+
+    def past(self, dt):
+        """Return occurrences that ended before ``dt``, most recent first."""
+        return self.filter(dt_end__lt=dt).order_by("-dt_end", "-pk")
+
+    def happening(self, dt):
+        """Return occurrences in progress at ``dt``, earliest started first."""
+        return self.filter(dt_start__lte=dt, dt_end__gte=dt).order_by("dt_start", "pk")
+
+
+class EventOccurrence(RuleMixin, models.Model):
+    """One occurrence of an Event, expanded from its rules.
+
+    Occurrences of recurring rules are only materialized over a rolling
+    horizon around the present (see ``update_event_occurrences``). Shares the
+    date API of `OccurringRule`, so templates can render either.
+    """
+
+    event = models.ForeignKey(Event, related_name="occurrences", on_delete=models.CASCADE)
+    dt_start = models.DateTimeField()
+    dt_end = models.DateTimeField()
+    all_day = models.BooleanField(default=False)
+
+    objects = EventOccurrenceQuerySet.as_manager()
+
+    class Meta:
+        """Meta configuration for EventOccurrence."""
+
+        ordering = ("dt_start",)
+        indexes = [
+            models.Index(fields=["dt_start"]),
+            models.Index(fields=["dt_end"]),
+            models.Index(fields=["event", "dt_start"]),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        strftime = settings.SHORT_DATETIME_FORMAT
+        return f"{self.event.title} {date(self.dt_start, strftime)} - {date(self.dt_end, strftime)}"
+
+    @property
+    def duration(self):
+        """Return the duration as a timedelta."""
+        return self.dt_end - self.dt_start
+
+    @property
+    def single_day(self):
+        """Return True if the occurrence starts and ends on the same day."""
+        return self.dt_start.date() == self.dt_end.date()
+
+
+def update_event_occurrences(events, now=None):
+    """Replace the stored occurrences of ``events`` with ones expanded around ``now``.
+
+    Recurring rules are expanded ``EVENT_OCCURRENCE_HORIZON_DAYS`` either side
+    of ``now``. Returns the number of occurrences stored.
+    """
+    now = timezone.now() if now is None else now
+    horizon = datetime.timedelta(days=settings.EVENT_OCCURRENCE_HORIZON_DAYS)
+    events = list(events.select_related("occurring_rule").prefetch_related("recurring_rules"))
+    occurrences = [
+        occurrence for event in events for occurrence in event.expand_occurrences(now - horizon, now + horizon)
+    ]
+    with transaction.atomic():
+        EventOccurrence.objects.filter(event__in=events).delete()
+        EventOccurrence.objects.bulk_create(occurrences)
+        update_event_times(Event.objects.filter(pk__in=[event.pk for event in events]), now=now)
+        schedule_alarms(Alarm.objects.filter(event__in=events), now=now)
+    return len(occurrences)
+
+
+def update_event_times(events, now=None):
+    """Set ``next_start`` and ``last_end`` of ``events`` from their occurrences, as of ``now``.
+
+    ``next_start`` is the start of the first occurrence still to begin and
+    ``last_end`` the end of the latest occurrence already over. Both are set
+    in a single UPDATE.
+    """
+    now = timezone.now() if now is None else now
+    occurrences = EventOccurrence.objects.filter(event=OuterRef("pk"))
+    return events.update(
+        next_start=Subquery(occurrences.upcoming(now).values("dt_start")[:1]),
+        last_end=Subquery(occurrences.past(now).values("dt_end")[:1]),
+    )
+
+
+@receiver(post_save, sender=OccurringRule)
+@receiver(post_save, sender=RecurringRule)
+@receiver(post_delete, sender=OccurringRule)
+@receiver(post_delete, sender=RecurringRule)
+def update_occurrences_on_rule_change(sender, instance, **kwargs):
+    """Expand the event's occurrences again when one of its rules changes."""
+    if kwargs.get("raw", False):
+        return
+    origin = kwargs.get("origin")
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin is not None and origin_model is not sender:
+        # The event itself is being deleted, along with its occurrences.
+        return
+    update_event_occurrences(Event.objects.filter(pk=instance.event_id))
+
+
+@receiver(pre_save, sender=Event)
+def remember_stored_calendar(sender, instance, raw=False, **kwargs):
+    """Remember the calendar a saved event is stored in, so its feeds are invalidated too if the event moves."""
+    if raw or instance._state.adding:  # noqa: SLF001 - Django model state API
+        return
+    instance._stored_calendar_id = (  # noqa: SLF001 - read by invalidate_ics_feeds_on_change
+        Event.objects.filter(pk=instance.pk).values_list("calendar_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Calendar)
+@receiver(post_save, sender=EventCategory)
+@receiver(post_save, sender=EventLocation)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=EventCategory)
+@receiver(post_delete, sender=EventLocation)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=OccurringRule)
+@receiver(post_save, sender=RecurringRule)
+@receiver(post_delete, sender=OccurringRule)
+@receiver(post_delete, sender=RecurringRule)
+@receiver(m2m_changed, sender=Event.categories.through)
+def invalidate_ics_feeds_on_change(sender, instance, **kwargs):
+    """Invalidate the iCalendar feeds of the calendar whose events, rules, categories or locations changed."""
+    if kwargs.get("raw", False) or kwargs.get("action", "post_").startswith("pre_"):
+        return
+    from apps.events.export import invalidate_ics_feeds
+
+    if isinstance(instance, Calendar):
+        calendar_ids = [instance.pk]
+    elif isinstance(instance, RuleMixin):
+        calendar_ids = Event.objects.filter(pk=instance.event_id).values_list("calendar_id", flat=True)
+    else:
+        calendar_ids = [instance.calendar_id, getattr(instance, "_stored_calendar_id", None)]
+    invalidate_ics_feeds(calendar_ids)
+
+
+class Alarm(DerivedFieldsMixin, ContentManageable):
     """A reminder notification for an upcoming event."""
 
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     trigger = models.PositiveSmallIntegerField(_("hours before the event occurs"), default=24)
 
+    # The occurrence the next reminder is for and when it is due, set by
+    # ``schedule_alarms``, and the occurrence the last reminder was sent for.
+    occurrence_start = models.DateTimeField(null=True, blank=True, editable=False)
+    due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    sent_for = models.DateTimeField(null=True, blank=True, editable=False)
+
+    derived_fields = frozenset({"occurrence_start", "due_at", "sent_for"})
+
+    class Meta:
+        """Meta configuration for Alarm."""
+
+        indexes = [models.Index(fields=["due_at"])]
+
     def __str__(self):
         """Return string representation."""
         return f"Alarm for {self.event.title} to {self.recipient}"
@@ -403,3 +707,30 @@ class Alarm(ContentManageable):
         if full_name:
             return f"{full_name} <{self.creator.email}>"
         return self.creator.email
+
+
+def schedule_alarms(alarms, now=None):
+    """Set the occurrence each of ``alarms`` next reminds of, and when it is due, as of ``now``.
+
+    That is the event's first occurrence starting after ``now`` and after
+    the one the alarm was last sent for; the reminder is due ``trigger``
+    hours before it. Alarms with no such occurrence are not due. Both are
+    set in a single UPDATE.
+    """
+    now = timezone.now() if now is None else now
+    occurrences = EventOccurrence.objects.filter(event=OuterRef("event_id"), dt_start__gt=now).filter(
+        dt_start__gt=Coalesce(OuterRef("sent_for"), Value(now))
+    )
+    start = Subquery(occurrences.order_by("dt_start").values("dt_start")[:1])
+    trigger = ExpressionWrapper(F("trigger") * Value(datetime.timedelta(hours=1)), output_field=DurationField())
+    return alarms.update(
+        occurrence_start=start, due_at=ExpressionWrapper(start - trigger, output_field=models.DateTimeField())
+    )
+
+
+@receiver(post_save, sender=Alarm)
+def schedule_alarm_on_save(sender, instance, **kwargs):
+    """Schedule the next reminder of a created or changed alarm."""
+    if kwargs.get("raw", False):
+        return
+    schedule_alarms(Alarm.objects.filter(pk=instance.pk))
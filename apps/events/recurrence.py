@@ -0,0 +1,75 @@
+"""Compiled recurrences of recurring rules, memoized per process.
+
+``dateutil.rrule`` walks a recurrence from its first occurrence on every
+lookup, so asking each recurring rule of a long event list for its next
+occurrence is expensive. A rule's occurrences around the present are instead
+expanded once, cached under the rule's fields, and looked up by bisection.
+Expanding stored occurrences over ``EVENT_OCCURRENCE_HORIZON_DAYS`` reaches
+well past the window and uses the rrule directly.
+"""
+
+import bisect
+import datetime
+import functools
+
+from dateutil.rrule import rrule
+
+# Occurrences precomputed on either side of the current day; lookups outside
+# of the window fall back to the rrule.
+RECURRENCE_WINDOW = datetime.timedelta(days=90)
+# Compiled recurrences kept per process.
+RECURRENCE_CACHE_SIZE = 1024
+
+
+class CompiledRecurrence:
+    """The sorted occurrence starts of a recurrence within a window."""
+
+    def __init__(self, recurrence, since, until):
+        """Expand ``recurrence`` from ``since`` to ``until``, and the closest start on either side."""
+        self.recurrence = recurrence
+        self.since = since
+        self.until = until
+        self.starts = recurrence.between(since, until, inc=True)
+        self.preceding = recurrence.before(since)
+        self.following = recurrence.after(until)
+
+    def covers(self, since, until):
+        """Return True if the window spans ``since`` to ``until``."""
+        return self.since <= since and until <= self.until
+
+    def after(self, dt):
+        """Return the first start after ``dt``, or None."""
+        if not self.covers(dt, dt):
+            return self.recurrence.after(dt)
+        index = bisect.bisect_right(self.starts, dt)
+        return self.starts[index] if index < len(self.starts) else self.following
+
+    def before(self, dt):
+        """Return the last start before ``dt``, or None."""
+        if not self.covers(dt, dt):
+            return self.recurrence.before(dt)
+        index = bisect.bisect_left(self.starts, dt)
+        return self.starts[index - 1] if index else self.preceding
+
+    def between(self, since, until):
+        """Return the starts from ``since`` to ``until``, both included."""
+        if not self.covers(since, until):
+            return self.recurrence.between(since, until, inc=True)
+        return self.starts[bisect.bisect_left(self.starts, since) : bisect.bisect_right(self.starts, until)]
+
+
+@functools.lru_cache(maxsize=RECURRENCE_CACHE_SIZE)
+def _compile_recurrence(frequency, interval, begin, finish, day):
+    """Compile a recurrence with its window centered on ``day``."""
+    recurrence = rrule(freq=frequency, interval=interval, dtstart=begin, until=finish)
+    return CompiledRecurrence(recurrence, day - RECURRENCE_WINDOW, day + RECURRENCE_WINDOW + datetime.timedelta(days=1))
+
+
+def compile_recurrence(frequency, interval, begin, finish, now):
+    """Return the compiled recurrence of the rule fields, its window centered on the day of ``now``.
+
+    Rules with the same fields share one compiled recurrence, which is
+    compiled again when the day changes.
+    """
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _compile_recurrence(frequency, interval, begin, finish, day)
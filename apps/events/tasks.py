@@ -0,0 +1,43 @@
+"""Celery tasks for the events app."""
+
+import datetime
+
+from celery import shared_task
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.events.alarms import dispatch_alarms
+from apps.events.models import Event, EventOccurrence, update_event_occurrences, update_event_times
+
+# Events expanded per transaction, bounding the occurrences held in memory.
+OCCURRENCE_UPDATE_BATCH_SIZE = 500
+EVENT_TIMES_UPDATED_AT_KEY = "events:times-updated-at"
+
+
+@shared_task
+def update_event_occurrences_task():
+    """Roll the materialized occurrences of running recurring events forward."""
+    pks = list(Event.objects.with_outdated_occurrences().values_list("pk", flat=True))
+    for start in range(0, len(pks), OCCURRENCE_UPDATE_BATCH_SIZE):
+        update_event_occurrences(Event.objects.filter(pk__in=pks[start : start + OCCURRENCE_UPDATE_BATCH_SIZE]))
+
+
+@shared_task
+def update_event_times_task():
+    """Move ``next_start`` and ``last_end`` past the occurrences that began or ended since the last run.
+
+    Occurrences that began are found through the ``next_start`` index, those
+    that ended through the occurrences' ``dt_end`` index.
+    """
+    now = timezone.now()
+    since = cache.get(EVENT_TIMES_UPDATED_AT_KEY) or now - datetime.timedelta(days=1)
+    ended = EventOccurrence.objects.filter(dt_end__gte=since, dt_end__lt=now).values("event_id")
+    update_event_times(Event.objects.filter(Q(next_start__lte=now) | Q(pk__in=ended)), now=now)
+    cache.set(EVENT_TIMES_UPDATED_AT_KEY, now, timeout=None)
+
+
+@shared_task
+def dispatch_alarms_task():
+    """Send the event reminders that are due."""
+    return dispatch_alarms()
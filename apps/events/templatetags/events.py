@@ -1,7 +1,6 @@
 """Template tags for displaying upcoming events."""
 
 from django import template
-from django.utils import timezone
 
 from apps.events.models import Event
 
@@ -11,7 +10,7 @@ register = template.Library()
 @register.simple_tag
 def get_events_upcoming(limit=5, only_featured=False):
     """Return upcoming events, optionally filtered to featured only."""
-    qs = Event.objects.for_datetime(timezone.now()).order_by("occurring_rule__dt_start")
+    qs = Event.objects.upcoming()
     if only_featured:
         qs = qs.filter(featured=True)
     return qs[:limit]
@@ -0,0 +1,79 @@
+"""A local iCal feed server, for tests and local development."""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Sent with every feed, so clients can make conditional requests.
+FEED_LAST_MODIFIED = "Sat, 01 Jun 2024 00:00:00 GMT"
+
+
+class FakeICSHandler(BaseHTTPRequestHandler):
+    """Serve the registered feeds, honouring ``If-None-Match``."""
+
+    def do_GET(self):
+        """Answer with the feed at the path, a 304 if it is unchanged, or a 404."""
+        fake = self.server.fake
+        with fake.lock:
+            fake.requests.append((self.path, dict(self.headers)))
+            content = fake.feeds.get(self.path)
+        if content is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/calendar")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", FEED_LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # noqa: A002 - matches the overridden signature
+        """Keep test output quiet."""
+
+
+class FakeICSServer:
+    """Serve iCal feeds from a local HTTP server.
+
+    Used as a context manager; feeds are registered by path in :attr:`feeds`
+    and every request's path and headers are recorded in :attr:`requests`::
+
+        with FakeICSServer({"/python.ics": ical}) as server:
+            calendar.url = server.url("/python.ics")
+            calendar.import_events()
+    """
+
+    def __init__(self, feeds=None):
+        """Prepare the server; it starts when the context is entered."""
+        self.feeds = {
+            path: content.encode() if isinstance(content, str) else content for path, content in (feeds or {}).items()
+        }
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = None
+
+    def url(self, path):
+        """Return the URL of the feed served at ``path``."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        """Start the server."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeICSHandler)
+        self.server.fake = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,111 @@
+import datetime
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.events.alarms import dispatch_alarms
+from apps.events.models import Alarm, Calendar, Event, RecurringRule
+from apps.events.tasks import dispatch_alarms_task
+from apps.events.utils import seconds_resolution
+
+
+class AlarmDispatchTests(TestCase):
+    def setUp(self):
+        self.now = seconds_resolution(timezone.now())
+        self.user = get_user_model().objects.create_user(
+            username="username", password="password", email="guido@python.org", first_name="Guido"
+        )
+        self.calendar = Calendar.objects.create(creator=self.user, slug="test-calendar")
+        self.event = Event.objects.create(title="Sprints & talks", creator=self.user, calendar=self.calendar)
+        self.rule = RecurringRule.objects.create(
+            event=self.event,
+            begin=self.now + datetime.timedelta(hours=10),
+            finish=self.now + datetime.timedelta(weeks=10),
+            frequency=3,  # daily
+        )
+
+    def create_alarm(self, trigger=24, user=None):
+        alarm = Alarm.objects.create(event=self.event, trigger=trigger, creator=user or self.user)
+        alarm.refresh_from_db()
+        return alarm
+
+    def test_alarms_are_due_before_the_next_occurrence(self):
+        alarm = self.create_alarm(trigger=2)
+
+        self.assertEqual(alarm.occurrence_start, self.rule.begin)
+        self.assertEqual(alarm.due_at, self.rule.begin - datetime.timedelta(hours=2))
+
+        self.rule.begin += datetime.timedelta(hours=1)
+        self.rule.save()
+        alarm.refresh_from_db()
+        self.assertEqual(alarm.occurrence_start, self.rule.begin)
+
+    def test_due_reminders_are_sent_once(self):
+        due = self.create_alarm(trigger=24)
+        later = self.create_alarm(trigger=2)
+
+        self.assertEqual(dispatch_alarms(now=self.now), 1)
+        self.assertEqual(dispatch_alarms(now=self.now), 0)
+
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["Guido <guido@python.org>"])
+        self.assertTrue(message.subject.startswith("Reminder: Sprints & talks starts "))
+        self.assertIn(self.event.get_absolute_url(), message.body)
+        due.refresh_from_db()
+        self.assertEqual(due.sent_for, self.rule.begin)
+        # The next reminder is for the following day's occurrence.
+        self.assertEqual(due.occurrence_start, self.rule.begin + datetime.timedelta(days=1))
+        self.assertEqual(due.due_at, self.rule.begin)
+        later.refresh_from_db()
+        self.assertIsNone(later.sent_for)
+
+        # Saving an alarm loaded before the reminder went out does not make it due again.
+        stale = Alarm.objects.get(pk=later.pk)
+        self.assertEqual(dispatch_alarms(now=later.due_at), 1)
+        stale.trigger = 3
+        stale.save()
+        self.assertEqual(dispatch_alarms(now=later.due_at), 0)
+
+    def test_reminders_are_recorded_as_sent_before_they_are_sent(self):
+        alarm = self.create_alarm(trigger=24)
+
+        with (
+            patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=SMTPException),
+            self.assertRaises(SMTPException),
+        ):
+            dispatch_alarms(now=self.now)
+
+        alarm.refresh_from_db()
+        self.assertEqual(alarm.sent_for, self.rule.begin)
+        self.assertEqual(dispatch_alarms(now=self.now), 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_reminders_are_batched_over_one_connection(self):
+        for _ in range(5):
+            self.create_alarm()
+        nobody = get_user_model().objects.create_user(username="nobody", password="password", email="")
+        self.create_alarm(user=nobody)
+
+        with patch("apps.events.alarms.get_connection", wraps=dispatch_alarms.__globals__["get_connection"]) as conn:
+            self.assertEqual(dispatch_alarms(now=self.now, batch_size=2), 5)
+
+        conn.assert_called_once_with()
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(Alarm.objects.filter(due_at__lte=self.now).exists())
+
+    def test_reminders_of_started_occurrences_are_skipped(self):
+        alarm = self.create_alarm(trigger=2)
+        self.assertEqual(dispatch_alarms_task(), 0)
+        after_start = self.rule.begin + datetime.timedelta(minutes=1)
+
+        self.assertEqual(dispatch_alarms(now=after_start), 0)
+
+        self.assertEqual(mail.outbox, [])
+        alarm.refresh_from_db()
+        self.assertIsNone(alarm.sent_for)
+        self.assertEqual(alarm.occurrence_start, self.rule.begin + datetime.timedelta(days=1))
@@ -0,0 +1,163 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from icalendar import Calendar as ICalendar
+
+from apps.events.export import ics_surrogate_key
+from apps.events.models import Calendar, Event, EventCategory, EventLocation, OccurringRule, RecurringRule
+
+
+class ICSFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now().replace(microsecond=0)
+        cls.calendar = Calendar.objects.create(name="Python Events", slug="python-events")
+        cls.category = EventCategory.objects.create(name="Sprints", slug="sprints", calendar=cls.calendar)
+        cls.location = EventLocation.objects.create(name="PyCon", address="Pittsburgh", calendar=cls.calendar)
+
+        cls.sprint = Event.objects.create(
+            title="Sprint",
+            calendar=cls.calendar,
+            venue=cls.location,
+            description="<b>Hack</b> &amp; away",
+            description_markup_type="html",
+        )
+        cls.sprint.categories.add(cls.category)
+        OccurringRule.objects.create(
+            event=cls.sprint,
+            dt_start=cls.now + datetime.timedelta(days=10),
+            dt_end=cls.now + datetime.timedelta(days=11),
+            all_day=True,
+        )
+        cls.meetup = Event.objects.create(title="Meetup", calendar=cls.calendar)
+        cls.rule = RecurringRule.objects.create(
+            event=cls.meetup,
+            begin=cls.now - datetime.timedelta(days=7),
+            finish=cls.now + datetime.timedelta(days=70),
+            interval=2,
+            duration="2 hours",
+        )
+        cls.old = Event.objects.create(title="Old", calendar=cls.calendar)
+        OccurringRule.objects.create(
+            event=cls.old,
+            dt_start=cls.now - datetime.timedelta(days=400),
+            dt_end=cls.now - datetime.timedelta(days=399),
+        )
+        cls.url = reverse("events:calendar_ics", kwargs={"calendar_slug": cls.calendar.slug})
+
+    def get_events(self, response):
+        return {
+            str(component["summary"]): component for component in ICalendar.from_ical(response.content).walk("VEVENT")
+        }
+
+    def test_calendar_feed(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertIn(ics_surrogate_key(self.calendar.pk), response["Surrogate-Key"].split())
+        self.assertTrue(response["Cache-Control"].startswith("public, max-age="))
+        self.assertTrue(response["Surrogate-Control"].startswith("max-age="))
+        events = self.get_events(response)
+        self.assertCountEqual(events, ["Sprint", "Meetup"])
+
+        sprint = events["Sprint"]
+        self.assertEqual(sprint["dtstart"].dt, self.sprint.occurring_rule.dt_start.date())
+        self.assertEqual(sprint["dtend"].dt, self.sprint.occurring_rule.dt_end.date() + datetime.timedelta(days=1))
+        self.assertEqual(str(sprint["description"]), "Hack & away")
+        self.assertEqual(str(sprint["location"]), "PyCon, Pittsburgh")
+        self.assertEqual(sprint["categories"].to_ical(), b"Sprints")
+        self.assertEqual(str(sprint["url"]), f"http://testserver{self.sprint.get_absolute_url()}")
+
+        meetup = events["Meetup"]
+        self.assertEqual(meetup["dtstart"].dt, self.rule.begin)
+        self.assertEqual(meetup["dtend"].dt - meetup["dtstart"].dt, datetime.timedelta(hours=2))
+        self.assertEqual(meetup["rrule"]["FREQ"], ["WEEKLY"])
+        self.assertEqual(meetup["rrule"]["INTERVAL"], [2])
+        self.assertEqual(meetup["uid"], f"event-{self.meetup.pk}-rule-{self.rule.pk}@python.org")
+
+    def test_all_day_recurring_rules_end_on_a_date(self):
+        rule = RecurringRule.objects.create(
+            event=self.meetup,
+            begin=self.now + datetime.timedelta(days=1),
+            finish=self.now + datetime.timedelta(days=60),
+            duration="1 day",
+            all_day=True,
+        )
+
+        content = self.client.get(self.url).content
+        component = next(
+            component
+            for component in ICalendar.from_ical(content).walk("VEVENT")
+            if component["uid"] == f"event-{self.meetup.pk}-rule-{rule.pk}@python.org"
+        )
+
+        self.assertEqual(component["dtstart"].dt, rule.begin.date())
+        self.assertEqual(component["rrule"]["UNTIL"], [rule.finish.date()])
+        self.assertIn(f"UNTIL={rule.finish:%Y%m%d};".encode(), content.replace(b"\r\n ", b""))
+
+    def test_feed_is_cached_and_revalidated_with_its_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual([query["sql"] for query in queries if '"events_event"' in query["sql"]], [])
+
+    def test_changes_invalidate_the_feed(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meetup.title = "Meetup night"
+            self.meetup.save()
+            # The feed is only invalidated once the change is committed.
+            self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 304)
+
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Meetup night", self.get_events(response))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule.interval = 1
+            self.rule.save()
+        self.assertEqual(self.get_events(self.client.get(self.url))["Meetup night"]["rrule"]["INTERVAL"], [1])
+
+    def test_moving_an_event_invalidates_both_calendars(self):
+        other = Calendar.objects.create(name="Other Events", slug="other-events")
+        other_url = reverse("events:calendar_ics", kwargs={"calendar_slug": other.slug})
+        etags = [self.client.get(url)["ETag"] for url in (self.url, other_url)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.get(pk=self.meetup.pk)
+            event.calendar = other
+            event.save()
+
+        self.assertNotIn("Meetup", self.get_events(self.client.get(self.url)))
+        self.assertIn("Meetup", self.get_events(self.client.get(other_url)))
+        for url, etag in zip((self.url, other_url), etags, strict=True):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+    def test_category_and_location_feeds(self):
+        for url in (
+            reverse("events:eventcategory_ics", kwargs={"calendar_slug": self.calendar.slug, "slug": "sprints"}),
+            reverse("events:eventlocation_ics", kwargs={"calendar_slug": self.calendar.slug, "pk": self.location.pk}),
+        ):
+            with self.subTest(url=url):
+                self.assertCountEqual(self.get_events(self.client.get(url)), ["Sprint"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sprint.categories.clear()
+        url = reverse("events:eventcategory_ics", kwargs={"calendar_slug": self.calendar.slug, "slug": "sprints"})
+        self.assertEqual(self.get_events(self.client.get(url)), {})
+
+        response = self.client.get(
+            reverse("events:eventcategory_ics", kwargs={"calendar_slug": self.calendar.slug, "slug": "missing"})
+        )
+        self.assertEqual(response.status_code, 404)
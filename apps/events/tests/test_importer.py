@@ -1,11 +1,17 @@
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
 
+from django.core.management import call_command
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import datetime, make_aware
 
-from apps.events.importer import ICSImporter
-from apps.events.models import Calendar, Event
+from apps.events.importer import ICSImporter, import_calendars
+from apps.events.models import Calendar, Event, EventLocation
+from apps.events.testing import FEED_LAST_MODIFIED, FakeICSServer
 
 CUR_DIR = Path(__file__).parent
 EVENTS_CALENDAR = str(CUR_DIR / "events.ics")
@@ -175,3 +181,210 @@ END:VCALENDAR
         event_page = response.content.decode()
         self.assertIn("&lt;javascript:alert(1)&gt;", event_page)
         self.assertNotIn("<javascript:alert(1)>", event_page)
+
+
+FEED = """BEGIN:VCALENDAR
+BEGIN:VEVENT
+DTSTART:20300802T200000Z
+DTEND:20300802T203000Z
+UID:{uid}@python.org
+SUMMARY:{summary}
+LOCATION:Online
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class ICSFetchTests(TestCase):
+    def setUp(self):
+        self.server = FakeICSServer(
+            {
+                "/python.ics": FEED.format(uid="python", summary="Python meetup"),
+                "/django.ics": FEED.format(uid="django", summary="Django meetup"),
+            }
+        )
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.calendar = Calendar.objects.create(url=self.server.url("/python.ics"), slug="python")
+
+    def test_unchanged_feed_is_not_downloaded_or_parsed_again(self):
+        fetched = self.calendar.import_events()
+
+        self.assertEqual(fetched.status, 200)
+        self.assertEqual(Event.objects.get(uid="python@python.org").title, "Python meetup")
+        self.calendar.refresh_from_db()
+        self.assertTrue(self.calendar.etag)
+        self.assertEqual(self.calendar.last_modified, FEED_LAST_MODIFIED)
+        self.assertEqual(self.calendar.last_fetch_bytes, len(self.server.feeds["/python.ics"]))
+        self.assertIsNotNone(self.calendar.last_fetch_duration)
+        self.assertIsNotNone(self.calendar.last_fetched)
+
+        with patch.object(ICSImporter, "import_events_from_text") as import_events_from_text:
+            fetched = self.calendar.import_events()
+
+        import_events_from_text.assert_not_called()
+        self.assertTrue(fetched.not_modified)
+        headers = self.server.requests[-1][1]
+        self.assertEqual(headers["If-None-Match"], self.calendar.etag)
+        self.assertEqual(headers["If-Modified-Since"], FEED_LAST_MODIFIED)
+        self.calendar.refresh_from_db()
+        self.assertEqual(self.calendar.last_fetch_bytes, 0)
+
+        self.server.feeds["/python.ics"] = FEED.format(uid="python", summary="Python sprint").encode()
+        self.assertEqual(self.calendar.import_events().status, 200)
+        self.assertEqual(Event.objects.get(uid="python@python.org").title, "Python sprint")
+
+    def test_other_urls_are_fetched_unconditionally(self):
+        self.calendar.import_events()
+        ICSImporter(self.calendar).import_events(self.server.url("/python.ics"))
+
+        self.assertNotIn("If-None-Match", self.server.requests[-1][1])
+
+    def test_calendars_are_imported_concurrently_skipping_failures(self):
+        django = Calendar.objects.create(url=self.server.url("/django.ics"), slug="django")
+        missing = Calendar.objects.create(url=self.server.url("/missing.ics"), slug="missing")
+
+        with patch("apps.events.importer.logger") as logger:
+            fetches = import_calendars(Calendar.objects.all(), workers=3)
+
+        self.assertCountEqual(fetches, [self.calendar, django])
+        logger.exception.assert_called_once_with("Could not import calendar %s", missing)
+        self.assertEqual(Event.objects.filter(calendar=django).get().title, "Django meetup")
+        missing.refresh_from_db()
+        self.assertIsNone(missing.last_fetched)
+
+    def test_database_errors_skip_only_their_calendar(self):
+        django = Calendar.objects.create(url=self.server.url("/django.ics"), slug="django")
+        import_events_from_text = ICSImporter.import_events_from_text
+
+        def import_or_fail(importer, ical):
+            if importer.calendar == self.calendar:
+                raise IntegrityError
+            return import_events_from_text(importer, ical)
+
+        with (
+            patch.object(ICSImporter, "import_events_from_text", import_or_fail),
+            patch("apps.events.importer.logger") as logger,
+        ):
+            fetches = import_calendars(Calendar.objects.all(), workers=2)
+
+        self.assertCountEqual(fetches, [django])
+        logger.exception.assert_called_once_with("Could not import calendar %s", self.calendar)
+        self.assertEqual(Event.objects.filter(calendar=django).get().title, "Django meetup")
+        self.calendar.refresh_from_db()
+        self.assertIsNone(self.calendar.last_fetched)
+
+    def test_command_reports_each_calendar(self):
+        out = StringIO()
+        call_command("import_ics_calendars", stdout=out)
+        call_command("import_ics_calendars", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertRegex(lines[0], r"^python: \d+ bytes \(1 created, 0 updated, 0 unchanged, 0 deleted, 0 failed\) in ")
+        self.assertRegex(lines[1], r"^python: unchanged in ")
+
+
+BULK_FEED = """BEGIN:VCALENDAR
+{events}END:VCALENDAR
+"""
+BULK_EVENT = """BEGIN:VEVENT
+DTSTART:20300802T200000Z
+DTEND:20300802T203000Z
+DTSTAMP:{stamp}
+UID:{uid}@python.org
+SUMMARY:{summary}
+DESCRIPTION:About {summary}
+LOCATION:{location}
+END:VEVENT
+"""
+
+
+def bulk_feed(*events, stamp="20300101T000000Z"):
+    """Return a feed of the ``(uid, summary, location)`` events."""
+    return BULK_FEED.format(
+        events="".join(
+            BULK_EVENT.format(uid=uid, summary=summary, location=location, stamp=stamp)
+            for uid, summary, location in events
+        )
+    )
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.calendar = Calendar.objects.create(url=EVENTS_CALENDAR_URL, slug="python-events")
+        self.importer = ICSImporter(self.calendar)
+        self.events = [(f"event-{i}", f"Meetup {i}", f"Room {i % 2}") for i in range(5)]
+
+    def test_import_creates_events_in_bulk(self):
+        with CaptureQueriesContext(connection) as queries:
+            counts = self.importer.import_events_from_text(bulk_feed(*self.events))
+
+        self.assertEqual(len([query for query in queries if '"events_' in query["sql"]]), 12)
+
+        self.assertEqual(counts, {"created": 5, "updated": 0, "unchanged": 0, "deleted": 0, "failed": 0})
+        self.assertEqual(Event.objects.filter(calendar=self.calendar).count(), 5)
+        self.assertEqual(EventLocation.objects.filter(calendar=self.calendar).count(), 2)
+        event = Event.objects.get(uid="event-3@python.org")
+        self.assertEqual(event.title, "Meetup 3")
+        self.assertEqual(event.venue.name, "Room 1")
+        self.assertEqual(event.description.rendered, "About Meetup 3")
+        self.assertEqual(event.next_start, make_aware(datetime(2030, 8, 2, 20)))
+        self.assertEqual(event.occurrences.get().dt_end, make_aware(datetime(2030, 8, 2, 20, 30)))
+
+    def test_unchanged_events_are_not_written(self):
+        self.importer.import_events_from_text(bulk_feed(*self.events))
+
+        # Only the existing events are loaded; DTSTAMP changes on every download.
+        with CaptureQueriesContext(connection) as queries:
+            counts = self.importer.import_events_from_text(bulk_feed(*self.events, stamp="20300102T000000Z"))
+
+        self.assertEqual(len([query for query in queries if '"events_' in query["sql"]]), 1)
+
+        self.assertEqual(counts, {"created": 0, "updated": 0, "unchanged": 5, "deleted": 0, "failed": 0})
+
+    def test_changed_events_are_updated_and_missing_ones_deleted(self):
+        self.importer.import_events_from_text(bulk_feed(*self.events))
+        pk = Event.objects.get(uid="event-1@python.org").pk
+        events = [("event-1", "Sprint", "Room 2"), *self.events[2:], ("event-5", "Meetup 5", "Room 0")]
+
+        counts = self.importer.import_events_from_text(bulk_feed(*events))
+
+        self.assertEqual(counts, {"created": 1, "updated": 1, "unchanged": 3, "deleted": 1, "failed": 0})
+        event = Event.objects.get(uid="event-1@python.org")
+        self.assertEqual(event.pk, pk)
+        self.assertEqual(event.title, "Sprint")
+        self.assertEqual(event.venue.name, "Room 2")
+        self.assertEqual(event.description.rendered, "About Sprint")
+        self.assertFalse(Event.objects.filter(uid="event-0@python.org").exists())
+        self.assertEqual(Event.objects.filter(calendar=self.calendar).count(), 5)
+
+    def test_broken_events_are_counted_and_do_not_delete_the_calendar(self):
+        self.importer.import_events_from_text(bulk_feed(*self.events))
+        broken = BULK_FEED.format(events=BULK_EVENT.replace("LOCATION:{location}\n", ""))
+
+        with patch("apps.events.importer.logger"):
+            counts = self.importer.import_events_from_text(broken.format(uid="x", summary="x", stamp=""))
+
+        self.assertEqual(counts, {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0, "failed": 1})
+        self.assertEqual(Event.objects.filter(calendar=self.calendar).count(), 5)
+
+    def test_events_moved_from_another_calendar_invalidate_its_feeds(self):
+        self.importer.import_events_from_text(bulk_feed(*self.events[:2]))
+        other = Calendar.objects.create(url=EVENTS_CALENDAR_URL, slug="other-events")
+
+        with patch("apps.events.importer.invalidate_ics_feeds") as invalidate:
+            ICSImporter(other).import_events_from_text(bulk_feed(*self.events[:1]))
+
+        self.assertEqual(Event.objects.get(uid="event-0@python.org").calendar, other)
+        self.assertCountEqual(invalidate.call_args.args[0], [other.pk, self.calendar.pk])
+
+    def test_events_failing_to_parse_are_not_deleted(self):
+        self.importer.import_events_from_text(bulk_feed(*self.events))
+        broken = BULK_EVENT.replace("LOCATION:{location}\n", "").format(uid="event-0", summary="x", stamp="")
+        feed = bulk_feed(*self.events[1:]).replace("END:VCALENDAR", f"{broken}END:VCALENDAR")
+
+        with patch("apps.events.importer.logger"):
+            counts = self.importer.import_events_from_text(feed)
+
+        self.assertEqual(counts, {"created": 0, "updated": 0, "unchanged": 4, "deleted": 0, "failed": 1})
+        self.assertEqual(Event.objects.get(uid="event-0@python.org").title, "Meetup 0")
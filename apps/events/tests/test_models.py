@@ -4,10 +4,11 @@ from unittest.mock import patch
 
 from dateutil.rrule import WEEKLY, rrule
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
-from apps.events.models import Calendar, Event, OccurringRule, RecurringRule
+from apps.events.models import Calendar, Event, EventOccurrence, OccurringRule, RecurringRule
+from apps.events.tasks import update_event_occurrences_task, update_event_times_task
 from apps.events.utils import convert_dt_to_aware, seconds_resolution
 
 
@@ -190,6 +191,7 @@ class EventsModelsTests(TestCase):
         with (
             patch("django.utils.timezone", new=test_datetime) as mock_timezone,
             patch("apps.events.models.timezone", new=test_datetime),
+            patch("apps.events.utils.timezone", new=test_datetime),
         ):
             now = seconds_resolution(mock_timezone.now())
 
@@ -220,6 +222,7 @@ class EventsModelsTests(TestCase):
         with (
             patch("django.utils.timezone", new=test_datetime) as mock_timezone,
             patch("apps.events.models.timezone", new=test_datetime),
+            patch("apps.events.utils.timezone", new=test_datetime),
         ):
             now = seconds_resolution(mock_timezone.now())
             occurring_time_dtstart = now + datetime.timedelta(days=1)
@@ -235,3 +238,145 @@ class EventsModelsTests(TestCase):
             OccurringRule.objects.create(event=self.event, dt_start=now, dt_end=now + datetime.timedelta(days=365))
 
             self.assertFalse(self.event.is_scheduled_to_end_this_year())
+
+    @override_settings(EVENT_OCCURRENCE_HORIZON_DAYS=30)
+    def test_recurring_occurrences_are_expanded_over_the_horizon(self):
+        now = seconds_resolution(timezone.now())
+        with patch("apps.events.models.compile_recurrence") as compile_recurrence:
+            rule = RecurringRule.objects.create(
+                event=self.event,
+                begin=now - datetime.timedelta(weeks=10, hours=1),
+                finish=now + datetime.timedelta(weeks=10),
+                duration="1 hour",
+            )
+        # The horizon lies outside of the compiled recurrences' window.
+        compile_recurrence.assert_not_called()
+
+        starts = list(self.event.occurrences.values_list("dt_start", flat=True))
+        expected = list(rule.to_rrule().between(now - datetime.timedelta(days=30), now + datetime.timedelta(days=30)))
+        self.assertEqual(starts[1:-1], expected)
+        # The closest occurrences outside the horizon are kept as well.
+        self.assertEqual(starts[0], rule.to_rrule().before(now - datetime.timedelta(days=30)))
+        self.assertEqual(starts[-1], rule.to_rrule().after(now + datetime.timedelta(days=30)))
+
+        self.assertEqual(self.event.next_time.dt_start, rule.to_rrule().after(now))
+        self.assertEqual(self.event.previous_time.dt_start, rule.to_rrule().before(now))
+        self.assertEqual(self.event.next_time.duration, datetime.timedelta(hours=1))
+
+    def test_occurrences_follow_rule_changes(self):
+        now = seconds_resolution(timezone.now())
+        rule = OccurringRule.objects.create(
+            event=self.event,
+            dt_start=now - datetime.timedelta(hours=1),
+            dt_end=now + datetime.timedelta(hours=1),
+        )
+        self.assertEqual(self.event.current_time.dt_start, rule.dt_start)
+        self.assertEqual(list(Event.objects.happening()), [self.event])
+        self.assertEqual(self.event.next_or_previous_time.dt_start, rule.dt_start)
+
+        rule.delete()
+        self.assertFalse(self.event.occurrences.exists())
+        self.assertIsNone(self.event.current_time)
+
+        RecurringRule.objects.create(event=self.event, begin=now + datetime.timedelta(days=1), finish=now)
+        self.assertFalse(EventOccurrence.objects.exists())
+
+    def test_deleting_an_event_deletes_its_occurrences(self):
+        now = timezone.now()
+        OccurringRule.objects.create(event=self.event, dt_start=now, dt_end=now)
+        RecurringRule.objects.create(event=self.event, begin=now, finish=now + datetime.timedelta(weeks=4))
+
+        self.event.delete()
+
+        self.assertFalse(EventOccurrence.objects.exists())
+
+    def test_task_rolls_running_and_unexpanded_events_forward(self):
+        now = timezone.now()
+        RecurringRule.objects.create(event=self.event, begin=now, finish=now + datetime.timedelta(weeks=4))
+        finished = Event.objects.create(title="finished", creator=self.user, calendar=self.calendar)
+        RecurringRule.objects.create(
+            event=finished, begin=now - datetime.timedelta(days=800), finish=now - datetime.timedelta(days=790)
+        )
+        unexpanded = Event.objects.create(title="unexpanded", creator=self.user, calendar=self.calendar)
+        OccurringRule.objects.create(event=unexpanded, dt_start=now, dt_end=now)
+        EventOccurrence.objects.filter(event__in=[self.event, unexpanded]).delete()
+
+        self.assertCountEqual(Event.objects.with_outdated_occurrences(), [self.event, unexpanded])
+        update_event_occurrences_task()
+
+        self.assertEqual(self.event.occurrences.count(), 5)
+        self.assertEqual(unexpanded.occurrences.count(), 1)
+        # Running events keep being rolled forward.
+        self.assertEqual(list(Event.objects.with_outdated_occurrences()), [self.event])
+
+    def test_event_times_follow_rule_changes(self):
+        now = seconds_resolution(timezone.now())
+        rule = RecurringRule.objects.create(
+            event=self.event,
+            begin=now - datetime.timedelta(weeks=1, hours=1),
+            finish=now + datetime.timedelta(weeks=2),
+            duration="30 min",
+        )
+        next_start = rule.begin + datetime.timedelta(weeks=2)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.next_start, next_start)
+        self.assertEqual(self.event.last_end, rule.begin + datetime.timedelta(weeks=1, minutes=30))
+
+        # Saving a copy loaded before the rule existed keeps the derived times.
+        stale = Event.objects.get(pk=self.event.pk)
+        stale.next_start = stale.last_end = None
+        stale.title = "renamed"
+        stale.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "renamed")
+        self.assertEqual(self.event.next_start, next_start)
+
+        rule.delete()
+        self.event.refresh_from_db()
+        self.assertIsNone(self.event.next_start)
+        self.assertIsNone(self.event.last_end)
+
+    def test_loaded_events_can_be_copied(self):
+        copy = Event.objects.get(pk=self.event.pk)
+        copy.pk = None
+        copy.save()
+        forced = Event.objects.get(pk=self.event.pk)
+        forced.pk = copy.pk + 1
+        forced.save(force_insert=True)
+
+        self.assertEqual(Event.objects.filter(title=self.event.title).count(), 3)
+
+    def test_upcoming_and_past_events_use_the_event_times(self):
+        now = timezone.now()
+        for weeks in (1, 2):
+            RecurringRule.objects.create(
+                event=self.event,
+                begin=now - datetime.timedelta(weeks=weeks, hours=1),
+                finish=now + datetime.timedelta(weeks=4),
+            )
+
+        self.assertEqual(list(Event.objects.for_datetime()), [self.event])
+        self.assertEqual(list(Event.objects.until_datetime()), [self.event])
+        sql = str(Event.objects.upcoming()[:5].query)
+        self.assertNotIn("events_recurringrule", sql)
+        self.assertIn("LIMIT 5", sql)
+
+    def test_times_task_moves_past_started_and_ended_occurrences(self):
+        now = timezone.now()
+        OccurringRule.objects.create(
+            event=self.event, dt_start=now + datetime.timedelta(hours=1), dt_end=now + datetime.timedelta(hours=2)
+        )
+        self.assertEqual(list(Event.objects.upcoming()), [self.event])
+
+        # Time passes: the occurrence is over by the next run.
+        EventOccurrence.objects.filter(event=self.event).update(
+            dt_start=now - datetime.timedelta(minutes=3), dt_end=now - datetime.timedelta(minutes=2)
+        )
+        Event.objects.filter(pk=self.event.pk).update(next_start=now - datetime.timedelta(minutes=3))
+        update_event_times_task()
+
+        self.event.refresh_from_db()
+        self.assertIsNone(self.event.next_start)
+        self.assertEqual(self.event.last_end, now - datetime.timedelta(minutes=2))
+        self.assertEqual(list(Event.objects.past()), [self.event])
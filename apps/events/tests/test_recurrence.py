@@ -0,0 +1,69 @@
+import datetime
+from unittest.mock import patch
+
+from dateutil.rrule import DAILY, WEEKLY, rrule
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.events.models import Calendar, Event, RecurringRule
+from apps.events.recurrence import RECURRENCE_WINDOW, compile_recurrence
+from apps.events.utils import request_clock, request_now, seconds_resolution
+
+
+class CompiledRecurrenceTests(TestCase):
+    def setUp(self):
+        self.now = seconds_resolution(timezone.now())
+        self.begin = self.now - datetime.timedelta(days=400, hours=1)
+        self.finish = self.now + datetime.timedelta(days=400)
+        self.rrule = rrule(DAILY, interval=3, dtstart=self.begin, until=self.finish)
+        self.recurrence = compile_recurrence(DAILY, 3, self.begin, self.finish, self.now)
+
+    def test_lookups_match_the_rrule_inside_and_outside_the_window(self):
+        for days in (-500, -200, -RECURRENCE_WINDOW.days, -1, 0, 2, RECURRENCE_WINDOW.days, 200, 500):
+            dt = self.now + datetime.timedelta(days=days)
+            with self.subTest(days=days):
+                self.assertEqual(self.recurrence.after(dt), self.rrule.after(dt))
+                self.assertEqual(self.recurrence.before(dt), self.rrule.before(dt))
+        for days_since, days_until in ((-10, 10), (-200, -100), (-50, 150)):
+            since = self.now + datetime.timedelta(days=days_since)
+            until = self.now + datetime.timedelta(days=days_until)
+            with self.subTest(since=since, until=until):
+                self.assertEqual(self.recurrence.between(since, until), self.rrule.between(since, until, inc=True))
+
+    def test_rules_with_the_same_fields_share_the_compiled_recurrence(self):
+        later = self.now.replace(hour=23, minute=59)
+        self.assertIs(compile_recurrence(DAILY, 3, self.begin, self.finish, later), self.recurrence)
+        tomorrow = later + datetime.timedelta(minutes=1)
+        self.assertIsNot(compile_recurrence(DAILY, 3, self.begin, self.finish, tomorrow), self.recurrence)
+        self.assertIsNot(compile_recurrence(DAILY, 2, self.begin, self.finish, self.now), self.recurrence)
+
+    def test_rule_properties_do_not_expand_the_rrule_again(self):
+        user = get_user_model().objects.create_user(username="username", password="password")
+        calendar = Calendar.objects.create(creator=user, slug="test-calendar")
+        event = Event.objects.create(title="event", creator=user, calendar=calendar)
+        rule = RecurringRule.objects.create(
+            event=event, begin=self.begin, finish=self.finish, frequency=WEEKLY, duration="2 hours"
+        )
+
+        with request_clock(self.now):
+            rule.compiled_recurrence()
+            with patch("apps.events.recurrence.rrule") as compile_rrule:
+                rules = [RecurringRule.objects.get(pk=rule.pk) for _ in range(10)]
+                starts = {(r.dt_start, r.dt_end, r.single_day, str(r)) for r in rules}
+
+        compile_rrule.assert_not_called()
+        self.assertEqual(len(starts), 1)
+        self.assertEqual(rules[0].dt_start, rrule(WEEKLY, dtstart=self.begin, until=self.finish).after(self.now))
+
+
+class RequestClockTests(TestCase):
+    def test_clock_is_read_once_per_request(self):
+        self.assertNotEqual(request_now(), request_now())
+        with request_clock():
+            self.assertEqual(request_now(), request_now())
+
+        with patch("apps.events.middleware.request_clock", wraps=request_clock) as clock:
+            self.client.get(reverse("events:events"))
+        clock.assert_called_once_with()
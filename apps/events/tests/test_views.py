@@ -2,7 +2,9 @@ import datetime
 
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 
@@ -57,6 +59,7 @@ class EventsViewsTests(TestCase):
             event=cls.current_event,
             begin=cls.now - datetime.timedelta(hours=1),
             finish=cls.now + datetime.timedelta(hours=1),
+            duration="2 hours",
         )
 
         # Just missed event
@@ -117,7 +120,7 @@ class EventsViewsTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.context["object_list"]), 6)
+        self.assertEqual(len(response.context["object_list"]), 5)
         self.assertIn("upcoming_events", response.context)
         self.assertEqual(list(response.context["upcoming_events"]), list(response.context["object_list"]))
 
@@ -131,7 +134,7 @@ class EventsViewsTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.context["object_list"]), 4)
+        self.assertEqual(len(response.context["object_list"]), 3)
 
     def test_event_list_category(self):
         category = EventCategory.objects.create(name="Sprints", slug="sprints", calendar=self.calendar)
@@ -209,7 +212,7 @@ class EventsViewsTests(TestCase):
         self.rule.begin = self.now - datetime.timedelta(days=3)
         self.rule.finish = self.now - datetime.timedelta(days=2)
         self.rule.save()
-        self.assertEqual(len(get_events_upcoming()), 5)
+        self.assertEqual(len(get_events_upcoming()), 4)
 
     def test_event_starting_future_year_displays_relevant_year(self):
         event = self.event_starts_at_future_year
@@ -225,6 +228,31 @@ class EventsViewsTests(TestCase):
         self.assertIn("upcoming_events", response.context)
         self.assertIn("events_now", response.context)
 
+        self.assertEqual(list(response.context["events_now"]), [self.current_event])
+        self.assertEqual(list(response.context["events_just_missed"]), [self.just_missed_event, self.past_event])
+        upcoming = list(response.context["upcoming_events"])
+        self.assertEqual(upcoming[:2], [self.future_event, self.event])
+        self.assertEqual(upcoming[-1], self.event_starts_at_future_year)
+
+    def test_homepage_queries_do_not_grow_with_events(self):
+        url = reverse("events:events")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        for days in range(10, 15):
+            event = Event.objects.create(title=f"Meetup {days}", creator=self.user, calendar=self.calendar)
+            RecurringRule.objects.create(
+                event=event,
+                begin=self.now + datetime.timedelta(days=days),
+                finish=self.now + datetime.timedelta(days=days + 30),
+            )
+        with CaptureQueriesContext(connection) as more_queries:
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.context["upcoming_events"]), 10)
+        event_queries = [query for query in queries if '"events_' in query["sql"]]
+        more_event_queries = [query for query in more_queries if '"events_' in query["sql"]]
+        self.assertEqual(len(more_event_queries), len(event_queries))
+
     def test_event_ending_future_year_displays_relevant_year(self):
         event = self.event_ends_at_future_year
         url = reverse("events:events")
@@ -1,10 +1,36 @@
 """Utility functions for date/time handling and formatting in events."""
 
+import contextlib
 import datetime
 import re
+from contextvars import ContextVar
 
+from django.utils import timezone
 from django.utils.timezone import is_aware, make_aware
 
+# The time the request being handled started, see ``request_clock``.
+_request_now = ContextVar("request_now", default=None)
+
+
+def request_now():
+    """Return the time the current request started, or the current time outside of a request.
+
+    Everything rendered for one request then agrees on what "now" is, and the
+    clock is read once.
+    """
+    now = _request_now.get()
+    return timezone.now() if now is None else now
+
+
+@contextlib.contextmanager
+def request_clock(now=None):
+    """Make ``request_now`` return ``now``, by default the current time, within the block."""
+    token = _request_now.set(timezone.now() if now is None else now)
+    try:
+        yield
+    finally:
+        _request_now.reset(token)
+
 
 def seconds_resolution(dt):
     """Truncate a datetime to second precision by removing microseconds."""
@@ -3,15 +3,21 @@
 import contextlib
 import datetime
 
+from django.conf import settings
 from django.contrib import messages
 from django.core.mail import BadHeaderError
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
-from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import View
 from django.views.generic import DetailView, FormView, ListView
 
+from apps.events.export import get_ics_feed, ics_surrogate_key
 from apps.events.forms import EventForm
 from apps.events.models import Calendar, Event, EventCategory, EventLocation
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
 from pydotorg.mixins import LoginRequiredMixin
 
 
@@ -34,6 +40,7 @@ class EventListBase(ListView):
     def get_context_data(self, **kwargs):
         """Add featured event, categories, and locations to context."""
         context = super().get_context_data(**kwargs)
+        tag_surrogate_keys(surrogate_list_key(Event))
         featured_events = self.get_queryset().filter(featured=True)
         with contextlib.suppress(IndexError):
             context["featured"] = featured_events[0]
@@ -48,6 +55,7 @@ class EventHomepage(ListView):
     """Main Event Landing Page."""
 
     template_name = "events/event_list.html"
+    upcoming_events_limit = 50
 
     def get_queryset(self) -> Event:
         """Queryset to return all events, ordered by START date."""
@@ -56,21 +64,11 @@ class EventHomepage(ListView):
     def get_context_data(self, **kwargs: dict) -> dict:
         """Add more ctx, specifically events that are happening now, just missed, and upcoming."""
         context = super().get_context_data(**kwargs)
+        tag_surrogate_keys(surrogate_list_key(Event))
 
-        # past events, most recent first
-        past_events = list(Event.objects.until_datetime(timezone.now()))
-        past_events.sort(key=lambda e: e.previous_time.dt_start if e.previous_time else timezone.now(), reverse=True)
-        context["events_just_missed"] = past_events[:2]
-
-        # upcoming events, soonest first
-        upcoming = list(Event.objects.for_datetime(timezone.now()))
-        upcoming.sort(key=lambda e: e.next_time.dt_start if e.next_time else timezone.now())
-        context["upcoming_events"] = upcoming
-
-        # right now, soonest first
-        context["events_now"] = Event.objects.filter(
-            occurring_rule__dt_start__lte=timezone.now(), occurring_rule__dt_end__gte=timezone.now()
-        ).order_by("occurring_rule__dt_start")[:2]
+        context["events_just_missed"] = Event.objects.past()[:2]
+        context["upcoming_events"] = Event.objects.upcoming()[: self.upcoming_events_limit]
+        context["events_now"] = Event.objects.happening()[:2]
         return context
 
 
@@ -86,6 +84,7 @@ class EventDetail(DetailView):
     def get_context_data(self, **kwargs):
         """Add 7/30/90/365-day date windows for the next occurrence."""
         data = super().get_context_data(**kwargs)
+        tag_surrogate_keys(data["object"])
         if data["object"].next_time:
             dt = data["object"].next_time.dt_start
             data.update(
@@ -104,22 +103,13 @@ class EventList(EventListBase):
 
     def get_queryset(self):
         """Return upcoming events for the calendar specified in the URL."""
-        return (
-            Event.objects.for_datetime(timezone.now())
-            .filter(calendar__slug=self.kwargs["calendar_slug"])
-            .order_by("occurring_rule__dt_start")
-        )
+        return Event.objects.upcoming().filter(calendar__slug=self.kwargs["calendar_slug"])
 
     def get_context_data(self, **kwargs):
         """Add today's events and calendar object to context."""
         context = super().get_context_data(**kwargs)
 
-        # today's events, most recent first
-        today_events = list(
-            Event.objects.until_datetime(timezone.now()).filter(calendar__slug=self.kwargs["calendar_slug"])
-        )
-        today_events.sort(key=lambda e: e.previous_time.dt_start if e.previous_time else timezone.now(), reverse=True)
-        context["events_today"] = today_events[:2]
+        context["events_today"] = Event.objects.past().filter(calendar__slug=self.kwargs["calendar_slug"])[:2]
         context["calendar"] = get_object_or_404(Calendar, slug=self.kwargs["calendar_slug"])
         context["upcoming_events"] = context["object_list"]
 
@@ -133,7 +123,7 @@ class PastEventList(EventList):
 
     def get_queryset(self):
         """Return past events for the calendar specified in the URL."""
-        return Event.objects.until_datetime(timezone.now()).filter(calendar__slug=self.kwargs["calendar_slug"])
+        return Event.objects.past().filter(calendar__slug=self.kwargs["calendar_slug"])
 
 
 class EventListByDate(EventList):
@@ -148,7 +138,7 @@ class EventListByDate(EventList):
 
     def get_queryset(self):
         """Return events on or after the specified date."""
-        return Event.objects.for_datetime(self.get_object()).filter(calendar__slug=self.kwargs["calendar_slug"])
+        return Event.objects.upcoming(self.get_object()).filter(calendar__slug=self.kwargs["calendar_slug"])
 
 
 class EventListByCategory(EventList):
@@ -220,3 +210,48 @@ class EventSubmit(LoginRequiredMixin, FormView):
             messages.add_message(self.request, messages.ERROR, "Invalid header found.")
             return redirect("events:event_submit")
         return super().form_valid(form)
+
+
+class CalendarICSFeed(View):
+    """Serve the iCalendar feed of a calendar's events from the cache."""
+
+    def get_feed(self, calendar):
+        """Return the scope, name and events of the feed."""
+        return "calendar", calendar.name, calendar.events.all()
+
+    def get(self, request, *args, **kwargs):
+        """Return the feed, or 304 Not Modified if the client's copy is current."""
+        calendar = get_object_or_404(Calendar, slug=self.kwargs["calendar_slug"])
+        scope, name, events = self.get_feed(calendar)
+        digest, content = get_ics_feed(calendar, scope, name, events, request.build_absolute_uri("/").rstrip("/"))
+        tag_surrogate_keys(ics_surrogate_key(calendar.pk))
+        etag = quote_etag(digest)
+        response = get_conditional_response(request, etag=etag) or HttpResponse(
+            content, content_type="text/calendar; charset=utf-8"
+        )
+        response["ETag"] = etag
+        response["Cache-Control"] = f"public, max-age={settings.EVENT_ICS_BROWSER_TTL}"
+        response["Surrogate-Control"] = f"max-age={settings.EVENT_ICS_CDN_TTL}"
+        return response
+
+
+class EventCategoryICSFeed(CalendarICSFeed):
+    """Serve the iCalendar feed of the events in a category."""
+
+    def get_feed(self, calendar):
+        """Return the scope, name and events of the category's feed."""
+        category = get_object_or_404(EventCategory, calendar=calendar, slug=self.kwargs["slug"])
+        return (
+            f"category-{category.pk}",
+            f"{calendar.name}: {category.name}",
+            calendar.events.filter(categories=category),
+        )
+
+
+class EventLocationICSFeed(CalendarICSFeed):
+    """Serve the iCalendar feed of the events at a location."""
+
+    def get_feed(self, calendar):
+        """Return the scope, name and events of the location's feed."""
+        location = get_object_or_404(EventLocation, calendar=calendar, pk=self.kwargs["pk"])
+        return f"location-{location.pk}", f"{calendar.name}: {location.name}", calendar.events.filter(venue=location)
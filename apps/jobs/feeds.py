@@ -4,6 +4,7 @@ from django.contrib.syndication.views import Feed
 from django.urls import reverse_lazy
 
 from apps.jobs.models import Job
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
 
 
 class JobFeed(Feed):
@@ -15,6 +16,7 @@ class JobFeed(Feed):
 
     def items(self):
         """Return the 20 most recent approved jobs."""
+        tag_surrogate_keys(surrogate_list_key(Job))
         return Job.objects.approved()[:20]
 
     def item_title(self, item):
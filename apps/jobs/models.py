@@ -15,7 +15,7 @@ from apps.cms.models import ContentManageable, NameSlugModel
 from apps.jobs.managers import JobCategoryQuerySet, JobQuerySet, JobTypeQuerySet
 from apps.jobs.signals import comment_was_posted, job_was_approved, job_was_rejected, job_was_submitted
 from apps.users.models import User
-from fastly.utils import purge_url
+from fastly.utils import purge_objects, surrogate_list_key
 
 DEFAULT_MARKUP_TYPE = getattr(settings, "DEFAULT_MARKUP_TYPE", "restructuredtext")
 
@@ -245,6 +245,7 @@ class JobReviewComment(ContentManageable):
 def purge_fastly_cache(sender, instance, **kwargs):
     """Purge fastly.com cache on new jobs.
 
+    Purges the job's detail page and the job listings by surrogate key.
     Requires settings.FASTLY_API_KEY being set.
     """
     # Skip in fixtures
@@ -252,6 +253,12 @@ def purge_fastly_cache(sender, instance, **kwargs):
         return
 
     if instance.status == Job.STATUS_APPROVED:
-        purge_url(reverse("jobs:job_detail", kwargs={"pk": instance.pk}))
-        purge_url(reverse("jobs:job_list"))
-        purge_url(reverse("jobs:job_rss"))
+        purge_objects(
+            instance,
+            surrogate_list_key(Job),
+            urls=[
+                reverse("jobs:job_detail", kwargs={"pk": instance.pk}),
+                reverse("jobs:job_list"),
+                reverse("jobs:job_rss"),
+            ],
+        )
@@ -8,6 +8,7 @@ from django.views.generic import CreateView, DetailView, ListView, TemplateView,
 
 from apps.jobs.forms import JobForm, JobReviewCommentForm
 from apps.jobs.models import Job, JobCategory, JobReviewComment, JobType
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
 from pydotorg.mixins import GroupRequiredMixin, LoginRequiredMixin
 
 
@@ -64,6 +65,7 @@ class JobMixin:
     def get_context_data(self, **kwargs):
         """Add job counts, active types, categories, and locations to context."""
         context = super().get_context_data(**kwargs)
+        tag_surrogate_keys(surrogate_list_key(Job))
 
         active_locations = (
             Job.objects.visible()
@@ -316,6 +318,7 @@ class JobDetail(JobMixin, DetailView):
     def get_context_data(self, **kwargs):
         """Add related category jobs and edit permission to context."""
         context = super().get_context_data(**kwargs)
+        tag_surrogate_keys(self.object)
         context["category_jobs"] = self.object.category.jobs.select_related("category")[:5]
         context["user_can_edit"] = (
             self.object.creator == self.request.user or self.has_jobs_board_admin_access()
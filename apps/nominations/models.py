@@ -13,7 +13,7 @@ from django.utils.text import slugify
 from markupfield.fields import MarkupField
 
 from apps.users.models import User
-from fastly.utils import purge_url
+from fastly.utils import queue_purge
 
 DEFAULT_ACCENT_COLOR = "#0073b7"
 
@@ -350,12 +350,14 @@ def purge_nomination_pages(sender, instance, created, **kwargs):
         return
 
     # Purge the nomination page itself
-    purge_url(instance.get_absolute_url())
+    urls = [instance.get_absolute_url()]
 
     if instance.nominee:
         # Purge the nominee page
-        purge_url(instance.nominee.get_absolute_url())
+        urls.append(instance.nominee.get_absolute_url())
 
     if instance.election:
         # Purge the election page
-        purge_url(reverse("nominations:nominees_list", kwargs={"election": instance.election.slug}))
+        urls.append(reverse("nominations:nominees_list", kwargs={"election": instance.election.slug}))
+
+    queue_purge(urls=urls)
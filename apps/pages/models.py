@@ -20,7 +20,7 @@ from markupfield.markup import DEFAULT_MARKUP_TYPES
 
 from apps.cms.models import ContentManageable
 from apps.pages.managers import PageQuerySet
-from fastly.utils import purge_url
+from fastly.utils import purge_objects
 
 DEFAULT_MARKUP_TYPE = getattr(settings, "DEFAULT_MARKUP_TYPE", "restructuredtext")
 
@@ -127,11 +127,13 @@ class Page(ContentManageable):
 def purge_fastly_cache(sender, instance, **kwargs):
     """Purge fastly.com cache if in production and the page is published.
 
-    Requires settings.FASTLY_API_KEY being set.
+    Purges every response tagged with the page's surrogate key, falling back
+    to the page's URLs. Requires settings.FASTLY_API_KEY being set.
     """
-    purge_url(f"/{instance.path}")
+    urls = [f"/{instance.path}"]
     if not instance.path.endswith("/"):
-        purge_url(f"/{instance.path}/")
+        urls.append(f"/{instance.path}/")
+    purge_objects(instance, urls=urls)
 
 
 def page_image_path(instance, filename):
@@ -8,6 +8,7 @@ from django.views.generic import DetailView
 
 from apps.downloads.models import Release
 from apps.pages.models import Page
+from fastly.utils import tag_surrogate_keys
 
 
 class PageView(DetailView):
@@ -47,6 +48,7 @@ class PageView(DetailView):
         """Add pages app flag to the template context."""
         context = super().get_context_data(**kwargs)
         context["in_pages_app"] = True
+        tag_surrogate_keys(self.object)
         return context
 
     def get(self, request, *args, **kwargs):
@@ -9,6 +9,8 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import IntegrityError, models, transaction
 from django.db.models import Subquery, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.template.defaultfilters import truncatechars
 from django.urls import reverse
 from django.utils import timezone
@@ -30,6 +32,7 @@ from apps.sponsors.models.managers import (
     SponsorshipQuerySet,
 )
 from apps.sponsors.models.sponsors import SponsorBenefit
+from fastly.utils import purge_objects, surrogate_list_key
 
 YEAR_VALIDATORS = [
     MinValueValidator(limit_value=2022, message="The min year value is 2022."),
@@ -650,3 +653,19 @@ class SponsorshipCurrentYear(models.Model):
             year = cls.objects.get().year
             cache.set(cls.CACHE_KEY, year, timeout=None)
         return year
+
+
+@receiver(post_save, sender=Sponsorship)
+@receiver(post_delete, sender=Sponsorship)
+@receiver(post_save, sender=SponsorshipPackage)
+@receiver(post_delete, sender=SponsorshipPackage)
+@receiver(post_save, sender="sponsors.Sponsor")
+@receiver(post_delete, sender="sponsors.Sponsor")
+@receiver(post_save, sender="sponsors.LogoPlacement")
+@receiver(post_delete, sender="sponsors.LogoPlacement")
+def purge_sponsor_lists(sender, instance, **kwargs):
+    """Purge the pages listing sponsor logos, tagged by the ``list_sponsors`` template tag."""
+    purge_objects(
+        surrogate_list_key(Sponsorship),
+        urls=[reverse("psf-sponsors"), reverse("download:download"), reverse("jobs:job_list")],
+    )
@@ -8,6 +8,7 @@ from django.utils.safestring import mark_safe
 
 from apps.sponsors.models import Sponsorship, SponsorshipPackage, TieredBenefitConfiguration
 from apps.sponsors.models.enums import LogoPlacementChoices, PublisherChoices
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
 
 register = template.Library()
 
@@ -41,6 +42,8 @@ def full_sponsorship(sponsorship, display_fee=False):
 @register.inclusion_tag("sponsors/partials/sponsors-list.html")
 def list_sponsors(logo_place, publisher=PublisherChoices.FOUNDATION.value):
     """Render a list of sponsors filtered by logo placement and publisher."""
+    # Tagged per list rather than per sponsor: the rendered list is fragment-cached.
+    tag_surrogate_keys(surrogate_list_key(Sponsorship))
     sponsorships = (
         Sponsorship.objects.enabled()
         .with_logo_placement(logo_place=logo_place, publisher=publisher)
@@ -1,5 +1,6 @@
 import random
 from datetime import timedelta
+from unittest.mock import patch
 
 from django import forms
 from django.conf import settings
@@ -302,6 +303,20 @@ class SponsorshipModelTests(TestCase):
             self.assertEqual(sponsorship.agreed_fee, 2000)
 
 
+class SponsorListPurgeTests(TestCase):
+    @patch("apps.sponsors.models.sponsorship.purge_objects")
+    def test_changes_purge_sponsor_lists(self, purge_objects):
+        sponsor = baker.make("sponsors.Sponsor")
+        sponsorship = baker.make(Sponsorship, sponsor=sponsor)
+        sponsor.name = "Renamed"
+        sponsor.save()
+        sponsorship.delete()
+
+        self.assertEqual(purge_objects.call_count, 4)
+        self.assertEqual(purge_objects.call_args.args, ("sponsorship-list",))
+        self.assertIn("/psf/sponsors/", purge_objects.call_args.kwargs["urls"])
+
+
 class SponsorshipCurrentYearTests(TestCase):
     def test_singleton_object_is_loaded_by_default(self):
         curr_year = SponsorshipCurrentYear.objects.get()
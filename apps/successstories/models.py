@@ -14,7 +14,7 @@ from apps.boxes.models import Box
 from apps.cms.models import ContentManageable, NameSlugModel
 from apps.companies.models import Company
 from apps.successstories.managers import StoryManager
-from fastly.utils import purge_url
+from fastly.utils import purge_objects, surrogate_list_key
 
 PSF_TO_EMAILS = ["psf-staff@python.org"]
 DEFAULT_MARKUP_TYPE = getattr(settings, "DEFAULT_MARKUP_TYPE", "restructuredtext")
@@ -125,12 +125,9 @@ def update_successstories_supernav(sender, instance, created, **kwargs):
         if not created:
             box.save()
 
-        # Purge Fastly cache
-        purge_url("/box/supernav-python-success-stories/")
-
     if instance.is_published:
-        # Purge the page itself
-        purge_url(instance.get_absolute_url())
+        # Purge the page itself and the story listings
+        purge_objects(instance, surrogate_list_key(Story), urls=[instance.get_absolute_url()])
 
 
 @receiver(post_save, sender=Story)
@@ -9,6 +9,7 @@ from honeypot.decorators import check_honeypot
 
 from apps.successstories.forms import StoryForm
 from apps.successstories.models import Story, StoryCategory
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
 
 
 class ContextMixin:
@@ -60,6 +61,11 @@ class StoryDetail(ContextMixin, DetailView):
             return Story.objects.select_related()
         return Story.objects.select_related().published()
 
+    def get_context_data(self, **kwargs):
+        """Tag the page with the story's surrogate key."""
+        tag_surrogate_keys(self.object)
+        return super().get_context_data(**kwargs)
+
 
 class StoryList(ListView):
     """List view showing the most recent published success stories."""
@@ -69,6 +75,7 @@ class StoryList(ListView):
 
     def get_queryset(self):
         """Return the latest published stories with related objects."""
+        tag_surrogate_keys(surrogate_list_key(Story))
         return Story.objects.select_related().latest()
 
 
@@ -76,3 +83,8 @@ class StoryListCategory(ContextMixin, DetailView):
     """Detail view for a story category, showing its associated stories."""
 
     model = StoryCategory
+
+    def get_context_data(self, **kwargs):
+        """Tag the page with the story list surrogate key."""
+        tag_surrogate_keys(surrogate_list_key(Story))
+        return super().get_context_data(**kwargs)
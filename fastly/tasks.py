@@ -0,0 +1,18 @@
+"""Celery tasks for sending queued Fastly purges."""
+
+import requests
+from celery import shared_task
+
+from fastly.utils import send_purges
+
+
+@shared_task(
+    autoretry_for=(requests.RequestException,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=8,
+)
+def purge(keys, urls):
+    """Send queued surrogate key and URL purges, retrying with backoff on failure."""
+    send_purges(keys=keys, urls=urls)
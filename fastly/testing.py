@@ -0,0 +1,101 @@
+"""A local stand-in for the Fastly API, for tests and local development."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import override_settings
+
+
+class FakeFastlyHandler(BaseHTTPRequestHandler):
+    """Record purge requests and answer them like Fastly does."""
+
+    def do_POST(self):
+        """Handle a surrogate key purge."""
+        self._record()
+
+    def do_PURGE(self):
+        """Handle a URL purge."""
+        self._record()
+
+    def _record(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        fake = self.server.fake
+        with fake.lock:
+            fake.requests.append(
+                {
+                    "method": self.command,
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "json": json.loads(body) if body else None,
+                }
+            )
+            failing = fake.failures > 0
+            if failing:
+                fake.failures -= 1
+        status = 503 if failing else 200
+        payload = json.dumps({"status": "ok"} if not failing else {"msg": "unavailable"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):  # noqa: A002 - matches the overridden signature
+        """Keep test output quiet."""
+
+
+class FakeFastly:
+    """Serve the Fastly API and purgeable site from a local HTTP server.
+
+    Used as a context manager, it points the ``FASTLY_*`` settings at itself and
+    records every purge in :attr:`requests`. The first ``failures`` requests are
+    answered with a 503, to exercise retries::
+
+        with FakeFastly() as fastly:
+            send_purges(keys=["release-1"])
+        assert fastly.purged_keys() == ["release-1"]
+    """
+
+    def __init__(self, failures=0):
+        """Prepare the server; it starts when the context is entered."""
+        self.failures = failures
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = None
+        self.settings = None
+
+    @property
+    def url(self):
+        """Return the base URL of the running server."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        """Start the server and override the Fastly settings."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeFastlyHandler)
+        self.server.fake = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.settings = override_settings(
+            FASTLY_API_KEY="fake-key",
+            FASTLY_SERVICE_ID="fake-service",
+            FASTLY_API_URL=self.url,
+            FASTLY_SITE_URL=self.url,
+        )
+        self.settings.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Restore the settings and stop the server."""
+        self.settings.disable()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def purged_keys(self):
+        """Return the surrogate keys purged so far, in order."""
+        return [key for request in self.requests if request["json"] for key in request["json"]["surrogate_keys"]]
+
+    def purged_urls(self):
+        """Return the paths purged so far, in order."""
+        return [request["path"] for request in self.requests if request["method"] == "PURGE"]
@@ -0,0 +1,65 @@
+from unittest import mock
+
+import requests
+from django.test import TestCase, override_settings
+
+from fastly.tasks import purge
+from fastly.testing import FakeFastly
+from fastly.utils import PURGE_BATCH_SIZE, queue_purge, send_purges
+
+
+class SendPurgesTests(TestCase):
+    def test_keys_are_purged_in_batches(self):
+        keys = [f"release-{pk}" for pk in range(PURGE_BATCH_SIZE + 1)]
+        with FakeFastly() as fastly:
+            send_purges(keys=keys)
+        self.assertEqual(len(fastly.requests), 2)
+        self.assertEqual(fastly.requests[0]["path"], "/service/fake-service/purge")
+        self.assertEqual(fastly.requests[0]["headers"]["Fastly-Key"], "fake-key")
+        self.assertEqual(fastly.purged_keys(), keys)
+
+    def test_urls_are_purged(self):
+        with FakeFastly() as fastly:
+            send_purges(urls=["/ftp/python/"])
+        self.assertEqual(fastly.purged_urls(), ["/ftp/python/"])
+
+    def test_failed_purges_raise(self):
+        with FakeFastly(failures=1), self.assertRaises(requests.HTTPError):
+            send_purges(keys=["release-1"])
+
+    def test_task_retries_failed_purges(self):
+        self.assertIn(requests.RequestException, purge.autoretry_for)
+        self.assertTrue(purge.retry_backoff)
+
+
+@override_settings(FASTLY_API_KEY="fake-key", FASTLY_PURGE_DELAY=5)
+class QueuePurgeTests(TestCase):
+    def test_purges_are_queued_after_commit(self):
+        with (
+            mock.patch("fastly.tasks.purge.apply_async") as apply_async,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            queue_purge(keys=["release-1", "release-1"], urls=["/ftp/python/"])
+            apply_async.assert_not_called()
+        apply_async.assert_called_once_with((["release-1"], ["/ftp/python/"]), countdown=5)
+
+    def test_repeated_purges_are_coalesced(self):
+        with (
+            mock.patch("fastly.tasks.purge.apply_async") as apply_async,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            queue_purge(keys=["release-1", "os-1"])
+            queue_purge(keys=["release-1", "os-2"])
+        self.assertEqual(
+            [call.args[0] for call in apply_async.call_args_list],
+            [(["release-1", "os-1"], []), (["os-2"], [])],
+        )
+
+    @override_settings(FASTLY_API_KEY=False)
+    def test_nothing_is_queued_without_api_key(self):
+        with (
+            mock.patch("fastly.tasks.purge.apply_async") as apply_async,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            queue_purge(keys=["release-1"])
+        apply_async.assert_not_called()
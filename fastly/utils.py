@@ -1,7 +1,38 @@
 """Utility functions for interacting with the Fastly CDN API."""
 
+import contextlib
+import logging
+from contextvars import ContextVar
+
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from kombu.exceptions import OperationalError
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Surrogate keys registered while rendering the current request, see
+# ``collect_surrogate_keys`` and ``pydotorg.middleware.GlobalSurrogateKey``.
+_surrogate_keys = ContextVar("surrogate_keys", default=None)
+
+
+# Fastly accepts at most 256 surrogate keys per batch purge request.
+PURGE_BATCH_SIZE = 256
+
+_session = None
+
+
+def get_session():
+    """Return the pooled HTTP session shared by all purge requests in this process."""
+    global _session  # noqa: PLW0603 - lazily created process-wide session
+    if _session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+        session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+        _session = session
+    return _session
 
 
 def purge_url(path):
@@ -11,9 +42,9 @@ def purge_url(path):
 
     api_key = getattr(settings, "FASTLY_API_KEY", None)
     if api_key:
-        return requests.request(
+        return get_session().request(
             "PURGE",
-            f"https://www.python.org{path}",
+            f"{settings.FASTLY_SITE_URL}{path}",
             headers={"Fastly-Key": api_key},
             timeout=30,
         )
@@ -30,19 +61,135 @@ def purge_surrogate_key(key):
         - 'events': Purges all /events/* pages
         - 'sponsors': Purges all /sponsors/* pages
         - etc. (first path segment becomes the surrogate key)
+        - 'release-123', 'box-homepage-downloads', 'release-list': Purges only
+          the pages that rendered that object or list (see ``surrogate_key_for``)
 
     Returns the response from Fastly API, or None if not configured.
     """
+    responses = purge_surrogate_keys([key])
+    return responses[0] if responses else None
+
+
+def purge_surrogate_keys(keys):
+    """Purge several surrogate keys with Fastly's batch purge API.
+
+    Returns the responses from Fastly API, or an empty list if not configured.
+    """
     if settings.DEBUG:
-        return None
+        return []
 
     api_key = getattr(settings, "FASTLY_API_KEY", None)
     service_id = getattr(settings, "FASTLY_SERVICE_ID", None)
     if not api_key or not service_id:
-        return None
+        return []
+
+    keys = list(keys)
+    return [
+        get_session().post(
+            f"{settings.FASTLY_API_URL}/service/{service_id}/purge",
+            headers={"Fastly-Key": api_key},
+            json={"surrogate_keys": keys[start : start + PURGE_BATCH_SIZE]},
+            timeout=30,
+        )
+        for start in range(0, len(keys), PURGE_BATCH_SIZE)
+    ]
+
+
+def send_purges(keys=(), urls=()):
+    """Purge surrogate keys and URLs right away, raising on any failed request."""
+    responses = purge_surrogate_keys(keys)
+    responses.extend(purge_url(url) for url in urls)
+    for response in responses:
+        if response is not None:
+            response.raise_for_status()
+
+
+def pending_purge_cache_key(kind, value):
+    """Return the cache key marking a purge as already queued."""
+    return f"fastly-purge-pending:{kind}:{value}"
+
 
-    return requests.post(
-        f"https://api.fastly.com/service/{service_id}/purge/{key}",
-        headers={"Fastly-Key": api_key},
-        timeout=30,
-    )
+def queue_purge(keys=(), urls=()):
+    """Queue purges to be sent by a Celery worker once the transaction commits.
+
+    Purges already queued within the last ``FASTLY_PURGE_DELAY`` seconds are
+    skipped: the queued task is delayed by that much, so it runs after this
+    change and covers it too.
+    """
+    if settings.DEBUG or not getattr(settings, "FASTLY_API_KEY", None):
+        return
+
+    keys = list(dict.fromkeys(keys))
+    urls = list(dict.fromkeys(urls))
+
+    def enqueue():
+        delay = settings.FASTLY_PURGE_DELAY
+        new_keys = [key for key in keys if cache.add(pending_purge_cache_key("key", key), value=True, timeout=delay)]
+        new_urls = [url for url in urls if cache.add(pending_purge_cache_key("url", url), value=True, timeout=delay)]
+        if not new_keys and not new_urls:
+            return
+
+        from fastly.tasks import purge
+
+        try:
+            purge.apply_async((new_keys, new_urls), countdown=delay)
+        except OperationalError:
+            logger.exception("Could not queue Fastly purges, sending them now")
+            send_purges(keys=new_keys, urls=new_urls)
+
+    transaction.on_commit(enqueue)
+
+
+def surrogate_key_for(obj):
+    """Return the surrogate key identifying a single object, e.g. ``release-123``.
+
+    Strings are returned unchanged. Models can override the default
+    ``<model_name>-<pk>`` key with a ``surrogate_key`` attribute.
+    """
+    if isinstance(obj, str):
+        return obj
+    key = getattr(obj, "surrogate_key", None)
+    if key:
+        return key
+    return f"{obj._meta.model_name}-{obj.pk}"  # noqa: SLF001 - Django _meta API access is standard
+
+
+def surrogate_list_key(model):
+    """Return the surrogate key for pages listing a model's objects, e.g. ``release-list``."""
+    return f"{model._meta.model_name}-list"  # noqa: SLF001 - Django _meta API access is standard
+
+
+@contextlib.contextmanager
+def collect_surrogate_keys():
+    """Collect the surrogate keys registered with ``tag_surrogate_keys`` while rendering."""
+    keys = {}
+    token = _surrogate_keys.set(keys)
+    try:
+        yield keys
+    finally:
+        _surrogate_keys.reset(token)
+
+
+def tag_surrogate_keys(*objects):
+    """Register objects (or literal keys) rendered by the current request.
+
+    Does nothing outside of a request handled by ``GlobalSurrogateKey``.
+    """
+    keys = _surrogate_keys.get()
+    if keys is None:
+        return
+    for obj in objects:
+        if obj is not None:
+            keys[surrogate_key_for(obj)] = None
+
+
+def purge_objects(*objects, urls=()):
+    """Queue a purge of the cached pages that rendered any of ``objects``.
+
+    Purges each object's surrogate key when FASTLY_SERVICE_ID is configured,
+    otherwise falls back to purging ``urls`` one by one.
+    """
+    if getattr(settings, "FASTLY_SERVICE_ID", None):
+        queue_purge(keys=[surrogate_key_for(obj) for obj in objects])
+    else:
+        queue_purge(urls=urls)
@@ -0,0 +1,306 @@
+"""Two-tier cache backend: a bounded per-process LRU in front of a shared cache."""
+
+import logging
+import pickle
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+try:
+    from redis.exceptions import RedisError
+except ModuleNotFoundError as exc:  # pragma: no cover - redis ships with celery[redis]
+    if exc.name != "redis":
+        raise
+    RedisError = OSError
+
+logger = logging.getLogger(__name__)
+
+SHARED_TIER_ERRORS = (RedisError, OSError)
+
+
+class TieredCache(BaseCache):
+    """Cache backend serving hot keys from process memory and everything else from a shared tier.
+
+    ``LOCATION`` is handed to the shared backend (Redis by default). Options:
+
+    ``SHARED_BACKEND``
+        Dotted path of the shared cache class. Tests use
+        ``django.core.cache.backends.locmem.LocMemCache`` as an in-memory stand-in.
+    ``SHARED_OPTIONS``
+        ``OPTIONS`` passed on to the shared backend.
+    ``LOCAL_MAX_ENTRIES``
+        Size of the per-process LRU.
+    ``LOCAL_TIMEOUT``
+        Upper bound, in seconds, on how long a value is served from process
+        memory; this bounds how stale another process's write can appear.
+    ``GENERATION_CHECK_INTERVAL``
+        How often, in seconds, the shared generation counter is re-read.
+        :meth:`clear` bumps that counter instead of flushing the shared
+        server (the Redis instance is shared with Celery), which invalidates
+        every process's local tier and every shared key at once.
+    ``RETRY_INTERVAL``
+        How long to serve from the local tier alone after the shared tier fails.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+    GENERATION_KEY = "tiered-cache-generation"
+
+    def __init__(self, location, params):
+        """Build the local tier and instantiate the shared backend."""
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        shared_class = import_string(options.get("SHARED_BACKEND", "django.core.cache.backends.redis.RedisCache"))
+        self.shared = shared_class(
+            location,
+            {
+                "TIMEOUT": params.get("TIMEOUT", 300),
+                "KEY_PREFIX": params.get("KEY_PREFIX", ""),
+                "VERSION": params.get("VERSION", 1),
+                "KEY_FUNCTION": params.get("KEY_FUNCTION"),
+                "OPTIONS": options.get("SHARED_OPTIONS", {}),
+            },
+        )
+        self.local_max_entries = int(options.get("LOCAL_MAX_ENTRIES", 1000))
+        self.local_timeout = float(options.get("LOCAL_TIMEOUT", 5))
+        self.generation_check_interval = float(options.get("GENERATION_CHECK_INTERVAL", 1))
+        self.retry_interval = float(options.get("RETRY_INTERVAL", 30))
+
+        self._local = OrderedDict()
+        self._lock = Lock()
+        self._generation = 0
+        self._generation_checked_at = None
+        self._shared_down_until = 0.0
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "shared_errors": 0}
+
+    # Shared tier
+
+    def _shared_available(self):
+        """Return True unless the shared tier failed within the retry interval."""
+        return time.monotonic() >= self._shared_down_until
+
+    def _shared_failed(self, error):
+        """Fall back to the local tier for a while after a shared-tier error."""
+        self.stats["shared_errors"] += 1
+        self._shared_down_until = time.monotonic() + self.retry_interval
+        logger.warning("Shared cache tier unavailable, serving from process memory: %s", error)
+
+    def _call_shared(self, method, *args, default=None, **kwargs):
+        """Call a shared-tier method, returning ``default`` if the tier is down."""
+        if not self._shared_available():
+            return default
+        try:
+            return getattr(self.shared, method)(*args, **kwargs)
+        except SHARED_TIER_ERRORS as error:
+            self._shared_failed(error)
+            return default
+
+    def _current_generation(self):
+        """Return the shared generation counter, re-reading it at most once per interval."""
+        now = time.monotonic()
+        checked_at = self._generation_checked_at
+        if checked_at is not None and now - checked_at < self.generation_check_interval:
+            return self._generation
+        self._generation_checked_at = now
+        generation = self._call_shared("get", self.GENERATION_KEY, default=None)
+        if generation is not None and generation != self._generation:
+            self._generation = generation
+            with self._lock:
+                self._local.clear()
+        return self._generation
+
+    def _shared_key(self, key):
+        """Namespace a key with the current generation for the shared tier."""
+        return f"{self._current_generation()}:{key}"
+
+    # Local tier
+
+    def _local_key(self, key, version):
+        return self.make_and_validate_key(key, version=version)
+
+    def _local_get(self, local_key):
+        """Return ``(found, value)`` from the local tier, dropping expired entries."""
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                return False, None
+            pickled, expires_at = entry
+            if expires_at <= time.time():
+                del self._local[local_key]
+                return False, None
+            self._local.move_to_end(local_key)
+        return True, pickle.loads(pickled)  # noqa: S301 - values were pickled by this process
+
+    def _local_set(self, local_key, value, timeout=DEFAULT_TIMEOUT):
+        """Store a value locally for at most ``LOCAL_TIMEOUT`` seconds."""
+        expires_at = time.time() + self.local_timeout
+        backend_timeout = self.get_backend_timeout(timeout)
+        if backend_timeout is not None:
+            expires_at = min(expires_at, backend_timeout)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        with self._lock:
+            self._local[local_key] = (pickled, expires_at)
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, local_key):
+        with self._lock:
+            return self._local.pop(local_key, None) is not None
+
+    # Cache API
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """Add a value only if the key is not already cached."""
+        local_key = self._local_key(key, version)
+        if self._shared_available():
+            added = self._call_shared("add", self._shared_key(key), value, timeout, version=version, default=None)
+            if added is not None:
+                if added:
+                    self._local_set(local_key, value, timeout)
+                return added
+        found, _ = self._local_get(local_key)
+        if found:
+            return False
+        self._local_set(local_key, value, timeout)
+        return True
+
+    def get(self, key, default=None, version=None):
+        """Return a value from the local tier, falling back to the shared tier."""
+        local_key = self._local_key(key, version)
+        generation = self._current_generation()
+        found, value = self._local_get(local_key)
+        if found:
+            self.stats["local_hits"] += 1
+            return value
+
+        missing = object()
+        value = self._call_shared("get", f"{generation}:{key}", missing, version=version, default=missing)
+        if value is missing:
+            self.stats["misses"] += 1
+            return default
+        self.stats["shared_hits"] += 1
+        self._local_set(local_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """Write a value through both tiers."""
+        self._call_shared("set", self._shared_key(key), value, timeout, version=version)
+        self._local_set(self._local_key(key, version), value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        """Update a key's expiry in the shared tier and drop the local copy."""
+        local_key = self._local_key(key, version)
+        touched = self._call_shared("touch", self._shared_key(key), timeout, version=version, default=None)
+        if touched is None:
+            found, value = self._local_get(local_key)
+            if not found:
+                return False
+            self._local_set(local_key, value, timeout)
+            return True
+        self._local_delete(local_key)
+        return touched
+
+    def delete(self, key, version=None):
+        """Delete a key from both tiers."""
+        local_deleted = self._local_delete(self._local_key(key, version))
+        shared_deleted = self._call_shared("delete", self._shared_key(key), version=version, default=False)
+        return bool(shared_deleted or local_deleted)
+
+    def get_many(self, keys, version=None):
+        """Return cached values, reading the shared tier once for all local misses."""
+        generation = self._current_generation()
+        result = {}
+        pending = {}
+        for key in keys:
+            found, value = self._local_get(self._local_key(key, version))
+            if found:
+                self.stats["local_hits"] += 1
+                result[key] = value
+            else:
+                pending[f"{generation}:{key}"] = key
+
+        if pending:
+            shared = self._call_shared("get_many", list(pending), version=version, default={})
+            for shared_key, value in shared.items():
+                key = pending[shared_key]
+                result[key] = value
+                self._local_set(self._local_key(key, version), value)
+            self.stats["shared_hits"] += len(shared)
+            self.stats["misses"] += len(pending) - len(shared)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        """Write several values through both tiers in one shared round trip."""
+        generation = self._current_generation()
+        shared_data = {f"{generation}:{key}": value for key, value in data.items()}
+        failed = self._call_shared("set_many", shared_data, timeout, version=version, default=[])
+        for key, value in data.items():
+            self._local_set(self._local_key(key, version), value, timeout)
+        return [key.split(":", 1)[1] for key in failed]
+
+    def delete_many(self, keys, version=None):
+        """Delete several keys from both tiers."""
+        keys = list(keys)
+        for key in keys:
+            self._local_delete(self._local_key(key, version))
+        generation = self._current_generation()
+        self._call_shared("delete_many", [f"{generation}:{key}" for key in keys], version=version)
+
+    def has_key(self, key, version=None):
+        """Return True if either tier holds the key."""
+        found, _ = self._local_get(self._local_key(key, version))
+        if found:
+            return True
+        return bool(self._call_shared("has_key", self._shared_key(key), version=version, default=False))
+
+    def incr(self, key, delta=1, version=None):
+        """Atomically increment a value in the shared tier and refresh the local copy."""
+        local_key = self._local_key(key, version)
+        if self._shared_available():
+            try:
+                value = self.shared.incr(self._shared_key(key), delta, version=version)
+            except SHARED_TIER_ERRORS as error:
+                self._shared_failed(error)
+            else:
+                self._local_set(local_key, value)
+                return value
+        found, value = self._local_get(local_key)
+        if not found:
+            msg = f"Key '{key}' not found"
+            raise ValueError(msg)
+        value += delta
+        self._local_set(local_key, value)
+        return value
+
+    def clear(self):
+        """Invalidate every key in every process by bumping the shared generation."""
+        with self._lock:
+            self._local.clear()
+        if not self._shared_available():
+            return
+        try:
+            try:
+                self._generation = self.shared.incr(self.GENERATION_KEY)
+            except ValueError:
+                self._generation += 1
+                self.shared.set(self.GENERATION_KEY, self._generation, timeout=None)
+        except SHARED_TIER_ERRORS as error:
+            self._shared_failed(error)
+        self._generation_checked_at = time.monotonic()
+
+    def close(self, **kwargs):
+        """Close connections held by the shared tier."""
+        self._call_shared("close", **kwargs)
+
+    def get_stats(self):
+        """Return the hit/miss counters for this process with the local tier size."""
+        lookups = self.stats["local_hits"] + self.stats["shared_hits"] + self.stats["misses"]
+        hits = self.stats["local_hits"] + self.stats["shared_hits"]
+        return {
+            **self.stats,
+            "local_entries": len(self._local),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
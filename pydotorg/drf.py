@@ -1,13 +1,22 @@
 """Django REST Framework base classes and utilities for the python.org API."""
 
+import hashlib
 import json
 from urllib.parse import urlencode, urljoin
 
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Max
 from django.db.models.constants import LOOKUP_SEP
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django_filters import rest_framework as filters
 from rest_framework import serializers, viewsets
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+
+# Query parameters handled by pagination and serializers rather than filters.
+NON_FILTER_PARAMS = frozenset(("cursor", "page_size", "fields"))
 
 
 class IsStaffOrReadOnly(IsAuthenticatedOrReadOnly):
@@ -41,6 +50,89 @@ class BaseReadOnlyAPIViewSet(BaseAPIViewMixin, viewsets.ReadOnlyModelViewSet):
     """Base read-only viewset with publish-filtering."""
 
 
+class OptionalCursorPagination(CursorPagination):
+    """Cursor pagination for clients that ask for it with ``?page_size=`` or ``?cursor=``.
+
+    Requests without either get the full, unpaginated list, as before
+    pagination was added. Subclasses set ``ordering``.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate only when the client asked for pages."""
+        if not {self.cursor_query_param, self.page_size_query_param} & set(request.query_params):
+            return None
+        return super().paginate_queryset(queryset, request, view=view)
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin limiting the output to the fields listed in ``?fields=name,slug``.
+
+    Only read requests are limited; writes always validate every field.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Drop the fields not requested by the current request."""
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        requested = request.query_params.get("fields")
+        if requested:
+            wanted = {name.strip() for name in requested.split(",")}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class ConditionalGetMixin:
+    """Viewset mixin answering unchanged list and detail requests with 304 Not Modified.
+
+    The strong ETag comes from the latest value of ``last_modified_field``
+    and the number of objects in the filtered queryset, so it is computed
+    with one aggregate query before anything is serialized. Only detail
+    responses send ``Last-Modified``: deleting an object from a list leaves
+    the latest timestamp unchanged, so it cannot validate a list.
+    """
+
+    last_modified_field = "updated"
+
+    def list(self, request, *args, **kwargs):
+        """Return 304 if the filtered list is unchanged, else the list."""
+        stamp = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=Max(self.last_modified_field), count=Count("pk")
+        )
+        return self._conditional_response(
+            request, stamp["last_modified"], stamp["count"], super().list, *args, send_last_modified=False, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return 304 if the object is unchanged, else the object."""
+        instance = self.get_object()
+
+        def render(request, *args, **kwargs):
+            return Response(self.get_serializer(instance).data)
+
+        return self._conditional_response(request, getattr(instance, self.last_modified_field), 1, render)
+
+    def _conditional_response(self, request, last_modified, count, view, *args, send_last_modified=True, **kwargs):
+        """Return 304 when the request's validators match, else call ``view`` and add them to its response."""
+        version = f"{last_modified.isoformat() if last_modified else ''}:{count}:{request.user.is_staff}"
+        digest = hashlib.sha256(f"{version}:{request.get_full_path()}".encode()).hexdigest()
+        etag = quote_etag(digest)
+        timestamp = int(last_modified.timestamp()) if last_modified and send_last_modified else None
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            return not_modified
+        response = view(request, *args, **kwargs)
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
 class BaseFilterSet(filters.FilterSet):
     """FilterSet that validates query parameters against allowed filters."""
 
@@ -50,7 +142,7 @@ class BaseFilterSet(filters.FilterSet):
     def qs(self):
         """Return the filtered queryset, raising errors for invalid filter params."""
         errors = []
-        for param in set(self.data) - set(self.filters):
+        for param in set(self.data) - set(self.filters) - NON_FILTER_PARAMS:
             if LOOKUP_SEP not in param:
                 field, lookup = param, "exact"
             else:
@@ -2,6 +2,11 @@
 
 from django.conf import settings
 
+from fastly.utils import collect_surrogate_keys
+
+# Fastly rejects Surrogate-Key headers longer than 16 KB.
+SURROGATE_KEY_MAX_LENGTH = 16 * 1024
+
 
 class AdminNoCaching:
     """Middleware to ensure the admin is not cached by Fastly or other caches."""
@@ -22,7 +27,10 @@ class GlobalSurrogateKey:
     """Middleware to insert a Surrogate-Key for purging in Fastly or other caches.
 
     Adds both a global key (for full site purges) and section-based keys
-    derived from the URL path (for targeted purges like /downloads/).
+    derived from the URL path (for targeted purges like /downloads/), followed
+    by the keys of the objects the views and template tags registered with
+    ``fastly.utils.tag_surrogate_keys`` (e.g. ``release-123``), so that saving
+    one object only purges the pages that rendered it.
     """
 
     def __init__(self, get_response):
@@ -45,8 +53,9 @@ class GlobalSurrogateKey:
         return None
 
     def __call__(self, request):
-        """Append the global and section surrogate keys to the response header."""
-        response = self.get_response(request)
+        """Append the global, section and object surrogate keys to the response header."""
+        with collect_surrogate_keys() as object_keys:
+            response = self.get_response(request)
         keys = []
         if hasattr(settings, "GLOBAL_SURROGATE_KEY"):
             keys.append(settings.GLOBAL_SURROGATE_KEY)
@@ -59,7 +68,13 @@ class GlobalSurrogateKey:
         if existing:
             keys.append(existing)
 
-        if keys:
-            response["Surrogate-Key"] = " ".join(keys)
+        header = " ".join(keys)
+        for key in object_keys:
+            if len(header) + len(key) + 1 > SURROGATE_KEY_MAX_LENGTH:
+                break
+            header = f"{header} {key}" if header else key
+
+        if header:
+            response["Surrogate-Key"] = header
 
         return response
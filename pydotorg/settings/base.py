@@ -42,7 +42,24 @@ _REDIS_URL = config("REDIS_URL", default="redis://redis:6379/0")
 CELERY_BROKER_URL = _REDIS_URL
 CELERY_RESULT_BACKEND = _REDIS_URL
 
-CELERY_BEAT_SCHEDULE = {}
+CELERY_BEAT_SCHEDULE = {
+    "refresh-release-cycle": {
+        "task": "apps.downloads.tasks.refresh_release_cycle_task",
+        "schedule": 60 * 30,
+    },
+    "update-event-occurrences": {
+        "task": "apps.events.tasks.update_event_occurrences_task",
+        "schedule": 60 * 60 * 24,
+    },
+    "update-event-times": {
+        "task": "apps.events.tasks.update_event_times_task",
+        "schedule": 60 * 5,
+    },
+    "dispatch-event-alarms": {
+        "task": "apps.events.tasks.dispatch_alarms_task",
+        "schedule": 60,
+    },
+}
 
 ### Locale settings
 
@@ -143,6 +160,20 @@ TEMPLATES = [
 
 FORM_RENDERER = "django.forms.renderers.DjangoTemplates"
 
+### Template caching, see pydotorg.template_loaders.CachedLoader
+
+# Re-stat template sources on every cache hit and recompile the ones that changed.
+TEMPLATE_CACHE_CHECK_MTIME = False
+# Templates compiled in the gunicorn master before workers fork (``preload_app``).
+TEMPLATE_CACHE_PRELOAD = [
+    "base.html",
+    "python/index.html",
+    "python/versions.html",
+    "downloads/index.html",
+    "downloads/release_detail.html",
+    "events/event_list.html",
+]
+
 ### URLs, WSGI, middleware, etc.
 
 ROOT_URLCONF = "pydotorg.urls"
@@ -156,6 +187,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "pydotorg.middleware.AdminNoCaching",
     "pydotorg.middleware.GlobalSurrogateKey",
+    "apps.events.middleware.RequestClockMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "waffle.middleware.WaffleMiddleware",
@@ -197,6 +229,7 @@ INSTALLED_APPS = [
     "django_countries",
     "sorl.thumbnail",
     "pydotorg",
+    "fastly",
     "apps.banners",
     "apps.blogs",
     "apps.boxes",
@@ -231,6 +264,9 @@ INSTALLED_APPS = [
 
 FIXTURE_DIRS = (str(Path(BASE) / "fixtures"),)
 
+# Tests store uploaded files in a temporary MEDIA_ROOT.
+TEST_RUNNER = "pydotorg.test_runner.TemporaryMediaDiscoverRunner"
+
 ### Logging
 
 LOGGING = {
@@ -268,6 +304,23 @@ MAILING_LIST_PSF_MEMBERS = "psf-members-announce-request@python.org"
 FASTLY_API_KEY = False  # Set to Fastly API key in production to allow pages to
 # be purged on save
 FASTLY_SERVICE_ID = config("FASTLY_SERVICE_ID", default=None)  # Required for surrogate key purging
+FASTLY_API_URL = "https://api.fastly.com"
+FASTLY_SITE_URL = "https://www.python.org"  # URL purges are sent to this host
+FASTLY_PURGE_DELAY = 5  # Seconds a queued purge waits, absorbing repeated purges of the same key
+
+# Downloads
+# Seconds to wait after a release change before regenerating the download
+# boxes, so a batch of release file uploads rebuilds them once.
+DOWNLOAD_BOX_UPDATE_DELAY = 10
+# Python release cycle data shown in EOL banners and the active releases table.
+# Data older than RELEASE_CYCLE_MAX_AGE seconds is still served while it is
+# refreshed in the background.
+RELEASE_CYCLE_URL = "https://peps.python.org/api/release-cycle.json"
+RELEASE_CYCLE_MAX_AGE = 60 * 60
+# Lifetimes of /downloads/releases.json in browsers and in the CDN, which is
+# purged whenever the manifest is rewritten.
+RELEASE_MANIFEST_BROWSER_TTL = 60 * 5
+RELEASE_MANIFEST_CDN_TTL = 60 * 60 * 24 * 30
 
 # Jobs
 JOB_THRESHOLD_DAYS = 90
@@ -275,6 +328,17 @@ JOB_FROM_EMAIL = "jobs@python.org"
 
 # Events
 EVENTS_TO_EMAIL = "events@python.org"
+EVENT_ALARM_FROM_EMAIL = "events@python.org"
+# Days either side of now over which recurring events' occurrences are
+# materialized; the beat schedule rolls the window forward daily.
+EVENT_OCCURRENCE_HORIZON_DAYS = 365
+# iCalendar export feeds leave out events that ended more than this many days
+# ago. They are cached until their calendar changes, at most for
+# EVENT_ICS_CACHE_TIMEOUT seconds, and purged from the CDN on changes.
+EVENT_ICS_PAST_DAYS = 90
+EVENT_ICS_CACHE_TIMEOUT = 60 * 60 * 24
+EVENT_ICS_BROWSER_TTL = 60 * 15
+EVENT_ICS_CDN_TTL = 60 * 60 * 24
 
 # Sponsors
 SPONSORSHIP_NOTIFICATION_FROM_EMAIL = config("SPONSORSHIP_NOTIFICATION_FROM_EMAIL", default="sponsors@python.org")
@@ -13,13 +13,25 @@ DATABASES["default"]["CONN_MAX_AGE"] = DATABASE_CONN_MAX_AGE
 
 ## Django Caching
 
+# Per-worker LRU in front of the Redis instance Celery already uses.
+# See pydotorg.cache.TieredCache for the available options.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-        "LOCATION": "django_cache_table",
+        "BACKEND": "pydotorg.cache.TieredCache",
+        "LOCATION": config("CACHE_REDIS_URL", default=CELERY_BROKER_URL),
+        "OPTIONS": {
+            "LOCAL_MAX_ENTRIES": 1000,
+            "LOCAL_TIMEOUT": 5,
+        },
     }
 }
 
+## Template Caching
+
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    ("pydotorg.template_loaders.CachedLoader", TEMPLATES[0]["OPTIONS"]["loaders"]),
+]
+
 HAYSTACK_SEARCHBOX_SSL_URL = config("SEARCHBOX_SSL_URL")
 
 HAYSTACK_CONNECTIONS = {
@@ -0,0 +1,189 @@
+"""Template loaders that keep compiled templates in memory between requests."""
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.template.loaders import cached
+
+logger = logging.getLogger(__name__)
+
+
+class CachedLoader(cached.Loader):
+    """Cached loader wrapping the explicit ``apptemplates`` loader chain.
+
+    Listing ``TEMPLATES[...]["OPTIONS"]["loaders"]`` explicitly stops Django
+    from enabling its own cached loader, so production wraps the chain in this
+    loader instead. Compiled templates are kept for the life of the worker
+    process, so a deploy (which starts new workers) drops them; with
+    ``TEMPLATE_CACHE_CHECK_MTIME`` enabled they are also recompiled when a
+    source file changes on disk.
+
+    Hits, misses and the parse time they account for are tracked per template
+    name so the savings can be reported with :func:`template_cache_stats`.
+    Lookups of missing templates are not counted.
+    """
+
+    def __init__(self, engine, loaders):
+        """Initialize the loader chain and the per-template bookkeeping."""
+        super().__init__(engine, loaders)
+        self.mtimes = {}
+        self.parse_times = {}
+        self.stats = {}
+
+    def get_template(self, template_name, skip=None):
+        """Return a compiled template, parsing it only on a cache miss."""
+        key = self.cache_key(template_name, skip)
+        if key in self.get_template_cache and not self._is_stale(key):
+            # Missing templates are cached too, and raise again here before being counted.
+            template = super().get_template(template_name, skip)
+            self._record(template_name, hit=True, seconds=self.parse_times.get(key, 0.0))
+            return template
+
+        self.get_template_cache.pop(key, None)
+        started = time.perf_counter()
+        template = super().get_template(template_name, skip)
+        elapsed = time.perf_counter() - started
+        self.parse_times[key] = elapsed
+        self.mtimes[key] = self._get_mtime(template.origin.name)
+        self._record(template_name, hit=False, seconds=elapsed)
+        return template
+
+    def reset(self):
+        """Empty the template cache and the recorded source mtimes."""
+        super().reset()
+        self.mtimes.clear()
+        self.parse_times.clear()
+
+    def _is_stale(self, key):
+        """Return True if the cached template's source file changed on disk."""
+        if not getattr(settings, "TEMPLATE_CACHE_CHECK_MTIME", False) or key not in self.mtimes:
+            return False
+        cached_template = self.get_template_cache[key]
+        origin = getattr(cached_template, "origin", None)
+        if origin is None:
+            return False
+        return self._get_mtime(origin.name) != self.mtimes[key]
+
+    @staticmethod
+    def _get_mtime(path):
+        """Return the modification time of a template source, or None."""
+        try:
+            return Path(path).stat().st_mtime
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def _record(self, template_name, *, hit, seconds):
+        """Update hit/miss counters and parse time saved for a template."""
+        entry = self.stats.setdefault(
+            str(template_name),
+            {"hits": 0, "misses": 0, "parse_seconds": 0.0, "saved_seconds": 0.0},
+        )
+        if hit:
+            entry["hits"] += 1
+            entry["saved_seconds"] += seconds
+        else:
+            entry["misses"] += 1
+            entry["parse_seconds"] += seconds
+
+
+def _cached_loaders():
+    """Yield every CachedLoader configured on the Django template engines."""
+    for backend in engines.all():
+        engine = getattr(backend, "engine", None)
+        if engine is None:
+            continue
+        for loader in engine.template_loaders:
+            if isinstance(loader, CachedLoader):
+                yield loader
+
+
+def template_cache_stats():
+    """Return aggregated and per-template hit rates for this process."""
+    templates = {}
+    for loader in _cached_loaders():
+        for name, entry in loader.stats.items():
+            totals = templates.setdefault(
+                name,
+                {"hits": 0, "misses": 0, "parse_seconds": 0.0, "saved_seconds": 0.0},
+            )
+            for field, value in entry.items():
+                totals[field] += value
+
+    hits = sum(entry["hits"] for entry in templates.values())
+    misses = sum(entry["misses"] for entry in templates.values())
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "parse_seconds": sum(entry["parse_seconds"] for entry in templates.values()),
+        "saved_seconds": sum(entry["saved_seconds"] for entry in templates.values()),
+        "templates": templates,
+    }
+
+
+def log_template_cache_stats(log=None, limit=10):
+    """Log the process-wide hit rate and the templates saving the most parse time.
+
+    ``log`` defaults to this module's logger; gunicorn hooks pass ``server.log``.
+    """
+    log = log or logger
+    stats = template_cache_stats()
+    log.info(
+        "Template cache: %d hits, %d misses (%.1f%% hit rate), %.3fs parsing, %.3fs saved",
+        stats["hits"],
+        stats["misses"],
+        stats["hit_rate"] * 100,
+        stats["parse_seconds"],
+        stats["saved_seconds"],
+    )
+    top = sorted(stats["templates"].items(), key=lambda item: item[1]["saved_seconds"], reverse=True)
+    for name, entry in top[:limit]:
+        log.info(
+            "Template cache: %s: %d hits, %d misses, %.3fs saved",
+            name,
+            entry["hits"],
+            entry["misses"],
+            entry["saved_seconds"],
+        )
+
+
+def _referenced_templates(template):
+    """Return the constant template names a compiled template extends or includes."""
+    expressions = [node.parent_name for node in template.nodelist.get_nodes_by_type(ExtendsNode)]
+    expressions += [node.template for node in template.nodelist.get_nodes_by_type(IncludeNode)]
+    return [expression.var for expression in expressions if isinstance(expression.var, str)]
+
+
+def warm_template_cache(template_names=None):
+    """Compile templates (and the templates they extend or include) ahead of requests.
+
+    Meant to run in the gunicorn master when ``preload_app`` is enabled so that
+    forked workers share the already compiled templates. Defaults to the names
+    listed in ``TEMPLATE_CACHE_PRELOAD``. Returns the number of templates compiled.
+    """
+    if template_names is None:
+        template_names = getattr(settings, "TEMPLATE_CACHE_PRELOAD", [])
+
+    loaded = set()
+    pending = list(template_names)
+    while pending:
+        name = pending.pop()
+        if name in loaded:
+            continue
+        loaded.add(name)
+        for backend in engines.all():
+            engine = getattr(backend, "engine", None)
+            if engine is None:
+                continue
+            try:
+                template = engine.get_template(name)
+            except TemplateDoesNotExist:
+                logger.warning("Template cache: cannot preload missing template %s", name)
+                continue
+            pending.extend(_referenced_templates(template))
+    return len(loaded)
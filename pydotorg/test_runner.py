@@ -0,0 +1,24 @@
+"""Test runner keeping the files written by tests out of the project's media directory."""
+
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TemporaryMediaDiscoverRunner(DiscoverRunner):
+    """Run the tests with ``MEDIA_ROOT`` pointing to a temporary directory, removed afterwards."""
+
+    def setup_test_environment(self, **kwargs):
+        """Point ``MEDIA_ROOT`` to a new temporary directory."""
+        super().setup_test_environment(**kwargs)
+        self.media_root = tempfile.mkdtemp(prefix="pydotorg-media-")
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        """Restore ``MEDIA_ROOT`` and remove the temporary directory."""
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
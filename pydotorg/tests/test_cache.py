@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from pydotorg.cache import TieredCache
+
+
+class UnavailableCache(LocMemCache):
+    """Shared tier stand-in whose server is unreachable."""
+
+    def get(self, *args, **kwargs):
+        raise ConnectionError
+
+    def set(self, *args, **kwargs):
+        raise ConnectionError
+
+    def get_many(self, *args, **kwargs):
+        raise ConnectionError
+
+
+def make_cache(location="tiered-tests", **options):
+    options.setdefault("SHARED_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+    cache = TieredCache(location, {"OPTIONS": options})
+    cache.shared.clear()
+    return cache
+
+
+class TieredCacheTests(SimpleTestCase):
+    def test_set_and_get_through_both_tiers(self):
+        cache = make_cache()
+        cache.set("answer", 42)
+        self.assertEqual(cache.get("answer"), 42)
+        self.assertEqual(cache.get("missing", "default"), "default")
+        self.assertEqual(cache.get_stats()["local_hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 1)
+
+    def test_other_processes_read_from_the_shared_tier(self):
+        writer = make_cache()
+        reader = make_cache()
+        writer.set("answer", 42)
+        self.assertEqual(reader.get("answer"), 42)
+        self.assertEqual(reader.get("answer"), 42)
+        self.assertEqual(reader.stats["shared_hits"], 1)
+        self.assertEqual(reader.stats["local_hits"], 1)
+
+    def test_local_tier_is_bounded(self):
+        cache = make_cache(LOCAL_MAX_ENTRIES=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get_stats()["local_entries"], 2)
+        self.assertEqual(cache.get("b"), 2)
+        self.assertEqual(cache.stats["shared_hits"], 1)
+
+    def test_local_entries_respect_per_key_timeout(self):
+        cache = make_cache(LOCAL_TIMEOUT=60)
+        with mock.patch("pydotorg.cache.time.time", return_value=1000):
+            cache.set("short", "value", timeout=1)
+        cache.shared.clear()
+        with mock.patch("pydotorg.cache.time.time", return_value=1002):
+            self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get_stats()["local_entries"], 0)
+
+    def test_clear_invalidates_other_processes(self):
+        writer = make_cache(GENERATION_CHECK_INTERVAL=0)
+        reader = make_cache(GENERATION_CHECK_INTERVAL=0)
+        writer.set("answer", 42)
+        self.assertEqual(reader.get("answer"), 42)
+        writer.clear()
+        self.assertIsNone(reader.get("answer"))
+        self.assertIsNone(writer.get("answer"))
+
+    def test_get_many_reads_shared_tier_once(self):
+        writer = make_cache()
+        reader = make_cache()
+        writer.set_many({"a": 1, "b": 2})
+        reader.set("c", 3)
+        with mock.patch.object(reader.shared, "get_many", wraps=reader.shared.get_many) as get_many:
+            self.assertEqual(reader.get_many(["a", "b", "c", "d"]), {"a": 1, "b": 2, "c": 3})
+        get_many.assert_called_once()
+
+    def test_incr_and_delete(self):
+        cache = make_cache()
+        cache.set("counter", 1)
+        self.assertEqual(cache.incr("counter"), 2)
+        self.assertEqual(cache.get("counter"), 2)
+        self.assertTrue(cache.delete("counter"))
+        self.assertIsNone(cache.get("counter"))
+        with self.assertRaises(ValueError):
+            cache.incr("counter")
+
+    def test_degrades_to_local_tier_when_shared_is_down(self):
+        cache = make_cache(SHARED_BACKEND="pydotorg.tests.test_cache.UnavailableCache")
+        cache.set("answer", 42)
+        self.assertEqual(cache.get("answer"), 42)
+        self.assertEqual(cache.get_many(["answer"]), {"answer": 42})
+        self.assertEqual(cache.stats["shared_errors"], 1)
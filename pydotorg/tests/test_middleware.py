@@ -1,8 +1,12 @@
+from unittest import mock
+
 from django.contrib.redirects.models import Redirect
 from django.contrib.sites.models import Site
-from django.test import TestCase, override_settings
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
 
-from pydotorg.middleware import GlobalSurrogateKey
+from fastly.utils import purge_objects, tag_surrogate_keys
+from pydotorg.middleware import SURROGATE_KEY_MAX_LENGTH, GlobalSurrogateKey
 
 
 class MiddlewareTests(TestCase):
@@ -60,8 +64,52 @@ class GlobalSurrogateKeyTests(TestCase):
 
     @override_settings(GLOBAL_SURROGATE_KEY="pydotorg-app")
     def test_surrogate_key_header_homepage(self):
-        """Test that homepage only has global surrogate key."""
+        """Test that homepage has the global key but no section key."""
         response = self.client.get("/")
         self.assertTrue(response.has_header("Surrogate-Key"))
-        surrogate_key = response["Surrogate-Key"]
-        self.assertEqual(surrogate_key, "pydotorg-app")
+        keys = response["Surrogate-Key"].split()
+        self.assertEqual(keys[0], "pydotorg-app")
+        # The remaining keys identify the boxes rendered on the page.
+        self.assertTrue(all(key.startswith("box-") for key in keys[1:]))
+
+
+def tagging_view(*objects):
+    def view(request):
+        tag_surrogate_keys(*objects)
+        return HttpResponse()
+
+    return view
+
+
+@override_settings(GLOBAL_SURROGATE_KEY="pydotorg-app")
+class ObjectSurrogateKeyTests(SimpleTestCase):
+    def test_tagged_objects_follow_global_and_section_keys(self):
+        middleware = GlobalSurrogateKey(tagging_view("release-1", "box-homepage-downloads", "release-1"))
+        response = middleware(RequestFactory().get("/downloads/"))
+        self.assertEqual(response["Surrogate-Key"], "pydotorg-app downloads release-1 box-homepage-downloads")
+
+    def test_header_length_is_capped(self):
+        keys = [f"release-{pk}" for pk in range(5000)]
+        middleware = GlobalSurrogateKey(tagging_view(*keys))
+        header = middleware(RequestFactory().get("/downloads/"))["Surrogate-Key"]
+        self.assertLessEqual(len(header), SURROGATE_KEY_MAX_LENGTH)
+        self.assertTrue(header.startswith("pydotorg-app downloads release-0 "))
+
+    def test_tagging_outside_a_request_is_ignored(self):
+        tag_surrogate_keys("release-1")
+        response = GlobalSurrogateKey(tagging_view())(RequestFactory().get("/"))
+        self.assertEqual(response["Surrogate-Key"], "pydotorg-app")
+
+
+class PurgeObjectsTests(SimpleTestCase):
+    @override_settings(FASTLY_SERVICE_ID="service")
+    def test_purges_surrogate_keys(self):
+        with mock.patch("fastly.utils.queue_purge") as queue_purge:
+            purge_objects("release-1", "release-list", urls=["/downloads/"])
+        queue_purge.assert_called_once_with(keys=["release-1", "release-list"])
+
+    @override_settings(FASTLY_SERVICE_ID=None)
+    def test_falls_back_to_urls(self):
+        with mock.patch("fastly.utils.queue_purge") as queue_purge:
+            purge_objects("release-1", urls=["/downloads/"])
+        queue_purge.assert_called_once_with(urls=["/downloads/"])
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.template import Context, Engine, TemplateDoesNotExist, engines
+from django.test import SimpleTestCase, override_settings
+
+from pydotorg.template_loaders import CachedLoader, template_cache_stats, warm_template_cache
+
+
+class CachedLoaderTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name) / "page.html"
+        self.path.write_text("first")
+        self.engine = Engine(
+            dirs=[self.tmpdir.name],
+            loaders=[
+                ("pydotorg.template_loaders.CachedLoader", ["django.template.loaders.filesystem.Loader"]),
+            ],
+        )
+        self.loader = self.engine.template_loaders[0]
+
+    def touch(self, content):
+        stat = self.path.stat()
+        self.path.write_text(content)
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + 10))
+
+    def test_templates_are_compiled_once(self):
+        self.assertIsInstance(self.loader, CachedLoader)
+        first = self.engine.get_template("page.html")
+        second = self.engine.get_template("page.html")
+        self.assertIs(first, second)
+        self.assertEqual(self.loader.stats["page.html"]["hits"], 1)
+        self.assertEqual(self.loader.stats["page.html"]["misses"], 1)
+
+    def test_changed_sources_are_kept_without_mtime_check(self):
+        self.engine.get_template("page.html")
+        self.touch("second")
+        self.assertEqual(self.engine.get_template("page.html").render(Context()), "first")
+
+    @override_settings(TEMPLATE_CACHE_CHECK_MTIME=True)
+    def test_changed_sources_are_recompiled_with_mtime_check(self):
+        self.assertEqual(self.engine.get_template("page.html").render(Context()), "first")
+        self.touch("second")
+        self.assertEqual(self.engine.get_template("page.html").render(Context()), "second")
+        self.assertEqual(self.loader.stats["page.html"]["misses"], 2)
+
+    def test_missing_templates_are_not_counted(self):
+        for _ in range(2):
+            with self.assertRaises(TemplateDoesNotExist):
+                self.engine.get_template("missing.html")
+        self.assertNotIn("missing.html", self.loader.stats)
+
+
+@override_settings(
+    TEMPLATES=[
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [],
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "pydotorg.template_loaders.CachedLoader",
+                        [
+                            (
+                                "django.template.loaders.locmem.Loader",
+                                {"page.html": "{% include 'part.html' %}", "part.html": "part"},
+                            )
+                        ],
+                    ),
+                ],
+            },
+        }
+    ]
+)
+class TemplateCacheWarmingTests(SimpleTestCase):
+    def test_warm_loads_included_templates(self):
+        self.assertEqual(warm_template_cache(["page.html"]), 2)
+        engines["django"].engine.get_template("page.html")
+
+        stats = template_cache_stats()
+        self.assertEqual(stats["templates"]["part.html"]["misses"], 1)
+        self.assertEqual(stats["templates"]["page.html"]["hits"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
@@ -1,6 +1,10 @@
+import datetime as dt
+
 import factory
+from django.db import connection
 from django.db.models import signals
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from apps.downloads.models import Release
@@ -34,3 +38,58 @@ class ViewsTests(TestCase):
         self.assertContains(response, "Browse Python 3.6.0 Documentation")
         self.assertContains(response, "https://docs.python.org/3/whatsnew/3.6.html")
         self.assertContains(response, "What's new in Python 3.6")
+
+    def test_docs_by_version(self):
+        Release.objects.create(
+            name="Python 3.6.1", is_published=True, release_date=dt.datetime(2017, 3, 21, tzinfo=dt.UTC)
+        )
+        Release.objects.create(
+            name="Python 3.6.0", is_published=True, release_date=dt.datetime(2016, 12, 23, tzinfo=dt.UTC)
+        )
+        Release.objects.create(name="Python 3.7.0b1", is_published=True, pre_release=True)
+        Release.objects.create(name="Python 2.5.5", is_published=True)
+
+        response = self.client.get(reverse("docs-versions"))
+
+        version_list = response.context["version_list"]
+        self.assertEqual(
+            [entry["version"] for entry in version_list], ["3.6", "2.2", "2.1", "2.0", "1.6", "1.5", "1.4"]
+        )
+        self.assertEqual([release["stage"] for release in version_list[0]["releases"]], ["3.6.1", "3.6.0"])
+        self.assertContains(response, "Python 3.6.1</a>, released on 21 March 2017")
+
+    def test_docs_by_version_is_cached_until_a_release_changes(self):
+        Release.objects.create(name="Python 3.6.0", is_published=True)
+        self.client.get(reverse("docs-versions"))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("docs-versions"))
+        self.assertFalse([q for q in queries.captured_queries if '"downloads_' in q["sql"]])
+
+        Release.objects.create(name="Python 3.7.0", is_published=True)
+        response = self.client.get(reverse("docs-versions"))
+        self.assertEqual(response.context["version_list"][0]["version"], "3.7")
+
+    def test_docs_by_version_json(self):
+        Release.objects.create(
+            name="Python 3.6.0", is_published=True, release_date=dt.datetime(2016, 12, 23, tzinfo=dt.UTC)
+        )
+
+        response = self.client.get(reverse("docs-versions-json"))
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        versions = response.json()["versions"]
+        self.assertEqual(
+            versions[0],
+            {
+                "version": "3.6",
+                "releases": [
+                    {
+                        "version": "3.6.0",
+                        "release_date": "2016-12-23",
+                        "url": "https://docs.python.org/release/3.6.0/",
+                    }
+                ],
+            },
+        )
+        self.assertEqual(versions[-1]["releases"][0]["version"], "1.4")
@@ -32,6 +32,7 @@ urlpatterns = [
     path("downloads/", include("apps.downloads.urls", namespace="download")),
     path("doc/", views.DocumentationIndexView.as_view(), name="documentation"),
     path("doc/versions/", views.DocsByVersionView.as_view(), name="docs-versions"),
+    path("doc/versions.json", views.DocsByVersionJSONView.as_view(), name="docs-versions-json"),
     path("blogs/", include("apps.blogs.urls")),
     path("inner/", TemplateView.as_view(template_name="python/inner.html"), name="inner"),
     # other section landing pages
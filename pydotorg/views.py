@@ -1,17 +1,17 @@
 """Views for the python.org homepage, documentation, and utility pages."""
 
-import datetime as dt
 import json
-import re
-from collections import defaultdict
 from pathlib import Path, PurePosixPath
 
 from django.conf import settings
 from django.http import HttpResponse, JsonResponse
-from django.views.generic.base import RedirectView, TemplateView
+from django.views.generic.base import RedirectView, TemplateView, View
 
 from apps.codesamples.models import CodeSample
 from apps.downloads.models import Release
+from fastly.utils import surrogate_list_key, tag_surrogate_keys
+
+DOCS_RELEASE_URL = "https://docs.python.org/release/"
 
 
 def health(request):
@@ -32,9 +32,6 @@ def serve_funding_json(request):
         return JsonResponse({"error": "Invalid JSON in funding.json"}, status=500)
 
 
-SEMANTIC_VERSION_PARTS = 3
-
-
 class IndexView(TemplateView):
     """Homepage view displaying code samples and recent content."""
 
@@ -100,108 +97,31 @@ class DocsByVersionView(TemplateView):
     template_name = "python/versions.html"
 
     def get_context_data(self, **kwargs):
-        """Build a grouped list of Python releases sorted by version."""
+        """Add the cached, grouped list of documented releases to the context."""
         context = super().get_context_data(**kwargs)
+        tag_surrogate_keys(surrogate_list_key(Release))
+        context["version_list"] = Release.objects.docs_version_index()
+        return context
 
-        releases = Release.objects.filter(
-            is_published=True,
-            pre_release=False,
-        ).order_by("-release_date")
-
-        # Some releases have no documentation
-        no_docs = {"2.3.6", "2.3.7", "2.4.5", "2.4.6", "2.5.5", "2.5.6"}
-
-        # We'll group releases by major.minor version
-        version_groups = defaultdict(list)
-
-        for release in releases:
-            # Extract version number from name ("Python 3.14.0" -> "3.14.0")
-            version_match = re.match(r"Python ([\d.]+)", release.name)
-            if version_match:
-                full_version = version_match.group(1)
-
-                if full_version in no_docs:
-                    continue
-
-                # Get major.minor version ("3.14.0" -> "3.14")
-                version_parts = full_version.split(".")
-                major_minor = f"{version_parts[0]}.{version_parts[1]}"
-
-                # For 3.2.0 and earlier, use X.Y instead of X.Y.0
-                if len(version_parts) == SEMANTIC_VERSION_PARTS:
-                    major, minor, patch = map(int, version_parts)
-                    # For versions <= 3.2.0 where patch is 0
-                    if (major, minor, patch) <= (3, 2, 0) and patch == 0:
-                        full_version = major_minor
-
-                release_data = {
-                    "stage": full_version,
-                    "date": release.release_date,
-                }
-                version_groups[major_minor].append(release_data)
-
-        # Add legacy releases not in the database
-        legacy_releases_data = {
-            "2.2": [
-                {"stage": "2.2p1", "date": dt.datetime(2002, 3, 29, tzinfo=dt.UTC)},
-            ],
-            "2.1": [
-                {"stage": "2.1.2", "date": dt.datetime(2002, 1, 16, tzinfo=dt.UTC)},
-                {"stage": "2.1.1", "date": dt.datetime(2001, 7, 20, tzinfo=dt.UTC)},
-                {"stage": "2.1", "date": dt.datetime(2001, 4, 15, tzinfo=dt.UTC)},
-            ],
-            "2.0": [
-                {"stage": "2.0", "date": dt.datetime(2000, 10, 16, tzinfo=dt.UTC)},
-            ],
-            "1.6": [
-                {"stage": "1.6", "date": dt.datetime(2000, 9, 5, tzinfo=dt.UTC)},
-            ],
-            "1.5": [
-                {"stage": "1.5.2p2", "date": dt.datetime(2000, 3, 22, tzinfo=dt.UTC)},
-                {"stage": "1.5.2p1", "date": dt.datetime(1999, 7, 6, tzinfo=dt.UTC)},
-                {"stage": "1.5.2", "date": dt.datetime(1999, 4, 30, tzinfo=dt.UTC)},
-                {"stage": "1.5.1p1", "date": dt.datetime(1998, 8, 6, tzinfo=dt.UTC)},
-                {"stage": "1.5.1", "date": dt.datetime(1998, 4, 14, tzinfo=dt.UTC)},
-                {"stage": "1.5", "date": dt.datetime(1998, 2, 17, tzinfo=dt.UTC)},
-            ],
-            "1.4": [
-                {"stage": "1.4", "date": dt.datetime(1996, 10, 25, tzinfo=dt.UTC)},
-            ],
-        }
-
-        # Merge legacy releases in
-        for version, items in legacy_releases_data.items():
-            version_groups[version].extend(items)
-
-        # Convert to list for template and sort releases within each version
-        version_list = []
-        for version, version_releases in version_groups.items():
-            # Sort x.y.z newest first
-            sorted_releases = sorted(
-                version_releases,
-                key=lambda x: x.get("date", dt.datetime(1, 1, 1, tzinfo=dt.UTC)),
-                reverse=True,
-            )
-            for release in sorted_releases:
-                release["date"] = release["date"].strftime("%-d %B %Y")
-
-            version_list.append(
-                {
-                    "version": version,
-                    "releases": sorted_releases,
-                }
-            )
-
-        # Sort x.y versions (newest first)
-        version_list.sort(
-            key=lambda x: [int(n) if n.isdigit() else n for n in x["version"].split(".")],
-            reverse=True,
-        )
 
-        context.update(
+class DocsByVersionJSONView(View):
+    """JSON version of the documentation by version page, for docs tooling."""
+
+    def get(self, request, *args, **kwargs):
+        """Return the documented releases grouped by feature version, newest first."""
+        tag_surrogate_keys(surrogate_list_key(Release))
+        versions = [
             {
-                "version_list": version_list,
+                "version": entry["version"],
+                "releases": [
+                    {
+                        "version": release["stage"],
+                        "release_date": release["date"].date().isoformat(),
+                        "url": f"{DOCS_RELEASE_URL}{release['stage']}/",
+                    }
+                    for release in entry["releases"]
+                ],
             }
-        )
-
-        return context
+            for entry in Release.objects.docs_version_index()
+        ]
+        return JsonResponse({"versions": versions})